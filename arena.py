@@ -0,0 +1,187 @@
+import random
+from array import array
+from collections import deque
+
+# Snake Arena: dozens to hundreds of snakes on one large grid. A shared occupancy grid (0 for an empty cell,
+# snake id + 1 for a body cell) is kept up to date as heads enter and tails leave, so every collision check is
+# one lookup and a tick costs O(snakes) however long they grow.
+# Moves are simultaneous: two heads entering the same cell both die, and a head may enter the cell a tail
+# leaves on the same tick. Snakes start at START_LENGTH and never shrink, so two heads cannot pass through
+# each other: each would enter the other's neck.
+UP, DOWN, LEFT, RIGHT = (0, -1), (0, 1), (-1, 0), (1, 0)
+DIRECTIONS = (UP, DOWN, LEFT, RIGHT)
+START_LENGTH = 3
+RESPAWN_TICKS = 30  # a dead bot comes back this many ticks later; players stay dead
+SPAWN_TRIES = 100  # random cells tried before a spawn waits for the next tick
+SPAWN_CLEARANCE = 10  # free cells a new snake has ahead of it, so a player has time to react
+FOOD_PER_SNAKE = 0.5  # food kept on the board per snake, at least one
+FOOD_BUCKET = 16  # cells per side of a food bucket; bots look for food in the buckets around them first
+
+
+class ArenaSnake:
+    max_turns = 3  # Turns queued ahead of a player's snake, as in SnakeGame
+
+    def __init__(self, snake_id, bot):
+        self.id = snake_id
+        self.bot = bot
+        self.body = deque()  # cell indices, head first
+        self.direction = RIGHT
+        self.turns = deque()
+        self.alive = False
+        self.respawn = None  # tick a dead bot comes back at
+        self.score = 0
+        self.target = None  # cell of the food a bot heads for
+
+    def turn(self, direction):
+        dx, dy = self.turns[-1] if self.turns else self.direction
+        if direction not in ((dx, dy), (-dx, -dy)) and len(self.turns) < self.max_turns:
+            self.turns.append(direction)
+
+
+class Arena:
+    def __init__(self, width, height, seed=None):
+        self.width, self.height = width, height
+        self.cells = array("H", bytes(2 * width * height))
+        self.food = set()
+        self.food_buckets = {}  # (bucket x, bucket y) -> food cells in it
+        self.snakes = []
+        self.rng = random.Random(seed)
+        self.ticks = 0
+
+    def add_snake(self, bot=True):
+        snake = ArenaSnake(len(self.snakes), bot)
+        self.snakes.append(snake)
+        self.spawn(snake)
+        return snake
+
+    def random_empty(self):
+        for _ in range(SPAWN_TRIES):
+            cell = self.rng.randrange(self.width * self.height)
+            if not self.cells[cell] and cell not in self.food:
+                return cell
+        return None
+
+    def spawn(self, snake):
+        # A straight snake of START_LENGTH on free cells, facing away from its tail with SPAWN_CLEARANCE free ahead
+        width, height, cells, rng = self.width, self.height, self.cells, self.rng
+        for _ in range(SPAWN_TRIES):
+            x, y = rng.randrange(width), rng.randrange(height)
+            dx, dy = rng.choice(DIRECTIONS)
+            body = [(x - dx * k, y - dy * k) for k in range(-SPAWN_CLEARANCE, START_LENGTH)]
+            if all(0 <= bx < width and 0 <= by < height and not cells[by * width + bx]
+                   and by * width + bx not in self.food for bx, by in body):
+                snake.body = deque(by * width + bx for bx, by in body[SPAWN_CLEARANCE:])
+                for cell in snake.body:
+                    cells[cell] = snake.id + 1
+                snake.direction = (dx, dy)
+                snake.turns.clear()
+                snake.alive = True
+                snake.respawn = None
+                snake.target = None
+                return True
+        snake.respawn = self.ticks + 1
+        return False
+
+    def add_food(self, cell):
+        self.food.add(cell)
+        y, x = divmod(cell, self.width)
+        self.food_buckets.setdefault((x // FOOD_BUCKET, y // FOOD_BUCKET), set()).add(cell)
+
+    def eat(self, cell):
+        self.food.discard(cell)
+        y, x = divmod(cell, self.width)
+        self.food_buckets[x // FOOD_BUCKET, y // FOOD_BUCKET].discard(cell)
+
+    def nearest_food(self, x, y):
+        # Searches rings of buckets outward from (x, y); the closest food in the first ring holding any is
+        # taken, which is near enough for a bot
+        buckets, width = self.food_buckets, self.width
+        bx, by = x // FOOD_BUCKET, y // FOOD_BUCKET
+        for radius in range(max(self.width, self.height) // FOOD_BUCKET + 1):
+            found = []
+            for dy in range(-radius, radius + 1):
+                step = 1 if abs(dy) == radius else 2 * radius or 1
+                for dx in range(-radius, radius + 1, step):
+                    found.extend(buckets.get((bx + dx, by + dy), ()))
+            if found:
+                return min(found, key=lambda cell: abs(cell // width - y) + abs(cell % width - x))
+        return None
+
+    def kill(self, snake):
+        for cell in snake.body:
+            self.cells[cell] = 0
+        snake.body.clear()
+        snake.alive = False
+        snake.respawn = self.ticks + RESPAWN_TICKS if snake.bot else None
+
+    def steer(self, snake):
+        # Bots: of the three directions that are not a reversal, the free cell closest to the bot's food,
+        # picking the nearest food again once its own is eaten
+        width, height, cells = self.width, self.height, self.cells
+        head_y, head_x = divmod(snake.body[0], width)
+        if snake.target not in self.food:
+            snake.target = self.nearest_food(head_x, head_y)
+        target_y, target_x = divmod(snake.target, width) if snake.target is not None else (head_y, head_x)
+        dx, dy = snake.direction
+        best, best_distance = None, None
+        for direction in DIRECTIONS:
+            if direction == (-dx, -dy):
+                continue
+            x, y = head_x + direction[0], head_y + direction[1]
+            if 0 <= x < width and 0 <= y < height and not cells[y * width + x]:
+                distance = abs(target_x - x) + abs(target_y - y)
+                if best is None or distance < best_distance:
+                    best, best_distance = direction, distance
+        if best is not None:
+            snake.direction = best
+
+    def tick(self):
+        self.ticks += 1
+        width, height, cells, food = self.width, self.height, self.cells, self.food
+        moving = []  # (snake, cell its head enters, or None into a wall)
+        entering = {}  # cell -> heads entering it
+        for snake in self.snakes:
+            if not snake.alive:
+                if snake.respawn is not None and snake.respawn <= self.ticks:
+                    self.spawn(snake)
+                continue
+            if snake.bot:
+                self.steer(snake)
+            elif snake.turns:
+                snake.direction = snake.turns.popleft()
+            head_y, head_x = divmod(snake.body[0], width)
+            x, y = head_x + snake.direction[0], head_y + snake.direction[1]
+            if 0 <= x < width and 0 <= y < height:
+                cell = y * width + x
+                entering[cell] = entering.get(cell, 0) + 1
+                moving.append((snake, cell))
+            else:
+                moving.append((snake, None))
+
+        # Collisions are judged against the board before anyone moves, less the tails that leave this tick
+        leaving = {snake.body[-1] for snake, cell in moving if cell is not None and cell not in food}
+        survivors, dead = [], []
+        for snake, cell in moving:
+            if cell is None or entering[cell] > 1 or cells[cell] and cell not in leaving:
+                dead.append(snake)
+            else:
+                survivors.append((snake, cell))
+        for snake in dead:
+            self.kill(snake)
+        # Tails first, so a head entering a cell another tail leaves this tick is not cleared again
+        for snake, cell in survivors:
+            if cell not in food:
+                cells[snake.body.pop()] = 0
+        for snake, cell in survivors:
+            if cell in food:
+                self.eat(cell)
+                snake.score += 10
+            snake.body.appendleft(cell)
+            cells[cell] = snake.id + 1
+
+        wanted = max(1, int(len(self.snakes) * FOOD_PER_SNAKE))
+        while len(food) < wanted:
+            cell = self.random_empty()
+            if cell is None:
+                break
+            self.add_food(cell)
@@ -0,0 +1,76 @@
+from functools import lru_cache
+
+# Snake autopilot: follows a Hamiltonian cycle, which visits every cell once and so can never trap the snake,
+# and cuts across it toward the food while the shortcut cannot reach the body. The body always lies on the
+# cycle behind the head, so a neighbour is safe to enter when it comes before the tail going forward along
+# the cycle, with room left for the snake to grow. The cycle is built once per grid size and shared; each
+# decision only looks at the head's four neighbours, so it costs the same at any length on any grid.
+GROWTH_MARGIN = 3  # cells kept between a shortcut and the tail beyond the snake's length
+SHORTCUT_FILL = 0.5  # no shortcuts once the snake covers this share of the board
+DIRECTIONS = ((0, -1), (0, 1), (-1, 0), (1, 0))
+
+
+@lru_cache(maxsize=8)
+def cycle_order(width, height):
+    # Position of every cell (y * width + x) on a Hamiltonian cycle: along the top row, then snaking down and
+    # up the columns back to the start. Needs an even width; an even height is handled by transposing.
+    # Returns None for odd x odd grids, which have no Hamiltonian cycle.
+    if width % 2 and height % 2 or width < 2 or height < 2:
+        return None
+    if width % 2:
+        transposed = cycle_order(height, width)
+        return [transposed[x * height + y] for y in range(height) for x in range(width)]
+    order = [0] * (width * height)
+    position = 0
+    for x in range(width):
+        order[x] = position
+        position += 1
+    for x in range(width - 1, -1, -1):
+        rows = range(1, height) if (width - 1 - x) % 2 == 0 else range(height - 1, 0, -1)
+        for y in rows:
+            order[y * width + x] = position
+            position += 1
+    return order
+
+
+class Autopilot:
+    def __init__(self, width, height):
+        self.width, self.height = width, height
+        self.order = cycle_order(width, height)
+        self.cells = width * height
+
+    def ahead(self, a, b):
+        # Cells strictly between a and b going forward along the cycle
+        return (self.order[b] - self.order[a] - 1) % self.cells
+
+    def steer(self, snake, occupied, food):
+        # Direction for the next move. snake is the body head first as (x, y) cells, occupied the same cells as a
+        # set and food the food cell.
+        width, height = self.width, self.height
+        head_x, head_y = snake[0]
+        free = [(dx, dy) for dx, dy in DIRECTIONS
+                if 0 <= head_x + dx < width and 0 <= head_y + dy < height and (head_x + dx, head_y + dy) not in occupied]
+        if not free:
+            return DIRECTIONS[0]
+        if self.order is None:
+            # No cycle on an odd x odd grid: the free neighbour closest to the food
+            return min(free, key=lambda d: abs(head_x + d[0] - food[0]) + abs(head_y + d[1] - food[1]))
+        head = head_y * width + head_x
+        tail_x, tail_y = snake[-1]
+        to_food = self.ahead(head, food[1] * width + food[0])
+        to_tail = self.ahead(head, tail_y * width + tail_x)
+        length = len(snake)
+        if length >= self.cells * SHORTCUT_FILL:
+            cut = 0
+        else:
+            cut = to_tail - length - GROWTH_MARGIN
+            if to_food < to_tail:
+                cut -= 1  # the snake grows by one when it eats on the way
+            cut = max(0, min(cut, to_food))
+        # Of the neighbours no further along the cycle than the cut allows, the furthest; 0 is the cycle's own next cell
+        best, best_skip = None, -1
+        for dx, dy in free:
+            skip = self.ahead(head, (head_y + dy) * width + head_x + dx)
+            if best_skip < skip <= cut:
+                best, best_skip = (dx, dy), skip
+        return best if best is not None else free[0]
@@ -0,0 +1,794 @@
+import os
+import sys
+import time
+
+# Headless: the suites open a window on import
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+
+
+def measure(fn, repeat):
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        samples.append(time.perf_counter() - start)
+    samples.sort()
+    return samples
+
+
+def percentile(samples, pct):
+    return samples[min(len(samples) - 1, int(len(samples) * pct / 100))]
+
+
+def report(label, samples, budget=None):
+    median, p99 = percentile(samples, 50), percentile(samples, 99)
+    line = f"{label:<40} median {median * 1e6:9.1f} us   p99 {p99 * 1e6:9.1f} us"
+    if budget is not None:
+        line += "   " + ("OK" if p99 < budget else f"OVER {budget * 1e3:g} ms budget")
+    print(line)
+
+
+# Save-state snapshots: a mid-game Minesweeper board must snapshot and restore in under 1 ms
+def bench_snapshot():
+    import game_suit
+
+    game = game_suit.Minesweeper("bench")
+    game.reveal_cell(game.grid_size // 2, game.grid_size // 2)
+    for i in range(0, game.grid_size, 3):
+        game.flags[i][game.grid_size - 1 - i] = not game.revealed[i][game.grid_size - 1 - i]
+    data = game.snapshot()
+    print(f"Minesweeper {game.grid_size}x{game.grid_size} snapshot: {len(data)} bytes")
+    report("Minesweeper snapshot()", measure(game.snapshot, 2000), budget=1e-3)
+    report("Minesweeper restore()", measure(lambda: game.restore(data), 2000), budget=1e-3)
+
+
+# Alien Code Breaker solver: guesses needed (worst case over random secrets) and hint latency (budget 100 ms)
+def bench_code_breaker(games=40):
+    import random
+    import string
+    from code_breaker import CodeBreakerSolver, score_guess
+
+    for length, count in ((4, games), (5, 5), (6, 3)):
+        rng = random.Random(length)
+        guesses_needed, latencies = [], []
+        for seed in range(count):
+            secret = "".join(rng.choices(string.ascii_uppercase, k=length))
+            solver = CodeBreakerSolver(length, seed=seed)
+            guesses = 0
+            while True:
+                start = time.perf_counter()
+                guess = solver.hint()
+                latencies.append(time.perf_counter() - start)
+                guesses += 1
+                if guess is None or guess == secret:
+                    break
+                solver.observe(guess, score_guess(guess, secret))
+            guesses_needed.append(guesses if guess == secret else float("inf"))
+        latencies.sort()
+        mode = "exact" if solver.exact else "sampled"
+        print(f"{length} letters from 26 ({mode}): worst {max(guesses_needed)} guesses, "
+              f"mean {sum(guesses_needed) / len(guesses_needed):.1f} over {count} secrets")
+        report(f"hint() {length} letters", latencies, budget=0.1)
+
+
+# Astro-Puzzle optimal solver: solve latency per board size (pattern databases if built, else Manhattan + conflicts),
+# then the in-game cost of dealing a board and of each per-frame search slice
+def bench_sliding_solver():
+    import random
+    import sliding_puzzle
+
+    rng = random.Random(7)
+    for width, boards, scramble in ((3, 30, None), (4, 8, None), (5, 5, 40), (8, 5, 40)):
+        solver = sliding_puzzle.SlidingSolver(width)
+        if scramble is None and not isinstance(solver.heuristic, sliding_puzzle.PatternHeuristic) and width > 3:
+            scramble = 40  # Random 4x4 boards need the pattern databases (python sliding_puzzle.py build 4)
+        samples, lengths, nodes = [], [], 0
+        for _ in range(boards):
+            if scramble is None:
+                puzzle = sliding_puzzle.random_solvable(width, rng)
+            else:
+                # Random walks from the goal: fully random boards this size are out of reach for optimal search
+                puzzle = list(range(1, width * width)) + [0]
+                blank, previous = len(puzzle) - 1, None
+                for _ in range(scramble):
+                    cell = rng.choice([c for c in solver.neighbors[blank] if c != previous])
+                    puzzle[blank], puzzle[cell] = puzzle[cell], 0
+                    previous, blank = blank, cell
+            start = time.perf_counter()
+            path = solver.solve(puzzle, max_nodes=2_000_000)
+            samples.append(time.perf_counter() - start)
+            nodes += solver.nodes
+            lengths.append(len(path) if path is not None else -1)
+        samples.sort()
+        kind = type(solver.heuristic).__name__
+        print(f"{width}x{width} ({'random' if scramble is None else f'{scramble}-move scramble'}, {kind}): "
+              f"solution lengths {lengths}, {nodes / sum(samples):,.0f} nodes/s")
+        report(f"solve() {width}x{width}", samples)
+    import space_exploration_game
+
+    for width in (3, 4):
+        deal = measure(lambda: space_exploration_game.AstroPuzzleNavigator("bench", width), 20)
+        game = space_exploration_game.AstroPuzzleNavigator("bench", width)
+        game.hint()
+        slices = []
+        while game.par_search or game.hint_search:
+            start = time.perf_counter()
+            game.search_step()
+            slices.append(time.perf_counter() - start)
+        slices.sort()
+        report(f"deal a {width}x{width} board", deal, budget=1 / 60)
+        report(f"search slice {width}x{width} ({len(slices)} slices)", slices or [0.0], budget=1 / 60)
+
+
+# Nebula Maze Runner generation: Eller's algorithm time and memory per cell, up to a 4000x4000 maze
+def bench_maze(sizes=(64, 512, 1000, 4000)):
+    import tracemalloc
+    from maze import Maze
+
+    for size in sizes:
+        cells = size * size
+        start = time.perf_counter()
+        maze = Maze.generate(size, size, seed=size)
+        elapsed = time.perf_counter() - start
+        line = (f"{size}x{size}: {elapsed * 1e3:9.1f} ms, {elapsed / cells * 1e9:6.1f} ns/cell, "
+                f"walls {maze.nbytes * 8 / cells:.2f} bits/cell")
+        if size <= 1000:
+            # Tracing slows generation several times over, so peak memory is measured on a separate run
+            tracemalloc.start()
+            Maze.generate(size, size, seed=size)
+            line += f", peak {tracemalloc.get_traced_memory()[1] / cells:.2f} bytes/cell"
+            tracemalloc.stop()
+        print(line)
+
+
+# Nebula Maze Runner frame cost: the camera walks the diagonal, which should cost the same on any maze size
+def bench_maze_draw():
+    import space_exploration_game
+
+    for size in (5, 100, 2000):
+        game = space_exploration_game.NebulaMazeRunner("bench", size)
+        slices = []  # large mazes are generated a slice per frame after the first
+        while game.build_clock is not None:
+            start = time.perf_counter()
+            game.build_step()
+            slices.append(time.perf_counter() - start)
+        if slices:
+            report(f"generation slice {size}x{size} ({len(slices)} slices)", slices, budget=1 / 60)
+        cells = iter(range(10 ** 9))
+
+        def frame():
+            step = next(cells) % size
+            game.player_pos = [step, step]
+            game.draw()
+
+        report(f"draw() {size}x{size}", measure(frame, 1000), budget=1 / 60)
+
+
+# Nebula Maze Runner hazard mode: 500 drones chasing the player on a 1000x1000 maze, within one 60 fps frame
+def bench_drones():
+    import space_exploration_game
+
+    space_exploration_game.NebulaMazeRunner.hazard = True
+    game = space_exploration_game.NebulaMazeRunner("bench", 1000)
+    while game.build_clock is not None:
+        game.build_step()  # the maze is generated a slice per frame
+    print(f"{len(game.drones)} drones, exit field mapped {game.exit_field_budget} cells per frame")
+    frames = measure(game.update, 1000)
+    # Put every drone inside the chase radius so each one steps on the shared field
+    game.player_pos = [500, 500]
+    game.update_player_field()
+    near = list(game.player_field.distance)
+    game.drones = [near[k % len(near)] for k in range(len(game.drones))]
+    game.drones = [cell for cell in game.drones if cell != game.player_field.source]
+    report("update() while mapping the exit field", frames, budget=1 / 60)
+    report("player field rebuild per move", measure(game.update_player_field, 500), budget=1 / 60)
+    report(f"step_drones() {len(game.drones)} chasing", measure(game.step_drones, 500), budget=1 / 60)
+    space_exploration_game.NebulaMazeRunner.hazard = False
+
+
+# Cosmic Jigsaw picture mode: dragging one of 768 tiles redraws only the slots it passes over
+def bench_jigsaw_drag():
+    import pygame
+    import space_exploration_game
+
+    space_exploration_game.CosmicJigsawExplore.picture_mode = True
+    space_exploration_game.CosmicJigsawExplore.grid = (32, 24)
+    game = space_exploration_game.CosmicJigsawExplore("bench")
+    game.draw()
+    start = game.slot_rect(0).center
+    game.handle_input(pygame.event.Event(pygame.MOUSEBUTTONDOWN, pos=start, button=1))
+    steps = iter(range(10 ** 9))
+
+    def frame():
+        step = next(steps) % 600
+        game.handle_input(pygame.event.Event(pygame.MOUSEMOTION, pos=(start[0] + step, start[1] + step // 2), rel=(1, 0), buttons=(1, 0, 0)))
+        game.draw()
+
+    def full_frame():
+        game.dirty = None
+        game.draw()
+
+    report("drag frame, 768 tiles", measure(frame, 1000), budget=1 / 60)
+    report("full redraw, 768 tiles", measure(full_frame, 200), budget=1 / 60)
+    space_exploration_game.CosmicJigsawExplore.picture_mode = False
+
+
+# Cosmic Jigsaw word mode: par (fewest adjacent swaps) of a shuffled 10,000-letter phrase full of repeated
+# letters, its O(1) update per swap and the next-move hint
+def bench_word_jigsaw(length=10_000):
+    import random
+    from word_jigsaw import SwapPar
+
+    rng = random.Random(10)
+    target = rng.choices("ETAOIN SHRDLU", k=length)
+    pieces = target[:]
+    rng.shuffle(pieces)
+    start = time.perf_counter()
+    par = SwapPar(pieces, target)
+    print(f"{length} letters: par {par.inversions:,} swaps, computed in {(time.perf_counter() - start) * 1e3:.1f} ms")
+    report("SwapPar() 10k letters", measure(lambda: SwapPar(pieces, target), 10), budget=0.1)
+    slots = iter(rng.randrange(length - 1) for _ in range(10 ** 6))
+    report("swap() update", measure(lambda: par.swap(next(slots)), 10000), budget=1e-3)
+    report("hint()", measure(par.hint, 10000), budget=1e-3)
+
+
+# Quantum Circuit Puzzle simulator: a 20-qubit, 60-gate circuit simulated from scratch, then single edits that
+# re-simulate only the suffix after the nearest cached prefix
+def bench_quantum(qubits=20, length=60):
+    import random
+    import quantum
+
+    rng = random.Random(37)
+    gates = quantum.random_circuit(qubits, length, rng)
+    start = time.perf_counter()
+    circuit = quantum.Circuit(qubits, gates)
+    circuit.state()
+    print(f"{qubits} qubits, {length} gates ({len(quantum.fuse(gates))} after fusion): "
+          f"{(time.perf_counter() - start) * 1e3:.1f} ms from scratch, {len(circuit.cache)} prefixes cached")
+    extra = iter(quantum.random_circuit(qubits, 1000, rng))
+
+    def append_and_undo():
+        circuit.append(next(extra))
+        circuit.state()
+        circuit.remove(len(circuit) - 1)
+        circuit.state()
+
+    def edit_near_end():
+        circuit.insert(length - 5, next(extra))
+        circuit.state()
+        circuit.remove(length - 5)
+
+    report("append + undo, 20 qubits", measure(append_and_undo, 20), budget=0.1)
+    report("insert 5 gates from the end, 20 qubits", measure(edit_near_end, 20), budget=0.1)
+    circuit.state()
+    report("probabilities(), 20 qubits", measure(circuit.probabilities, 20))
+
+
+# Menu starfield: 4000 parallax stars advanced and plotted into an 800x600 surface (budget: under 1 ms)
+def bench_starfield():
+    import pygame
+    from starfield import Starfield
+
+    pygame.init()
+    surface = pygame.display.set_mode((800, 600))
+    stars = Starfield(800, 600, seed=1)
+    print(f"{len(stars.x)} stars in {len(stars.layers)} layers")
+    report("update() one frame", measure(lambda: stars.update(1 / 60), 2000), budget=1e-3)
+    report("draw() one frame", measure(lambda: stars.draw(surface, (0, 0, 0), (255, 255, 255)), 2000), budget=1e-3)
+    report("fill() + draw(), for scale", measure(lambda: (surface.fill((0, 0, 0)), stars.draw(surface, (0, 0, 0), (255, 255, 255))), 2000))
+
+
+# Multiplayer server load test: server.py in its own process hosts `sessions` concurrent games, a third each of
+# Tic-Tac-Toe, Hangman and Code Breaker, played by local bot clients that think about `think` seconds per move.
+# Reports the server's CPU share, the sessions one core could host at that pace, and move round-trip latency
+# (the bots share this process, so on a small machine their own scheduling is part of the latency).
+def bench_server(sessions=1000, duration=10, think=1.0, ramp=3.0):
+    import asyncio
+    import json
+    import random
+    import string
+    import subprocess
+
+    here = os.path.dirname(os.path.abspath(__file__))
+    process = subprocess.Popen([sys.executable, "server.py", "0"], cwd=here, stdout=subprocess.PIPE, text=True)
+    port = int(process.stdout.readline().rsplit(":", 1)[1])
+    games = ["tictactoe", "hangman", "codebreaker"]
+    latencies = []
+
+    def next_move(state):
+        # A random legal move, or None while the bot has to wait for its opponent
+        if state["game"] == "tictactoe":
+            if state["turn"] != state["you"]:
+                return None
+            return random.choice([cell for cell, mark in enumerate(state["board"]) if not mark])
+        if state["game"] == "hangman":
+            return random.choice([letter for letter in string.ascii_uppercase if letter not in state["guessed"]])
+        if state["attempts"][state["you"]] == 0:
+            return None
+        return "".join(random.choices(string.ascii_uppercase, k=4))
+
+    async def bot(k):
+        await asyncio.sleep(ramp * k / (2 * sessions))
+        reader, writer = await asyncio.open_connection("127.0.0.1", port)
+        sent, moves = {}, 0
+        while True:
+            writer.write(json.dumps({"op": "join", "game": games[k // 2 % 3], "name": f"bot{k}"}).encode() + b"\n")
+            state = None
+            while True:
+                message = json.loads(await reader.readline())
+                if message.get("reply") in sent:
+                    latencies.append(time.perf_counter() - sent.pop(message["reply"]))
+                if message["op"] in ("start", "state"):
+                    state = message
+                if message["op"] == "end" or state is not None and state["winner"] is not None:
+                    break
+                move = next_move(state) if state is not None and not sent else None
+                if move is not None:
+                    await asyncio.sleep(random.uniform(0.5, 1.5) * think)
+                    moves += 1
+                    sent[moves] = time.perf_counter()
+                    writer.write(json.dumps({"op": "move", "move": move, "id": moves}).encode() + b"\n")
+
+    async def stats(reader, writer):
+        writer.write(b'{"op": "stats"}\n')
+        return json.loads(await reader.readline())
+
+    async def run():
+        bots = [asyncio.create_task(bot(k)) for k in range(2 * sessions)]
+        control = await asyncio.open_connection("127.0.0.1", port)
+        await asyncio.sleep(ramp + think)
+        latencies.clear()
+        before = await stats(*control)
+        await asyncio.sleep(duration)
+        after = await stats(*control)
+        for task in bots:
+            task.cancel()
+        await asyncio.gather(*bots, return_exceptions=True)
+        return before, after
+
+    try:
+        before, after = asyncio.run(run())
+    finally:
+        process.terminate()
+        process.wait()
+    share = (after["cpu"] - before["cpu"]) / (after["uptime"] - before["uptime"])
+    active = (before["sessions"] + after["sessions"]) / 2
+    moves = after["moves"] - before["moves"]
+    print(f"{active:.0f} sessions, {after['players']} players, {moves / duration:.0f} moves/s: "
+          f"server at {share:.1%} of a core, about {active / max(share, 1e-9):,.0f} sessions per core at this pace")
+    latencies.sort()
+    report("move round trip", latencies, budget=0.05)
+
+
+# Spectator broadcast: bytes per tick of Snake and Minesweeper deltas (keyframes included) against full
+# snapshots, and the publisher's fan-out cost per tick to local spectators, as spectators one core serves at 60 ticks/s
+def bench_spectate(spectators=500, ticks=600):
+    import asyncio
+    import random
+    import game_suit
+    import spectate
+
+    def steer(snake):
+        # Greedy bot: head for the food, avoiding walls and its own body where it can
+        (hx, hy), (fx, fy) = snake.snake[0], snake.food
+        turns = [d for d in ((1, 0), (-1, 0), (0, 1), (0, -1)) if d != (-snake.direction[0], -snake.direction[1])]
+        turns.sort(key=lambda d: abs(hx + d[0] - fx) + abs(hy + d[1] - fy))
+        safe = [(dx, dy) for dx, dy in turns if (hx + dx, hy + dy) not in snake.snake
+                and 0 <= hx + dx < snake.grid_width and 0 <= hy + dy < snake.grid_height]
+        snake.direction = (safe or turns)[0]
+
+    def click(mines):
+        i, j = random.randrange(mines.grid_size), random.randrange(mines.grid_size)
+        if random.random() < 0.2:
+            if not mines.revealed[i][j]:
+                mines.toggle_flag(i * mines.grid_size + j, True)
+        else:
+            mines.reveal_cell(i, j)
+
+    async def run(make, play):
+        feed = spectate.SpectatorFeed()
+        port = await feed.start(port=0)
+        received = [0]
+
+        async def spectator():
+            reader, writer = await asyncio.open_connection("127.0.0.1", port)
+            while data := await reader.read(65536):
+                received[0] += len(data)
+            writer.close()
+
+        tasks = [asyncio.create_task(spectator()) for _ in range(spectators)]
+        while len(feed.spectators) < spectators:
+            await asyncio.sleep(0.01)
+        game, samples, snapshots = make(), [], 0
+        for _ in range(ticks):
+            if game.game_over:
+                game = make()
+            play(game)
+            snapshots += len(game.snapshot())
+            start = time.perf_counter()
+            feed.publish(game)
+            samples.append(time.perf_counter() - start)
+            await asyncio.sleep(0)
+        await feed.close()
+        await asyncio.gather(*tasks)
+        return feed.bytes_published / ticks, snapshots / ticks, sorted(samples), received[0]
+
+    random.seed(40)
+    for name, make, play in (("Snake", lambda: game_suit.SnakeGame("bench"), lambda snake: (steer(snake), snake.update())),
+                             ("Minesweeper", lambda: game_suit.Minesweeper("bench"), click)):
+        per_tick, snapshot, samples, received = asyncio.run(run(make, play))
+        cost = sum(samples) / len(samples) / spectators
+        print(f"{name}: {per_tick:.1f} bytes/tick published (full snapshots: {snapshot:.0f}), "
+              f"{received / spectators / ticks:.1f} bytes/tick received per spectator, "
+              f"about {1 / (60 * cost):,.0f} spectators per core at 60 ticks/s")
+        report(f"publish() to {spectators} spectators", samples, budget=1 / 60)
+
+
+# Launcher: time from process start to the first menu frame and peak memory (max RSS) of the launcher, which
+# imports a suite only when one of its games is picked, against running the two suites as separate programs
+def bench_launcher(repeat=5):
+    import subprocess
+
+    here = os.path.dirname(os.path.abspath(__file__))
+    # Peak RSS from /proc (Linux): ru_maxrss would carry over this process's own peak across the exec
+    ready = "print([line.split()[1] for line in open('/proc/self/status') if line.startswith('VmHWM')][0])"
+    programs = {
+        "game_suit.py": "import game_suit; game_suit.MainMenu().draw()",
+        "space_exploration_game.py": "import space_exploration_game; space_exploration_game.MainMenu().draw()",
+        "main.py": "import main; main.LauncherMenu().draw()",
+        "main.py + both suites": "import main; main.LauncherMenu().draw(); "
+                                 "next(g for g in main.GAMES if not g.space).load(); next(g for g in main.GAMES if g.space).load()",
+    }
+    results = {}
+    for label, code in programs.items():
+        samples, rss = [], 0
+        for _ in range(repeat):
+            start = time.perf_counter()
+            output = subprocess.run([sys.executable, "-c", f"{code}; {ready}"], cwd=here, capture_output=True, text=True,
+                                    env=dict(os.environ), check=True).stdout
+            samples.append(time.perf_counter() - start)
+            rss = max(rss, int(output.split()[-1]))
+        samples.sort()
+        results[label] = percentile(samples, 50), rss
+        report(f"{label} startup", samples)
+        print(f"{'':<40} max RSS {rss / 1024:9.1f} MB")
+    suites = [results["game_suit.py"], results["space_exploration_game.py"]]
+    launcher = results["main.py"]
+    print(f"one suite: {suites[0][0] * 1e3:.0f} / {suites[1][0] * 1e3:.0f} ms and "
+          f"{suites[0][1] / 1024:.1f} / {suites[1][1] / 1024:.1f} MB; "
+          f"two suites: {sum(t for t, _ in suites) * 1e3:.0f} ms and {sum(m for _, m in suites) / 1024:.1f} MB in total; "
+          f"launcher: {launcher[0] * 1e3:.0f} ms and {launcher[1] / 1024:.1f} MB, "
+          f"{results['main.py + both suites'][1] / 1024:.1f} MB with both suites loaded")
+
+
+# Static board layers: frame cost with each game's grid baked once, against baking it again every frame as the
+# grid was drawn before (one draw call per cell outline)
+def bench_static_layers():
+    import random
+    import game_suit
+    import space_exploration_game
+
+    random.seed(3)
+    tictactoe = game_suit.TicTacToe("bench")
+    tictactoe.board[0][0], tictactoe.board[1][1] = "X", "O"
+    minesweeper = game_suit.Minesweeper("bench")
+    minesweeper.reveal_cell(5, 5)
+    space_exploration_game.AstroPuzzleNavigator.board_size = 12
+    astro = space_exploration_game.AstroPuzzleNavigator("bench")
+    space_exploration_game.AstroPuzzleNavigator.board_size = 3
+    quantum = space_exploration_game.QuantumCircuitPuzzle("bench", 20)
+    for label, game in (("Tic-Tac-Toe", tictactoe), ("Minesweeper 10x10", minesweeper),
+                        ("Astro-Puzzle 12x12", astro), ("Quantum Circuit 20 qubits", quantum)):
+        report(f"{label} draw()", measure(game.draw, 1000), budget=1 / 60)
+        report(f"{label} draw(), baking every frame", measure(lambda: (game.board_layer.invalidate(), game.draw()), 1000))
+
+
+# Input pipeline: input-to-flip latency of key presses posted from another thread at random moments while a
+# 60 fps loop runs, with the input stage first against the old order of drawing first; Snake turns pressed in
+# pairs within one move; and a burst of mouse motion coalesced per frame
+def bench_input(seconds=3.0):
+    import random
+    import threading
+    import pygame
+    import game_suit
+    import ui
+
+    def run(draw_first):
+        game = game_suit.TicTacToe("bench")
+        inputs = ui.InputStage()
+        clock = pygame.time.Clock()
+        done = threading.Event()
+
+        def press():
+            while not done.wait(random.uniform(0.005, 0.05)):
+                pygame.event.post(pygame.event.Event(pygame.KEYDOWN, key=pygame.K_a, unicode="a", mod=0, posted=time.perf_counter()))
+
+        poster = threading.Thread(target=press)
+        poster.start()
+        end = time.perf_counter() + seconds
+        while time.perf_counter() < end:
+            if draw_first:
+                game.draw()
+                inputs.flipped()
+            for event in inputs.poll():
+                game.handle_input(event)
+            if not draw_first:
+                game.update()
+                game.draw()
+                inputs.flipped()
+            clock.tick(60)
+        done.set()
+        poster.join()
+        return sorted(inputs.latencies)
+
+    report("key to flip, input stage first", run(False), budget=1 / 60)
+    report("key to flip, drawing first", run(True))
+
+    inputs = ui.InputStage()
+    applied = crashed = 0
+    for _ in range(200):
+        snake = game_suit.SnakeGame("bench")  # heading right from the middle of the board
+        for key in (pygame.K_UP, pygame.K_LEFT):
+            pygame.event.post(pygame.event.Event(pygame.KEYDOWN, key=key, unicode="", mod=0))
+        for event in inputs.poll():
+            snake.handle_input(event)
+        snake.update()
+        applied += snake.direction == (0, -1)
+        snake.update()
+        applied += snake.direction == (-1, 0)
+        crashed += snake.game_over
+    print(f"Snake: {applied} of 400 turns pressed two to a move applied, {crashed} crashes into itself")
+
+    inputs = ui.InputStage()
+    for frame in range(100):
+        for step in range(20):
+            pygame.event.post(pygame.event.Event(pygame.MOUSEMOTION, pos=(frame, step), rel=(1, 0), buttons=(1, 0, 0)))
+        inputs.poll()
+    print(f"Mouse: {inputs.events + inputs.coalesced} motion events, {inputs.events} handled after coalescing")
+
+
+# Timer scheduler: a frame's run_due() with 10,000 timers pending and none due, firing them (a third of them
+# cancelled first), and the share of a 60 fps Meteorite Match-Up loop spent asleep between frames
+def bench_scheduler(pending=10_000, seconds=4.0):
+    import asyncio
+    import random
+    import pygame
+    import ui
+    from scheduler import Scheduler
+
+    now = [0]
+    timers = Scheduler(clock=lambda: now[0])
+    rng = random.Random(4)
+    entries = [timers.after(rng.randrange(1000, 100_000), lambda: None) for _ in range(pending)]
+    for timer in entries[::3]:
+        timer.cancel()
+    report(f"run_due() with {pending} pending, none due", measure(timers.run_due, 10_000), budget=1e-4)
+    now[0] = 100_000
+    start = time.perf_counter()
+    timers.run_due()
+    elapsed = time.perf_counter() - start
+    print(f"popped {pending} due entries ({timers.fired} live, the rest cancelled) in {elapsed * 1e3:.1f} ms, "
+          f"{elapsed / pending * 1e6:.2f} us each")
+
+    import space_exploration_game
+
+    game = space_exploration_game.MeteoriteMatchUp("bench", (8, 8))
+    ui.timers.slept, ui.timers.started, ui.timers.fired = 0, None, 0
+
+    async def loop():
+        end = time.perf_counter() + seconds
+        frames = 0
+        while time.perf_counter() < end:
+            frame_end = pygame.time.get_ticks() + 1000 // 60
+            frames += 1
+            if frames % 40 == 0 and not game.game_over:
+                game.reveal(rng.choice([k for k in range(len(game.symbols)) if not game.revealed[k] and not game.matched[k]]))
+            ui.timers.run_due()
+            game.draw()
+            await asyncio.sleep(ui.timers.idle(frame_end) / 1000)
+
+    asyncio.run(loop())
+    print(f"Meteorite Match-Up 8x8 at 60 fps, a card revealed every 40 frames: {ui.timers.summary()}")
+
+
+# Telemetry: the per-frame cost of recording a heavy 100 moves per 60 fps frame with telemetry off, with a healthy
+# disk and with a disk that stalls for a second on every batch, what each drops, and the size of the gzipped stream
+def bench_telemetry(per_frame=100, seconds=3.0):
+    import tempfile
+    import telemetry
+
+    class StalledRecorder(telemetry.Recorder):
+        def write(self, data, count):
+            time.sleep(1.0)
+            super().write(data, count)
+
+    def frames(label):
+        session = telemetry.Session("Minesweeper", "bench")
+        samples = []
+        end = time.perf_counter() + seconds
+        while time.perf_counter() < end:
+            start = time.perf_counter()
+            for k in range(per_frame):
+                session.move(action="reveal", cell=(k % 16, k // 16), first=False)
+            samples.append(time.perf_counter() - start)
+            time.sleep(max(0.0, 1 / 60 - (time.perf_counter() - start)))
+        samples.sort()
+        report(f"{per_frame} moves per frame, {label}", samples, budget=1e-3)
+
+    frames("telemetry off")
+    with tempfile.TemporaryDirectory() as directory:
+        recorder = telemetry.start(directory)
+        frames("healthy disk")
+        print(telemetry.stop())
+        packed = sum(os.path.getsize(os.path.join(directory, name)) for name in os.listdir(directory))
+        print(f"gzipped on disk: {packed / 1024:.0f} KiB, {packed / recorder.events_written:.1f} bytes per event")
+
+        telemetry.recorder = StalledRecorder(directory).start()
+        frames("disk stalled 1 s/batch")
+        print(telemetry.stop())
+
+
+# Thumbnails: final boards rendered from telemetry streams by a process pool, as thumbnails per hour per core,
+# and the peak memory of a worker, which holds one blank game per kind however many states it renders
+def bench_thumbnails(sessions=600):
+    import random
+    import tempfile
+    import game_suit
+    import space_exploration_game
+    import telemetry
+    import thumbnails
+
+    kinds = [game_suit.SnakeGame, game_suit.TicTacToe, game_suit.Hangman, game_suit.Minesweeper,
+             space_exploration_game.MeteoriteMatchUp, space_exploration_game.AstroPuzzleNavigator,
+             space_exploration_game.CosmicJigsawExplore, space_exploration_game.NebulaMazeRunner]
+    rng = random.Random(6)
+    with tempfile.TemporaryDirectory() as source, tempfile.TemporaryDirectory() as target:
+        telemetry.start(source)
+        for k in range(sessions):
+            game = kinds[k % len(kinds)]("bench")
+            if isinstance(game, game_suit.Minesweeper):
+                game.reveal_cell(rng.randrange(game.grid_size), rng.randrange(game.grid_size))
+            game.telemetry.end("quit", game.score)
+        telemetry.stop()
+        workers = os.cpu_count() or 1
+        start = time.perf_counter()
+        count, peak = thumbnails.render_all(source, target, workers)
+        elapsed = time.perf_counter() - start
+        peak /= 1024
+        print(f"{count} thumbnails from {len(kinds)} games on {workers} worker(s) in {elapsed:.1f} s: "
+              f"{count / elapsed * 3600 / workers:,.0f} per hour per core, peak worker memory {peak:.0f} MB")
+
+
+# Window scaling: what upscaling the 800x600 frame in software would cost per frame at kiosk window sizes, nearest
+# and smooth. The game window leaves this to SDL's renderer, which scales on the GPU at a flat cost.
+def bench_scaling():
+    import pygame
+    import ui
+
+    frame = ui.screen.copy()
+    for label, size in (("1080p", (1440, 1080)), ("1440p", (1920, 1440)), ("4K", (2880, 2160))):
+        target = pygame.Surface(size).convert()
+        report(f"software nearest to {label} {size[0]}x{size[1]}",
+               measure(lambda: pygame.transform.scale(frame, size, target), 50), budget=1 / 60)
+        report(f"software smooth to {label} {size[0]}x{size[1]}",
+               measure(lambda: pygame.transform.smoothscale(frame, size, target), 20), budget=1 / 60)
+
+
+# Snake Arena: ticks per second as the number of bot snakes grows on a 400x300 grid, with every collision answered
+# by the shared occupancy grid, against checking each head against every body
+def bench_arena(counts=(10, 50, 100, 200, 500, 1000), ticks=200):
+    import arena
+
+    for count in counts:
+        board = arena.Arena(400, 300, seed=count)
+        for _ in range(count):
+            board.add_snake()
+        for _ in range(50):
+            board.tick()  # let the snakes grow and spread out
+        samples = measure(board.tick, ticks)
+        bodies = [list(snake.body) for snake in board.snakes if snake.alive]
+        naive = measure(lambda: [any(body[0] in other[1:] if other is body else body[0] in other for other in bodies)
+                                 for body in bodies], 5)
+        print(f"{count:5d} snakes: tick median {percentile(samples, 50) * 1e3:6.2f} ms "
+              f"({1 / percentile(samples, 50):7,.0f} ticks/s), p99 {percentile(samples, 99) * 1e3:6.2f} ms; "
+              f"checking every head against every body {percentile(naive, 50) * 1e3:8.2f} ms")
+
+
+# Snake autopilot: SnakeGame played headlessly by the autopilot until the snake fills the board, timing each
+# decision (budget: under 1 ms at any length) and counting the ticks the whole board takes
+def bench_autopilot(grids=((40, 27), (64, 48))):
+    import game_suit
+
+    for width, height in grids:
+        game = game_suit.SnakeGame("bench", (width, height))
+        game.set_autopilot(True)
+        steer, samples = game.autopilot.steer, []
+
+        def timed_steer(*args):
+            start = time.perf_counter()
+            direction = steer(*args)
+            samples.append(time.perf_counter() - start)
+            return direction
+
+        game.autopilot.steer = timed_steer
+        start = time.perf_counter()
+        while not game.game_over:
+            game.update()
+        elapsed = time.perf_counter() - start
+        samples.sort()
+        report(f"decision on {width}x{height}", samples, budget=1e-3)
+        print(f"{'filled the board' if game.won else 'died'} at length {len(game.snake):,} after {len(samples):,} ticks "
+              f"({elapsed:.1f} s)")
+
+
+# Content pack: picking a random space fact from a pack of millions, and the startup time and memory of a
+# program that opens the pack, against one reading the same facts into a list as the built-in literals are
+def bench_content(records=2_000_000, repeat=5):
+    import random
+    import subprocess
+    import tempfile
+    import content
+
+    here = os.path.dirname(os.path.abspath(__file__))
+    with tempfile.TemporaryDirectory() as directory:
+        path, text = os.path.join(directory, "content.pack"), os.path.join(directory, "facts.txt")
+        with open(text, "w", encoding="utf-8") as f:
+            for i in range(records):
+                f.write(f"Fact {i}: {content.BUILTIN['facts'][i % len(content.BUILTIN['facts'])]}\n")
+        start = time.perf_counter()
+        content.build(path, {"facts": content.read_lines(text, "facts", [])})
+        print(f"{records:,} facts packed in {time.perf_counter() - start:.1f} s ({os.path.getsize(path) / 2**20:.0f} MB)")
+        facts = content.open_pack(path)["facts"]
+        rng = random.Random(7)
+        report("random fact from the pack", measure(lambda: rng.choice(facts), 10_000), budget=1e-3)
+
+        # Peak RSS from /proc (Linux): ru_maxrss would carry over this process's own peak across the exec
+        ready = "print([line.split()[1] for line in open('/proc/self/status') if line.startswith('VmHWM')][0])"
+        programs = {
+            "built-in facts (no pack)": (os.path.join(directory, "missing.pack"), "import content; content.section('facts')"),
+            f"pack of {records:,} facts": (path, "import content, random; random.choice(content.section('facts'))"),
+            f"list of {records:,} facts": (path, f"import random; random.choice(open({text!r}, encoding='utf-8').read().splitlines())"),
+        }
+        for label, (pack, code) in programs.items():
+            samples, rss = [], 0
+            for _ in range(repeat):
+                start = time.perf_counter()
+                output = subprocess.run([sys.executable, "-c", f"{code}; {ready}"], cwd=here, capture_output=True, text=True,
+                                        env=dict(os.environ, GAME_CONTENT=pack), check=True).stdout
+                samples.append(time.perf_counter() - start)
+                rss = max(rss, int(output.split()[-1]))
+            samples.sort()
+            report(f"{label} startup", samples)
+            print(f"{'':<40} max RSS {rss / 1024:9.1f} MB")
+
+
+BENCHMARKS = {
+    "snapshot": bench_snapshot,
+    "code_breaker": bench_code_breaker,
+    "sliding_solver": bench_sliding_solver,
+    "maze": bench_maze,
+    "maze_draw": bench_maze_draw,
+    "drones": bench_drones,
+    "jigsaw_drag": bench_jigsaw_drag,
+    "word_jigsaw": bench_word_jigsaw,
+    "quantum": bench_quantum,
+    "starfield": bench_starfield,
+    "server": bench_server,
+    "spectate": bench_spectate,
+    "launcher": bench_launcher,
+    "static_layers": bench_static_layers,
+    "input": bench_input,
+    "scheduler": bench_scheduler,
+    "telemetry": bench_telemetry,
+    "thumbnails": bench_thumbnails,
+    "scaling": bench_scaling,
+    "arena": bench_arena,
+    "autopilot": bench_autopilot,
+    "content": bench_content,
+}
+
+if __name__ == "__main__":
+    for name in sys.argv[1:] or BENCHMARKS:
+        print(f"== {name}")
+        BENCHMARKS[name]()
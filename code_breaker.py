@@ -0,0 +1,226 @@
+import bisect
+import string
+import time
+from functools import lru_cache
+
+import numpy as np
+
+# Code spaces up to this many codes are enumerated up front; larger ones are sampled
+MAX_CODE_SPACE = 1 << 24
+SCORE_SAMPLE = 4096  # consistent codes each candidate guess is scored against
+GUESS_POOL = 192  # candidate guesses scored per hint
+LARGE_SPACE_SAMPLE = 1024  # consistent codes drawn at once when the space is too big to enumerate
+LARGE_SPACE_REFILL = 64  # redraw once fewer carried-over codes than this remain consistent
+MAX_COMPLETION_STATES = 20000  # give up on exact counting past this many DP states
+COUNT_SECONDS = 0.03  # ... or once counting for a hint has taken this long
+SEARCH_BATCH = 256  # codes repaired in parallel when counting is no longer possible
+SEARCH_ROUNDS = 64
+SEARCH_SECONDS = 0.05  # the search stops here with the codes it has; with counting, a hint stays under 100 ms
+
+
+@lru_cache(maxsize=None)
+def code_space(length, alphabet_size):
+    # Every code as a row of letter indices, shared read-only by all solvers of the same shape
+    space = np.indices((alphabet_size,) * length, dtype=np.uint8).reshape(length, -1).T
+    space = np.ascontiguousarray(space)
+    space.flags.writeable = False
+    return space
+
+
+def score_guess(guess, code):
+    # The game's feedback: how many letters are right and in the right place
+    return sum(a == b for a, b in zip(guess, code))
+
+
+# Candidate elimination plus minimax guess selection over a NumPy code space.
+# Feedback is only "N correct letters", so every guess splits the consistent codes into length + 1 groups;
+# the hint is the guess whose largest group is smallest (ties: smaller expected group, then a guess that can win).
+class CodeBreakerSolver:
+    def __init__(self, length=4, alphabet=string.ascii_uppercase, seed=None):
+        if len(alphabet) > 255:
+            raise ValueError("Alphabets are limited to 255 letters")
+        self.length = length
+        self.alphabet = alphabet
+        self.rng = np.random.default_rng(seed)
+        self.space_size = len(alphabet) ** length
+        self.exact = self.space_size <= MAX_CODE_SPACE
+        self.candidates = code_space(length, len(alphabet)) if self.exact else None
+        self.history = []  # (encoded guess, correct letters)
+        self.completions = None  # large spaces: per-position completion counts, rebuilt after each guess
+        self.pool = None  # large spaces: consistent codes carried over between guesses
+        self.countable = True  # large spaces: False once the completion DP has outgrown its cap
+
+    def encode(self, code):
+        # Letters outside the alphabet become 255, which never matches
+        return np.array([self.alphabet.find(letter) for letter in code.upper()], dtype=np.int16).astype(np.uint8)
+
+    def decode(self, row):
+        return "".join(self.alphabet[index] for index in row)
+
+    def observe(self, guess, correct):
+        encoded = self.encode(guess)
+        self.history.append((encoded, correct))
+        if self.exact:
+            self.candidates = self.candidates[(self.candidates == encoded).sum(axis=1) == correct]
+        else:
+            self.completions = None
+            if self.pool is not None:
+                self.pool = self.pool[(self.pool == encoded).sum(axis=1) == correct]
+
+    def candidates_left(self):
+        # Exact for enumerated spaces; None when a large space is too tangled to count
+        if self.exact:
+            return len(self.candidates)
+        if not self.history:
+            return self.space_size
+        ways = self.count_completions()
+        return None if ways is None else ways[0].get((0,) * len(self.history), 0)
+
+    def count_completions(self, seconds=None):
+        # Large spaces are never enumerated. Feedback only depends on which guesses each letter hits at each
+        # position, so letters with the same hit pattern are interchangeable; ways[p][hits] counts the codes
+        # completing positions p.. from running per-guess hit counts `hits` to exactly the observed feedback.
+        if self.completions is not None or not self.countable:
+            return self.completions
+        deadline = None if seconds is None else time.perf_counter() + seconds
+        target = tuple(correct for _, correct in self.history)
+        letters = np.arange(len(self.alphabet))
+        self.classes = []
+        for position in range(self.length):
+            hits = np.stack([letters == guess[position] for guess, _ in self.history], axis=1).astype(np.uint8)
+            groups = {}
+            for letter, pattern in enumerate(map(tuple, hits.tolist())):
+                groups.setdefault(pattern, []).append(letter)
+            self.classes.append(list(groups.items()))
+        ways = [None] * self.length + [{target: 1}]
+        states = 0
+        for position in reversed(range(self.length)):
+            layer = {}
+            for after, count in ways[position + 1].items():
+                for pattern, group in self.classes[position]:
+                    before = tuple(a - b for a, b in zip(after, pattern))
+                    if min(before) >= 0:
+                        layer[before] = layer.get(before, 0) + len(group) * count
+                if states + len(layer) > MAX_COMPLETION_STATES or deadline is not None and time.perf_counter() > deadline:
+                    # Later guesses only add constraints to track, so don't retry
+                    self.countable = False
+                    return None
+            ways[position] = layer
+            states += len(layer)
+        self.completions = ways
+        self.choices = {}
+        return ways
+
+    def sample_completions(self, count):
+        # Uniform draws from the consistent codes, walking forward through the completion counts
+        ways = self.count_completions(COUNT_SECONDS)
+        start = (0,) * len(self.history)
+        if ways is None or start not in ways[0]:
+            return np.empty((0, self.length), dtype=np.uint8)
+        codes = np.empty((count, self.length), dtype=np.uint8)
+        draws = self.rng.random((count, self.length))
+        picks = self.rng.random((count, self.length))
+        for row in range(count):
+            hits = start
+            for position in range(self.length):
+                key = (position, hits)
+                if key not in self.choices:
+                    options, totals, total = [], [], 0
+                    for pattern, group in self.classes[position]:
+                        after = tuple(a + b for a, b in zip(hits, pattern))
+                        weight = len(group) * ways[position + 1].get(after, 0)
+                        if weight:
+                            total += weight
+                            options.append((after, group))
+                            totals.append(total)
+                    self.choices[key] = (options, [t / total for t in totals])
+                options, cumulative = self.choices[key]
+                hits, group = options[min(bisect.bisect_right(cumulative, draws[row, position]), len(options) - 1)]
+                codes[row, position] = group[int(picks[row, position] * len(group))]
+        return np.unique(codes, axis=0)
+
+    def search_consistent(self):
+        # Min-conflicts local search: repeatedly give each code the letter at one position that brings its
+        # per-guess hit counts closest to the observed feedback, keeping codes that match every guess
+        guesses = np.stack([guess for guess, _ in self.history])
+        target = np.array([correct for _, correct in self.history])
+        letters = np.arange(len(self.alphabet))
+        codes = self.random_codes(SEARCH_BATCH)
+        found = []
+        deadline = time.perf_counter() + SEARCH_SECONDS
+        for step in range(SEARCH_ROUNDS * self.length):
+            if time.perf_counter() > deadline:
+                break
+            position = step % self.length
+            hits = (codes[:, None, :] == guesses[None, :, :]).sum(axis=2)
+            solved = np.abs(hits - target).sum(axis=1) == 0
+            if solved.any():
+                found.append(codes[solved].copy())
+                if sum(map(len, found)) >= SEARCH_BATCH:
+                    break
+                codes[solved] = self.random_codes(int(solved.sum()))
+                hits = (codes[:, None, :] == guesses[None, :, :]).sum(axis=2)
+            base = hits - (codes[:, position, None] == guesses[None, :, position])
+            swaps = letters[:, None] == guesses[None, :, position]  # (letter, guess)
+            costs = np.abs(base[:, None, :] + swaps[None, :, :] - target).sum(axis=2)
+            codes[:, position] = (costs + self.rng.random(costs.shape)).argmin(axis=1)
+        if not found:
+            return np.empty((0, self.length), dtype=np.uint8)
+        return np.unique(np.concatenate(found), axis=0)
+
+    def random_codes(self, count):
+        return self.rng.integers(0, len(self.alphabet), (count, self.length), dtype=np.uint8)
+
+    def sample(self, count):
+        if self.exact:
+            if len(self.candidates) <= count:
+                return self.candidates
+            return self.candidates[self.rng.choice(len(self.candidates), count, replace=False)]
+        if self.pool is None or len(self.pool) < LARGE_SPACE_REFILL:
+            fresh = self.sample_completions(LARGE_SPACE_SAMPLE)
+            if not self.countable:
+                fresh = self.search_consistent()
+                if self.pool is not None:
+                    fresh = np.unique(np.concatenate([self.pool, fresh]), axis=0)
+            if self.pool is None or len(fresh):
+                self.pool = fresh
+        if len(self.pool) <= count:
+            return self.pool
+        return self.pool[self.rng.choice(len(self.pool), count, replace=False)]
+
+    def hint(self):
+        if not self.history:
+            # Every opening guess splits the untouched code space the same way
+            return self.decode(self.random_codes(1)[0])
+        sample = self.sample(SCORE_SAMPLE)
+        if len(sample) == 0:
+            return None
+        if len(sample) <= 2:
+            return self.decode(sample[0])
+        own = sample[self.rng.permutation(len(sample))[:GUESS_POOL // 2]]
+        # Non-candidate probes: each position's letter taken from a different consistent code
+        mixed = sample[self.rng.integers(0, len(sample), (GUESS_POOL - len(own), self.length)), np.arange(self.length)]
+        pool = np.concatenate([own, mixed])
+        is_candidate = np.zeros(len(pool), dtype=bool)
+        is_candidate[:len(own)] = True
+        matches = (pool[:, None, :] == sample[None, :, :]).sum(axis=2)  # (pool, sample) -> correct letters
+        groups = self.length + 1
+        offsets = np.arange(len(pool))[:, None] * groups
+        sizes = np.bincount((matches + offsets).ravel(), minlength=len(pool) * groups).reshape(len(pool), groups)
+        worst = sizes.max(axis=1)
+        expected = (sizes.astype(np.int64) ** 2).sum(axis=1)
+        best = np.lexsort((~is_candidate, expected, worst))[0]
+        return self.decode(pool[best])
+
+
+def solve(secret, alphabet=string.ascii_uppercase, seed=None, max_guesses=64):
+    # Headless play-through: returns the guesses the solver needed to crack `secret`
+    solver = CodeBreakerSolver(len(secret), alphabet, seed)
+    guesses = []
+    while len(guesses) < max_guesses:
+        guess = solver.hint()
+        guesses.append(guess)
+        if guess == secret:
+            break
+        solver.observe(guess, score_guess(guess, secret))
+    return guesses
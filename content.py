@@ -0,0 +1,183 @@
+import mmap
+import os
+import re
+import struct
+import sys
+from array import array
+
+# Content pack: the space facts, Hangman words and Cosmic Jigsaw phrases in one file, so the games can draw
+# from millions of records without loading them. The file is memory-mapped and a record is found through an
+# offset index, so opening a pack reads only its header and picking a record touches only the pages it sits on.
+#   header: magic, format version, section count
+#   section table: name, record count, index offset, data offset (absolute file offsets)
+#   per section: the UTF-8 records back to back, then count + 1 offsets into them (uint64, little-endian)
+# Built with python content.py build [NAME=FILE ...], one record per line of FILE; sections not given are packed
+# from BUILTIN, which is also what the games use when there is no pack (as in the browser).
+PACK_PATH = os.environ.get("GAME_CONTENT", os.path.join(os.path.dirname(os.path.abspath(__file__)), "content.pack"))
+PACK_MAGIC = b"GSCP"
+PACK_VERSION = 1
+PACK_HEADER = struct.Struct("<4sBH")
+SECTION = struct.Struct("<16sIQQ")
+OFFSETS = struct.Struct("<QQ")  # one record's start and end, read straight from the index
+
+BUILTIN = {
+    "facts": [
+        "The Sun is a star, about 4.6 billion years old, and makes up 99.86% of the Solar System's mass.",
+        "Jupiter has 79 known moons, the largest being Ganymede, which is bigger than Mercury.",
+        "A light-year is the distance light travels in one year, about 5.88 trillion miles (9.46 trillion km).",
+        "The Milky Way galaxy contains an estimated 100-400 billion stars and is about 100,000 light-years across.",
+        "Black holes have such strong gravity that not even light can escape; they form from massive star collapses.",
+        "The first human in space was Yuri Gagarin, who orbited Earth on April 12, 1961, aboard Vostok 1.",
+        "Mars has the largest volcano in the Solar System, Olympus Mons, which is 13.6 miles (22 km) high.",
+        "Neutron stars are so dense that a teaspoon of their material would weigh as much as Mount Everest.",
+        "The Hubble Space Telescope has been observing the universe since 1990, capturing images of distant galaxies.",
+        "Saturn's rings are made of ice and rock particles, some as small as dust and others as large as mountains.",
+    ],
+    "hangman": ["PYTHON", "PROGRAMMING", "COMPUTER", "ALGORITHM", "DATABASE"],
+    "phrases": [
+        "COSMIC",
+        "STARDUST",
+        "NEBULA DRIFT",
+        "EVENT HORIZON",
+        "THE EAGLE HAS LANDED",
+        "TO INFINITY AND BEYOND",
+        "HOUSTON WE HAVE A PROBLEM",
+        "ONE SMALL STEP FOR MAN",
+        "THE COSMOS IS WITHIN US",
+        "WE ARE MADE OF STAR STUFF",
+    ],
+}
+UPPERCASE = {"hangman", "phrases"}  # sections the games compare letter by letter against key presses
+WORD = re.compile("[A-Z]+")  # a Hangman word: every letter has to be guessable with a single key press
+PHRASE_LETTERS = 160  # Cosmic Jigsaw word mode lays phrases out 16 letters a row, and 10 rows fit above the score
+REPORTED = 10  # rejected lines printed per section by python content.py build
+
+_sections = None  # name -> Section of the open pack, once looked for; empty without a usable pack
+
+
+# One section of a mapped pack: a read-only sequence of strings, so random.choice() seeks to a single record
+class Section:
+    def __init__(self, data, count, index, start):
+        self.data = data
+        self.count = count
+        self.index = index
+        self.start = start
+
+    def __len__(self):
+        return self.count
+
+    def __getitem__(self, i):
+        if i < 0:
+            i += self.count
+        if not 0 <= i < self.count:
+            raise IndexError("record out of range")
+        begin, end = OFFSETS.unpack_from(self.data, self.index + 8 * i)
+        return self.data[self.start + begin:self.start + end].decode(errors="replace")
+
+
+def open_pack(path=PACK_PATH):
+    # name -> Section for every section of the pack at path, or {} if there is none, it is from another version
+    # or it is cut short or corrupt: every section's table entry, index and records must lie inside the file
+    try:
+        with open(path, "rb") as f:
+            data = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+    except (OSError, ValueError):
+        return {}
+    size = data.size()
+    try:
+        magic, version, count = PACK_HEADER.unpack_from(data)
+        if magic != PACK_MAGIC or version != PACK_VERSION or PACK_HEADER.size + count * SECTION.size > size:
+            return {}
+        sections = {}
+        for k in range(count):
+            name, records, index, start = SECTION.unpack_from(data, PACK_HEADER.size + k * SECTION.size)
+            if index + 8 * (records + 1) > size:
+                return {}
+            (end,) = struct.unpack_from("<Q", data, index + 8 * records)
+            if start + end > index:
+                return {}
+            sections[name.rstrip(b"\0").decode()] = Section(data, records, index, start)
+    except (struct.error, UnicodeDecodeError):
+        return {}
+    return sections
+
+
+def section(name):
+    # The pack's records for name, or the built-in ones
+    global _sections
+    if _sections is None:
+        _sections = open_pack()
+    return _sections.get(name) or BUILTIN[name]
+
+
+def build(path, sources):
+    # Writes a pack from sources, name -> iterable of strings, streaming the records to disk; only the offsets
+    # (8 bytes a record) are held in memory. Returns the record count of each section.
+    counts = {}
+    with open(path + ".tmp", "wb") as f:
+        f.write(bytes(PACK_HEADER.size + len(sources) * SECTION.size))
+        table = []
+        for name, records in sources.items():
+            start = f.tell()
+            offsets = array("Q", [0])
+            for record in records:
+                offsets.append(offsets[-1] + f.write(record.encode()))
+            if sys.byteorder != "little":
+                offsets.byteswap()
+            index = f.tell()
+            f.write(offsets.tobytes())
+            counts[name] = len(offsets) - 1
+            table.append(SECTION.pack(name.encode(), counts[name], index, start))
+        f.seek(0)
+        f.write(PACK_HEADER.pack(PACK_MAGIC, PACK_VERSION, len(sources)) + b"".join(table))
+    os.replace(path + ".tmp", path)
+    return counts
+
+
+def rejection(name, record):
+    # Why a game could not use record in section name, or None if it can
+    if name == "hangman" and not WORD.fullmatch(record):
+        return "not a word of the letters A-Z"
+    if name == "phrases":
+        if len(set(record)) < 2:
+            return "needs two different letters to shuffle"
+        if len(record) > PHRASE_LETTERS:
+            return f"longer than {PHRASE_LETTERS} letters"
+        if not record.isprintable():
+            return "has unprintable characters"
+    return None
+
+
+def read_lines(path, name, rejected):
+    # The usable records of a text file, one per non-blank line; the others go to rejected as (line number, line, why)
+    with open(path, encoding="utf-8") as f:
+        for number, line in enumerate(f, 1):
+            line = line.strip()
+            if name in UPPERCASE:
+                line = line.upper()
+            if not line:
+                continue
+            why = rejection(name, line)
+            if why:
+                rejected.append((number, line, why))
+            else:
+                yield line
+
+
+if __name__ == "__main__":
+    if sys.argv[1:2] == ["build"] and all("=" in arg for arg in sys.argv[2:]):
+        files = dict(arg.split("=", 1) for arg in sys.argv[2:])
+        rejected = {name: [] for name in BUILTIN}
+        sources = {name: read_lines(files[name], name, rejected[name]) if name in files else records
+                   for name, records in BUILTIN.items()}
+        for name, count in build(PACK_PATH, sources).items():
+            print(f"{name}: {count:,} records")
+            if rejected[name]:
+                print(f"  {len(rejected[name]):,} lines of {files[name]} rejected:")
+                for number, line, why in rejected[name][:REPORTED]:
+                    print(f"  line {number}: {line[:60]!r} {why}")
+                if len(rejected[name]) > REPORTED:
+                    print(f"  ... and {len(rejected[name]) - REPORTED:,} more")
+        print(f"written to {PACK_PATH}")
+    else:
+        print("usage: python content.py build [facts=FILE] [hangman=FILE] [phrases=FILE]")
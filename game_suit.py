@@ -1,18 +1,25 @@
 import asyncio
 import platform
+import sys
 import pygame
 import random
 import math
-from collections import defaultdict
-
-# Initialize Pygame
-pygame.init()
-
-# Screen settings
-WIDTH, HEIGHT = 800, 600
-screen = pygame.display.set_mode((WIDTH, HEIGHT))
-pygame.display.set_caption("Classic Game Suite")
-FONT = pygame.font.SysFont("arial", 30)
+import struct
+from array import array
+from collections import deque
+from functools import lru_cache
+import arena
+from autopilot import Autopilot
+import content
+import save_state
+from history import MoveHistory, handle_history_key
+import spectate
+import telemetry
+import ui
+
+# Window, theme and leaderboard are shared with the Cosmic Quest suite and the launcher (ui.py)
+from ui import WIDTH, HEIGHT, screen, theme, starfield, leaderboard, timers
+FONT = ui.font(30)
 
 # Colors
 WHITE = (255, 255, 255)
@@ -22,35 +29,20 @@ GREEN = (0, 255, 0)
 BLUE = (0, 0, 255)
 GRAY = (128, 128, 128)
 
-# Theme settings
-class Theme:
-    def __init__(self):
-        self.is_dark = True
-        self.background = BLACK
-        self.text_color = WHITE
-        self.border_color = WHITE
-
-    def toggle(self):
-        self.is_dark = not self.is_dark
-        self.background = BLACK if self.is_dark else WHITE
-        self.text_color = WHITE if self.is_dark else BLACK
-        self.border_color = WHITE if self.is_dark else BLACK
-
-theme = Theme()
-
-# Leaderboard (in-memory storage)
-leaderboard = defaultdict(list)  # {game: [(name, score), ...]}
+ARROW_TURNS = {pygame.K_UP: (0, -1), pygame.K_DOWN: (0, 1), pygame.K_LEFT: (-1, 0), pygame.K_RIGHT: (1, 0)}
+WASD_TURNS = {pygame.K_w: (0, -1), pygame.K_s: (0, 1), pygame.K_a: (-1, 0), pygame.K_d: (1, 0)}
 
 # Main Menu
 class MainMenu:
     def __init__(self):
-        self.options = ["Snake", "Tic-Tac-Toe", "Hangman", "Minesweeper", "Number Guessing", "Quit"]
+        self.options = ["Snake", "Tic-Tac-Toe", "Hangman", "Minesweeper", "Number Guessing", "Snake Arena", "Quit"]
         self.selected = 0
         self.player_name = ""
         self.name_input = False
 
     def draw(self):
         screen.fill(theme.background)
+        starfield.draw(screen, theme.background, theme.text_color)
         if self.name_input:
             text = FONT.render(f"Enter Name: {self.player_name}", True, theme.text_color)
             screen.blit(text, (WIDTH // 2 - text.get_width() // 2, HEIGHT // 2))
@@ -95,45 +87,94 @@ class MainMenu:
 
 # Snake Game
 class SnakeGame:
-    def __init__(self, player_name):
+    max_turns = 3  # Turns queued ahead of the snake; more presses in one move are dropped
+
+    def __init__(self, player_name, grid=None):
         self.player_name = player_name
-        self.cell_size = 20
-        self.grid_width = WIDTH // self.cell_size
-        self.grid_height = (HEIGHT - 50) // self.cell_size
+        if grid is None:
+            self.cell_size = 20
+            self.grid_width = WIDTH // self.cell_size
+            self.grid_height = (HEIGHT - 50) // self.cell_size
+        else:
+            # Other board sizes (autopilot runs, benchmarks) are scaled to fit the window
+            self.grid_width, self.grid_height = grid
+            self.cell_size = max(1, min(20, WIDTH // self.grid_width, (HEIGHT - 50) // self.grid_height))
         self.snake = [(self.grid_width // 2, self.grid_height // 2)]
+        self.occupied = set(self.snake)  # The snake's cells, for O(1) collision checks at any length
         self.direction = (1, 0)
+        self.turns = deque()  # Arrow presses not applied yet, one per move, so two quick turns both count
         self.food = self.spawn_food()
         self.score = 0
         self.game_over = False
+        self.won = False
+        self.autopilot = None  # Steers while switched on with A
+        self.autopiloted = False  # A run the autopilot played any part of stays off the leaderboard
+        self.telemetry = telemetry.Session("Snake", player_name, self.snapshot)
 
     def spawn_food(self):
-        while True:
+        for _ in range(100):
             food = (random.randint(0, self.grid_width - 1), random.randint(0, self.grid_height - 1))
-            if food not in self.snake:
+            if food not in self.occupied:
                 return food
+        # A nearly full board: pick among the cells left
+        return random.choice([(x, y) for x in range(self.grid_width) for y in range(self.grid_height)
+                              if (x, y) not in self.occupied])
+
+    def turn(self, direction):
+        # Checked against the last queued turn, so a quick up-left from moving right is not a reversal
+        dx, dy = self.turns[-1] if self.turns else self.direction
+        if direction not in ((dx, dy), (-dx, -dy)) and len(self.turns) < self.max_turns:
+            self.turns.append(direction)
+
+    def set_autopilot(self, on):
+        if on == (self.autopilot is not None):
+            return
+        self.autopilot = Autopilot(self.grid_width, self.grid_height) if on else None
+        self.autopiloted = self.autopiloted or on
+        self.turns.clear()
+        self.telemetry.event("autopilot", on=on)
 
     def update(self):
         if self.game_over:
             return
+        if self.autopilot is not None:
+            self.direction = self.autopilot.steer(self.snake, self.occupied, self.food)
+        elif self.turns:
+            self.direction = self.turns.popleft()
+            self.telemetry.move(direction=self.direction, length=len(self.snake))
         head_x, head_y = self.snake[0]
         dx, dy = self.direction
         new_head = (head_x + dx, head_y + dy)
         
-        if (new_head in self.snake or
+        if (new_head in self.occupied or
             new_head[0] < 0 or new_head[0] >= self.grid_width or
             new_head[1] < 0 or new_head[1] >= self.grid_height):
             self.game_over = True
-            leaderboard["Snake"].append((self.player_name, self.score))
-            leaderboard["Snake"].sort(key=lambda x: x[1], reverse=True)
-            leaderboard["Snake"] = leaderboard["Snake"][:5]  # Keep top 5
+            self.telemetry.end("lost", self.score)
+            if not self.autopiloted:
+                leaderboard["Snake"].append((self.player_name, self.score))
+                leaderboard["Snake"].sort(key=lambda x: x[1], reverse=True)
+                leaderboard["Snake"] = leaderboard["Snake"][:5]  # Keep top 5
             return
 
         self.snake.insert(0, new_head)
+        self.occupied.add(new_head)
         if new_head == self.food:
             self.score += 10
+            if len(self.snake) == self.grid_width * self.grid_height:
+                # The snake fills the board: nowhere left for food
+                self.game_over = True
+                self.won = True
+                self.telemetry.end("won", self.score)
+                if not self.autopiloted:
+                    leaderboard["Snake"].append((self.player_name, self.score))
+                    leaderboard["Snake"].sort(key=lambda x: x[1], reverse=True)
+                    leaderboard["Snake"] = leaderboard["Snake"][:5]
+                return
             self.food = self.spawn_food()
+            self.telemetry.event("food", score=self.score, length=len(self.snake))
         else:
-            self.snake.pop()
+            self.occupied.discard(self.snake.pop())
 
     def draw(self):
         screen.fill(theme.background)
@@ -144,35 +185,54 @@ class SnakeGame:
         fx, fy = self.food
         pygame.draw.rect(screen, RED, (fx * self.cell_size, fy * self.cell_size, self.cell_size, self.cell_size))
         # Draw score
-        text = FONT.render(f"Score: {self.score}", True, theme.text_color)
+        text = FONT.render(f"Score: {self.score}" + ("  Autopilot" if self.autopilot is not None else ""),
+                           True, theme.text_color)
         screen.blit(text, (10, HEIGHT - 40))
         if self.game_over:
-            text = FONT.render("Game Over! Press R to Restart or ESC to Menu", True, theme.text_color)
+            message = "Board Filled! " if self.won else "Game Over! "
+            text = FONT.render(message + "Press R to Restart or ESC to Menu", True, theme.text_color)
             screen.blit(text, (WIDTH // 2 - text.get_width() // 2, HEIGHT // 2))
         else:
-            text = FONT.render("Press ESC to return to Menu", True, theme.text_color)
+            text = FONT.render("Press ESC to return to Menu, A for Autopilot", True, theme.text_color)
             screen.blit(text, (WIDTH // 2 - text.get_width() // 2, HEIGHT - 80))
         pygame.display.flip()
 
     def handle_input(self, event):
         if event.type == pygame.KEYDOWN:
-            if event.key == pygame.K_UP and self.direction != (0, 1):
-                self.direction = (0, -1)
-            elif event.key == pygame.K_DOWN and self.direction != (0, -1):
-                self.direction = (0, 1)
-            elif event.key == pygame.K_LEFT and self.direction != (1, 0):
-                self.direction = (-1, 0)
-            elif event.key == pygame.K_RIGHT and self.direction != (-1, 0):
-                self.direction = (1, 0)
+            if event.key in ARROW_TURNS:
+                self.set_autopilot(False)  # An arrow press takes the controls back
+                self.turn(ARROW_TURNS[event.key])
+            elif event.key == pygame.K_a and not self.game_over:
+                self.set_autopilot(self.autopilot is None)
             elif event.key == pygame.K_r and self.game_over:
                 return "restart"
             elif event.key == pygame.K_t:
                 theme.toggle()
             elif event.key == pygame.K_ESCAPE:
+                self.telemetry.end("quit", self.score)
                 return "menu"
 
+    def snapshot(self):
+        body = array("H", [coord for cell in self.snake for coord in cell])
+        return save_state.dump(b"SNAK", "<HHbbHHi?", (
+            self.grid_width, self.grid_height, *self.direction, *self.food, self.score, self.game_over),
+            self.player_name.encode(), body.tobytes())
+
+    def restore(self, data):
+        fields, (name, body) = save_state.load(b"SNAK", "<HHbbHHi?", data)
+        self.grid_width, self.grid_height, dx, dy, fx, fy, self.score, self.game_over = fields
+        self.direction = (dx, dy)
+        self.turns.clear()
+        self.food = (fx, fy)
+        self.player_name = name.decode()
+        coords = array("H", body)
+        self.snake = list(zip(coords[::2], coords[1::2]))
+        self.occupied = set(self.snake)
+
 # Tic-Tac-Toe Game
 class TicTacToe:
+    board_layer = ui.StaticLayer()  # The 3x3 grid, baked once per theme
+
     def __init__(self, player_name):
         self.player_name = player_name
         self.board = [["" for _ in range(3)] for _ in range(3)]
@@ -180,6 +240,7 @@ class TicTacToe:
         self.score = 0
         self.game_over = False
         self.winner = None
+        self.telemetry = telemetry.Session("Tic-Tac-Toe", player_name, self.snapshot)
 
     def check_winner(self):
         for i in range(3):
@@ -215,20 +276,27 @@ class TicTacToe:
             else:
                 self.score += 10
                 self.winner = "Draw"
+            self.telemetry.end({"X": "won", "O": "lost"}.get(winner, "draw"), self.score)
             leaderboard["Tic-Tac-Toe"].append((self.player_name, self.score))
             leaderboard["Tic-Tac-Toe"].sort(key=lambda x: x[1], reverse=True)
             leaderboard["Tic-Tac-Toe"] = leaderboard["Tic-Tac-Toe"][:5]
 
-    def draw(self):
-        screen.fill(theme.background)
+    def bake_board(self, surface):
         cell_size = 150
         offset_x, offset_y = (WIDTH - 3 * cell_size) // 2, (HEIGHT - 3 * cell_size) // 2
         for i in range(3):
             for j in range(3):
-                pygame.draw.rect(screen, theme.border_color, (
+                pygame.draw.rect(surface, theme.border_color, (
                     offset_x + j * cell_size, offset_y + i * cell_size, cell_size, cell_size), 2)
+
+    def draw(self):
+        self.board_layer.draw(screen, self.bake_board)
+        cell_size = 150
+        offset_x, offset_y = (WIDTH - 3 * cell_size) // 2, (HEIGHT - 3 * cell_size) // 2
+        for i in range(3):
+            for j in range(3):
                 if self.board[i][j]:
-                    text = FONT.render(self.board[i][j], True, theme.text_color)
+                    text = ui.text(self.board[i][j], 30, theme.text_color)
                     screen.blit(text, (offset_x + j * cell_size + cell_size // 2 - text.get_width() // 2,
                                       offset_y + i * cell_size + cell_size // 2 - text.get_height() // 2))
         text = FONT.render(f"Score: {self.score}", True, theme.text_color)
@@ -237,7 +305,7 @@ class TicTacToe:
             text = FONT.render(f"Winner: {self.winner}! Press R to Restart or ESC to Menu", True, theme.text_color)
             screen.blit(text, (WIDTH // 2 - text.get_width() // 2, HEIGHT // 2))
         else:
-            text = FONT.render("Press ESC to return to Menu", True, theme.text_color)
+            text = ui.text("Press ESC to return to Menu", 30, theme.text_color)
             screen.blit(text, (WIDTH // 2 - text.get_width() // 2, HEIGHT - 80))
         pygame.display.flip()
 
@@ -249,6 +317,7 @@ class TicTacToe:
             i, j = (y - offset_y) // cell_size, (x - offset_x) // cell_size
             if 0 <= i < 3 and 0 <= j < 3 and self.board[i][j] == "":
                 self.board[i][j] = "X"
+                self.telemetry.move(cell=(i, j))
                 self.update()
                 if not self.game_over:
                     self.ai_move()
@@ -259,18 +328,33 @@ class TicTacToe:
             elif event.key == pygame.K_t:
                 theme.toggle()
             elif event.key == pygame.K_ESCAPE:
+                self.telemetry.end("quit", self.score)
                 return "menu"
 
+    def snapshot(self):
+        cells = bytes({"": 0, "X": 1, "O": 2}[cell] for row in self.board for cell in row)
+        return save_state.dump(b"TTT3", "<i?", (self.score, self.game_over),
+                               self.player_name.encode(), cells,
+                               self.current_player.encode(), (self.winner or "").encode())
+
+    def restore(self, data):
+        (self.score, self.game_over), (name, cells, current, winner) = save_state.load(b"TTT3", "<i?", data)
+        self.player_name = name.decode()
+        self.board = [[("", "X", "O")[code] for code in cells[i * 3:i * 3 + 3]] for i in range(3)]
+        self.current_player = current.decode()
+        self.winner = winner.decode() or None
+
 # Hangman Game
 class Hangman:
     def __init__(self, player_name):
         self.player_name = player_name
-        self.words = ["PYTHON", "PROGRAMMING", "COMPUTER", "ALGORITHM", "DATABASE"]
+        self.words = content.section("hangman")
         self.word = random.choice(self.words)
         self.guessed = set()
         self.lives = 6
         self.score = 0
         self.game_over = False
+        self.telemetry = telemetry.Session("Hangman", player_name, self.snapshot)
 
     def update(self):
         if self.game_over:
@@ -278,11 +362,13 @@ class Hangman:
         if all(letter in self.guessed for letter in self.word):
             self.score += self.lives * 10
             self.game_over = True
+            self.telemetry.end("won", self.score)
             leaderboard["Hangman"].append((self.player_name, self.score))
             leaderboard["Hangman"].sort(key=lambda x: x[1], reverse=True)
             leaderboard["Hangman"] = leaderboard["Hangman"][:5]
         elif self.lives <= 0:
             self.game_over = True
+            self.telemetry.end("lost", self.score)
             leaderboard["Hangman"].append((self.player_name, self.score))
             leaderboard["Hangman"].sort(key=lambda x: x[1], reverse=True)
             leaderboard["Hangman"] = leaderboard["Hangman"][:5]
@@ -310,6 +396,7 @@ class Hangman:
             elif event.key == pygame.K_t:
                 theme.toggle()
             elif event.key == pygame.K_ESCAPE:
+                self.telemetry.end("quit", self.score)
                 return "menu"
             elif event.unicode.isalpha() and len(event.unicode) == 1:
                 letter = event.unicode.upper()
@@ -318,10 +405,41 @@ class Hangman:
                     if letter not in self.word:
                         self.lives -= 1
                     self.score += 5
+                    self.telemetry.move(letter=letter, hit=letter in self.word, order=len(self.guessed))
                     self.update()
 
+    def snapshot(self):
+        return save_state.dump(b"HANG", "<hi?", (self.lives, self.score, self.game_over),
+                               self.player_name.encode(), self.word.encode(),
+                               "".join(sorted(self.guessed)).encode())
+
+    def restore(self, data):
+        (self.lives, self.score, self.game_over), (name, word, guessed) = save_state.load(b"HANG", "<hi?", data)
+        self.player_name = name.decode()
+        self.word = word.decode()
+        self.guessed = set(guessed.decode())
+
 # Minesweeper Game
+MINE_FACE, FLAG_FACE = 9, 10  # Atlas slots after the revealed faces 0-8
+
+@lru_cache(maxsize=4)
+def cell_faces(cell_size, dark):
+    # Every revealed or flagged cell face in one row: slot n is a revealed cell with n neighbouring mines,
+    # then a revealed mine and a flag
+    atlas = pygame.Surface((11 * cell_size, cell_size)).convert()
+    text_color = WHITE if dark else BLACK
+    for face in range(11):
+        rect = pygame.Rect(face * cell_size, 0, cell_size, cell_size)
+        atlas.fill(RED if face == MINE_FACE else BLUE if face == FLAG_FACE else GRAY, rect)
+        label = "F" if face == FLAG_FACE else str(face) if 0 < face < MINE_FACE else ""
+        if label:
+            text = FONT.render(label, True, text_color)
+            atlas.blit(text, (rect.centerx - text.get_width() // 2, rect.centery - text.get_height() // 2))
+    return atlas
+
 class Minesweeper:
+    board_layer = ui.StaticLayer()  # Outlines of the covered cells, baked once per theme and grid size
+
     def __init__(self, player_name):
         self.player_name = player_name
         self.grid_size = 10
@@ -335,6 +453,8 @@ class Minesweeper:
         self.won = False
         self.mines_placed = False
         self.first_click = True
+        self.flag_history = MoveHistory()  # flag toggles since the last reveal
+        self.telemetry = telemetry.Session("Minesweeper", player_name, self.snapshot)
 
     def place_mines(self, exclude_i, exclude_j):
         mines_placed = 0
@@ -368,6 +488,7 @@ class Minesweeper:
         self.score += 10
         if self.grid[i][j] == -1:
             self.game_over = True
+            self.telemetry.end("lost", self.score)
             leaderboard["Minesweeper"].append((self.player_name, self.score))
             leaderboard["Minesweeper"].sort(key=lambda x: x[1], reverse=True)
             leaderboard["Minesweeper"] = leaderboard["Minesweeper"][:5]
@@ -383,30 +504,44 @@ class Minesweeper:
             self.game_over = True
             self.won = True
             self.score += 100
+            self.telemetry.end("won", self.score)
             leaderboard["Minesweeper"].append((self.player_name, self.score))
             leaderboard["Minesweeper"].sort(key=lambda x: x[1], reverse=True)
             leaderboard["Minesweeper"] = leaderboard["Minesweeper"][:5]
 
-    def draw(self):
-        screen.fill(theme.background)
+    def toggle_flag(self, cell, forward):
+        # Flag toggles are their own inverse, so undo and redo both just toggle again
+        i, j = divmod(cell, self.grid_size)
+        self.flags[i][j] = not self.flags[i][j]
+        if self.flags[i][j]:
+            self.score += 5  # Bonus for flagging
+        else:
+            self.score -= 5  # Remove bonus if unflagged
+
+    def bake_board(self, surface):
         offset_x, offset_y = (WIDTH - self.grid_size * self.cell_size) // 2, (HEIGHT - self.grid_size * self.cell_size) // 2
         for i in range(self.grid_size):
             for j in range(self.grid_size):
                 rect = (offset_x + j * self.cell_size, offset_y + i * self.cell_size, self.cell_size, self.cell_size)
+                pygame.draw.rect(surface, theme.border_color, rect, 2)
+
+    def draw(self):
+        # Covered cells are the baked layer; revealed and flagged cells are blitted over it from the face atlas
+        self.board_layer.draw(screen, self.bake_board, self.grid_size, self.cell_size)
+        offset_x, offset_y = (WIDTH - self.grid_size * self.cell_size) // 2, (HEIGHT - self.grid_size * self.cell_size) // 2
+        size = self.cell_size
+        atlas = cell_faces(size, theme.is_dark)
+        blits = []
+        for i in range(self.grid_size):
+            for j in range(self.grid_size):
                 if self.revealed[i][j]:
-                    color = GRAY if self.grid[i][j] != -1 else RED
-                    pygame.draw.rect(screen, color, rect)
-                    if self.grid[i][j] > 0:
-                        text = FONT.render(str(self.grid[i][j]), True, theme.text_color)
-                        screen.blit(text, (rect[0] + self.cell_size // 2 - text.get_width() // 2,
-                                          rect[1] + self.cell_size // 2 - text.get_height() // 2))
+                    face = MINE_FACE if self.grid[i][j] == -1 else self.grid[i][j]
                 elif self.flags[i][j]:
-                    pygame.draw.rect(screen, BLUE, rect)
-                    text = FONT.render("F", True, theme.text_color)
-                    screen.blit(text, (rect[0] + self.cell_size // 2 - text.get_width() // 2,
-                                      rect[1] + self.cell_size // 2 - text.get_height() // 2))
+                    face = FLAG_FACE
                 else:
-                    pygame.draw.rect(screen, theme.border_color, rect, 2)
+                    continue
+                blits.append((atlas, (offset_x + j * size, offset_y + i * size), (face * size, 0, size, size)))
+        screen.blits(blits, doreturn=False)
         text = FONT.render(f"Score: {self.score}", True, theme.text_color)
         screen.blit(text, (10, HEIGHT - 40))
         if self.game_over:
@@ -414,7 +549,7 @@ class Minesweeper:
             text = FONT.render(f"{result} Press R to Restart or ESC to Menu", True, theme.text_color)
             screen.blit(text, (WIDTH // 2 - text.get_width() // 2, HEIGHT // 2))
         else:
-            text = FONT.render("Left-click to reveal, Right-click to flag, ESC to Menu", True, theme.text_color)
+            text = ui.text("Left-click to reveal, Right-click to flag, ESC to Menu", 30, theme.text_color)
             screen.blit(text, (WIDTH // 2 - text.get_width() // 2, HEIGHT - 80))
         pygame.display.flip()
 
@@ -425,14 +560,15 @@ class Minesweeper:
             i, j = (y - offset_y) // self.cell_size, (x - offset_x) // self.cell_size
             if 0 <= i < self.grid_size and 0 <= j < self.grid_size:
                 if event.button == 1:  # Left click
+                    if not self.revealed[i][j] and not self.flags[i][j]:
+                        self.flag_history.clear()  # Reveals can't be undone, so neither can earlier flags
+                        self.telemetry.move(action="reveal", cell=(i, j), first=self.first_click)
                     self.reveal_cell(i, j)
                 elif event.button == 3:  # Right click
                     if not self.revealed[i][j]:
-                        self.flags[i][j] = not self.flags[i][j]
-                        if self.flags[i][j]:
-                            self.score += 5  # Bonus for flagging
-                        else:
-                            self.score -= 5  # Remove bonus if unflagged
+                        self.toggle_flag(i * self.grid_size + j, True)
+                        self.telemetry.move(action="flag", cell=(i, j), on=self.flags[i][j])
+                        self.flag_history.record(i * self.grid_size + j)
         elif event.type == pygame.KEYDOWN:
             if event.key == pygame.K_r and self.game_over:
                 return "restart"
@@ -443,7 +579,28 @@ class Minesweeper:
                     leaderboard["Minesweeper"].append((self.player_name, self.score))
                     leaderboard["Minesweeper"].sort(key=lambda x: x[1], reverse=True)
                     leaderboard["Minesweeper"] = leaderboard["Minesweeper"][:5]
+                self.telemetry.end("quit", self.score)
                 return "menu"
+            elif not self.game_over:
+                handle_history_key(self.flag_history, event, self.toggle_flag)
+
+    def snapshot(self):
+        return save_state.dump(b"MINE", "<HHi4?", (
+            self.grid_size, self.mines, self.score, self.game_over, self.won, self.mines_placed, self.first_click),
+            self.player_name.encode(),
+            bytes(value + 1 for row in self.grid for value in row),  # -1 (mine) .. 8 -> 0 .. 9
+            save_state.pack_rows(self.revealed),
+            save_state.pack_rows(self.flags))
+
+    def restore(self, data):
+        fields, (name, grid, revealed, flags) = save_state.load(b"MINE", "<HHi4?", data)
+        self.grid_size, self.mines, self.score, self.game_over, self.won, self.mines_placed, self.first_click = fields
+        size = self.grid_size
+        self.player_name = name.decode()
+        self.grid = [[value - 1 for value in grid[i * size:(i + 1) * size]] for i in range(size)]
+        self.revealed = save_state.unpack_rows(revealed, size, size)
+        self.flags = save_state.unpack_rows(flags, size, size)
+        self.flag_history.clear()
 
 # Number Guessing Game
 class NumberGuessingGame:
@@ -457,12 +614,14 @@ class NumberGuessingGame:
         self.won = False
         self.current_guess = ""
         self.feedback = ""
+        self.telemetry = telemetry.Session("Number Guessing", player_name, self.snapshot)
 
     def update(self):
         if self.game_over:
             return
         if self.attempts >= self.max_attempts:
             self.game_over = True
+            self.telemetry.end("lost", self.score)
             leaderboard["Number Guessing"].append((self.player_name, self.score))
             leaderboard["Number Guessing"].sort(key=lambda x: x[1], reverse=True)
             leaderboard["Number Guessing"] = leaderboard["Number Guessing"][:5]
@@ -499,6 +658,7 @@ class NumberGuessingGame:
                     leaderboard["Number Guessing"].append((self.player_name, self.score))
                     leaderboard["Number Guessing"].sort(key=lambda x: x[1], reverse=True)
                     leaderboard["Number Guessing"] = leaderboard["Number Guessing"][:5]
+                self.telemetry.end("quit", self.score)
                 return "menu"
             elif event.key == pygame.K_BACKSPACE:
                 self.current_guess = self.current_guess[:-1]
@@ -507,10 +667,12 @@ class NumberGuessingGame:
                     guess = int(self.current_guess)
                     if 1 <= guess <= 100:
                         self.attempts += 1
+                        self.telemetry.move(guess=guess, attempt=self.attempts)
                         if guess == self.target:
                             self.score += (self.max_attempts - self.attempts + 1) * 10
                             self.game_over = True
                             self.won = True
+                            self.telemetry.end("won", self.score)
                             leaderboard["Number Guessing"].append((self.player_name, self.score))
                             leaderboard["Number Guessing"].sort(key=lambda x: x[1], reverse=True)
                             leaderboard["Number Guessing"] = leaderboard["Number Guessing"][:5]
@@ -529,17 +691,171 @@ class NumberGuessingGame:
             elif event.unicode.isdigit() and len(self.current_guess) < 3 and not self.game_over:
                 self.current_guess += event.unicode
 
+    def snapshot(self):
+        return save_state.dump(b"NUMG", "<HHHi??", (
+            self.target, self.attempts, self.max_attempts, self.score, self.game_over, self.won),
+            self.player_name.encode(), self.current_guess.encode(), self.feedback.encode())
+
+    def restore(self, data):
+        fields, (name, guess, feedback) = save_state.load(b"NUMG", "<HHHi??", data)
+        self.target, self.attempts, self.max_attempts, self.score, self.game_over, self.won = fields
+        self.player_name = name.decode()
+        self.current_guess = guess.decode()
+        self.feedback = feedback.decode()
+
+# Snake Arena Game
+class SnakeArena:
+    bots = 20  # Bot snakes, changed with +/- and kept across restarts
+    bot_counts = (0, 5, 10, 20, 50, 100, 200)
+    cell_size = 5
+    # Snapshots hold every snake as (bot, alive, direction, score, respawn tick or -1, length), then all the bodies
+    # head first in one array; restore rebuilds the occupancy grid and food buckets from them
+    snake_record = struct.Struct("<??bbiiI")
+
+    def __init__(self, player_name):
+        self.player_name = player_name
+        self.telemetry = telemetry.Session("Snake Arena", player_name, self.snapshot)
+        self.new_arena(SnakeArena.bots)
+
+    def new_arena(self, bots):
+        self.arena = arena.Arena(WIDTH // self.cell_size, (HEIGHT - 50) // self.cell_size)
+        self.player = self.arena.add_snake(bot=False)
+        self.second = None  # Player 2 joins with WASD
+        self.bot_count = bots
+        for _ in range(bots):
+            self.arena.add_snake()
+        self.paint()
+        self.score = 0
+        self.game_over = False
+
+    def paint(self):
+        self.colors = [GREEN] + [pygame.Color(0) for _ in range(self.bot_count)]
+        for k, color in enumerate(self.colors[1:]):
+            color.hsva = (k * 137 % 360, 60, 90, 100)  # Bots in muted, well spread hues
+        if self.second is not None:
+            self.colors.append(BLUE)
+
+    def join_second(self):
+        self.second = self.arena.add_snake(bot=False)
+        self.colors.append(BLUE)
+
+    def update(self):
+        if self.game_over:
+            return
+        self.arena.tick()
+        self.score = self.player.score
+        if not self.player.alive and (self.second is None or not self.second.alive):
+            self.game_over = True
+            self.telemetry.end("lost", self.score)
+            leaderboard["Snake Arena"].append((self.player_name, self.score))
+            leaderboard["Snake Arena"].sort(key=lambda x: x[1], reverse=True)
+            leaderboard["Snake Arena"] = leaderboard["Snake Arena"][:5]
+
+    def draw(self):
+        screen.fill(theme.background)
+        size, width = self.cell_size, self.arena.width
+        for cell in self.arena.food:
+            y, x = divmod(cell, width)
+            screen.fill(RED, (x * size, y * size, size, size))
+        for snake in self.arena.snakes:
+            color = self.colors[snake.id]
+            for cell in snake.body:
+                y, x = divmod(cell, width)
+                screen.fill(color, (x * size, y * size, size, size))
+        alive = sum(snake.alive for snake in self.arena.snakes if snake.bot)
+        hud = f"Score: {self.score}  Length: {len(self.player.body)}  Bots: {alive}/{self.bot_count}"
+        if self.second is not None:
+            hud += f"  P2: {self.second.score}"
+        text = FONT.render(hud, True, theme.text_color)
+        screen.blit(text, (10, HEIGHT - 40))
+        if self.game_over:
+            text = FONT.render("Game Over! Press R to Restart or ESC to Menu", True, theme.text_color)
+            screen.blit(text, (WIDTH // 2 - text.get_width() // 2, HEIGHT // 2))
+        elif self.arena.ticks < 30:
+            text = ui.text("Arrows to steer, WASD for player 2, +/- bots, ESC to Menu", 30, theme.text_color)
+            screen.blit(text, (WIDTH // 2 - text.get_width() // 2, HEIGHT - 80))
+        pygame.display.flip()
+
+    def handle_input(self, event):
+        if event.type == pygame.KEYDOWN:
+            if event.key in ARROW_TURNS:
+                self.player.turn(ARROW_TURNS[event.key])
+                self.telemetry.move(player=1, direction=ARROW_TURNS[event.key])
+            elif event.key in WASD_TURNS and not self.game_over:
+                if self.second is None:
+                    self.join_second()
+                self.second.turn(WASD_TURNS[event.key])
+            elif event.key == pygame.K_r and self.game_over:
+                return "restart"
+            elif event.key == pygame.K_t:
+                theme.toggle()
+            elif event.key == pygame.K_ESCAPE:
+                if not self.game_over:
+                    leaderboard["Snake Arena"].append((self.player_name, self.score))
+                    leaderboard["Snake Arena"].sort(key=lambda x: x[1], reverse=True)
+                    leaderboard["Snake Arena"] = leaderboard["Snake Arena"][:5]
+                self.telemetry.end("quit", self.score)
+                return "menu"
+            elif not self.game_over:
+                index = self.bot_counts.index(SnakeArena.bots) if SnakeArena.bots in self.bot_counts else 0
+                if event.key in (pygame.K_PLUS, pygame.K_EQUALS, pygame.K_KP_PLUS) and index < len(self.bot_counts) - 1:
+                    SnakeArena.bots = self.bot_counts[index + 1]
+                    self.new_arena(SnakeArena.bots)
+                elif event.key in (pygame.K_MINUS, pygame.K_KP_MINUS) and index > 0:
+                    SnakeArena.bots = self.bot_counts[index - 1]
+                    self.new_arena(SnakeArena.bots)
+
+    def snapshot(self):
+        arena = self.arena
+        snakes = b"".join(self.snake_record.pack(snake.bot, snake.alive, *snake.direction, snake.score,
+                                          -1 if snake.respawn is None else snake.respawn, len(snake.body))
+                          for snake in arena.snakes)
+        bodies = array("I", [cell for snake in arena.snakes for cell in snake.body])
+        return save_state.dump(b"ARNA", "<HHIi?B", (
+            arena.width, arena.height, arena.ticks, self.score, self.game_over, self.bot_count),
+            self.player_name.encode(), snakes, bodies.tobytes(), array("I", sorted(arena.food)).tobytes())
+
+    def restore(self, data):
+        fields, (name, snakes, bodies, food) = save_state.load(b"ARNA", "<HHIi?B", data)
+        width, height, ticks, self.score, self.game_over, self.bot_count = fields
+        self.player_name = name.decode()
+        self.arena = arena.Arena(width, height)
+        self.arena.ticks = ticks
+        cells = iter(array("I", bodies))
+        for bot, alive, dx, dy, score, respawn, length in self.snake_record.iter_unpack(snakes):
+            snake = arena.ArenaSnake(len(self.arena.snakes), bot)
+            snake.alive, snake.direction, snake.score = alive, (dx, dy), score
+            snake.respawn = None if respawn < 0 else respawn
+            snake.body.extend(next(cells) for _ in range(length))
+            for cell in snake.body:
+                self.arena.cells[cell] = snake.id + 1
+            self.arena.snakes.append(snake)
+        for cell in array("I", food):
+            self.arena.add_food(cell)
+        self.player = self.arena.snakes[0]
+        self.second = next((snake for snake in self.arena.snakes[1:] if not snake.bot), None)
+        self.paint()
+
 # Main game loop
-async def main():
+async def main(broadcast_port=None):
+    pygame.display.set_caption("Classic Game Suite")
     state = "menu"
     game = None
     menu = MainMenu()
-    clock = pygame.time.Clock()
-    
+    feed = None
+    if broadcast_port is not None:
+        # Spectators (python game_suit.py --watch) follow live Snake and Minesweeper games
+        feed = spectate.SpectatorFeed()
+        await feed.start(port=broadcast_port)
+
+    inputs = ui.InputStage()
+
     while True:
+        # Input first, then update and draw, so a key press is on screen at the end of the same frame
+        frame_end = pygame.time.get_ticks() + (100 if state in ["snake", "snake_arena"] else 1000 // 60)
+        events = inputs.poll()
         if state == "menu":
-            menu.draw()
-            for event in pygame.event.get():
+            for event in events:
                 result = menu.handle_input(event)
                 if result == "start_game":
                     game_name = menu.options[menu.selected]
@@ -558,17 +874,23 @@ async def main():
                     elif game_name == "Number Guessing":
                         game = NumberGuessingGame(menu.player_name)
                         state = "number_guessing"
+                    elif game_name == "Snake Arena":
+                        game = SnakeArena(menu.player_name)
+                        state = "snake_arena"
+                    break
                 elif result == "quit":
+                    if feed is not None:
+                        await feed.close()
+                    print(inputs.summary())
+                    print(timers.summary())
                     pygame.quit()
                     return
 
-        elif state in ["snake", "tictactoe", "hangman", "minesweeper", "number_guessing"]:
-            game.draw()
-            if state not in ["hangman", "number_guessing", "minesweeper"]:  # Exclude Minesweeper from update
-                game.update()
-            for event in pygame.event.get():
+        elif state in ["snake", "tictactoe", "hangman", "minesweeper", "number_guessing", "snake_arena"]:
+            for event in events:
                 result = game.handle_input(event)
                 if result == "restart":
+                    timers.clear()
                     if state == "snake":
                         game = SnakeGame(game.player_name)
                     elif state == "tictactoe":
@@ -579,16 +901,59 @@ async def main():
                         game = Minesweeper(game.player_name)
                     elif state == "number_guessing":
                         game = NumberGuessingGame(game.player_name)
+                    elif state == "snake_arena":
+                        game = SnakeArena(game.player_name)
                 elif result == "menu":
+                    timers.clear()
                     state = "menu"
                     game = None
+                    break
 
-        clock.tick(10 if state == "snake" else 60)
+        timers.run_due()
+        if state == "menu":
+            menu.draw()
+        else:
+            if state not in ["hangman", "number_guessing", "minesweeper"]:  # Exclude Minesweeper from update
+                game.update()
+            game.draw()
+            if feed is not None and state in ["snake", "minesweeper"]:
+                feed.publish(game)
+        inputs.flipped()
+        await asyncio.sleep(timers.idle(frame_end) / 1000)
+
+# Spectator window: draws the game broadcast by another window's --broadcast, without taking input
+async def watch(port):
+    pygame.display.set_caption("Classic Game Suite - spectating")
+    spectator = spectate.Spectator({b"SNAK": lambda: SnakeGame(""), b"MINE": lambda: Minesweeper("")})
+    frames = asyncio.ensure_future(spectator.watch(port=port))
+    clock = pygame.time.Clock()
+    while not frames.done():
+        for event in pygame.event.get():
+            if event.type == pygame.QUIT or event.type == pygame.KEYDOWN and event.key == pygame.K_ESCAPE:
+                frames.cancel()
+            elif event.type == pygame.KEYDOWN and event.key == pygame.K_t:
+                theme.toggle()
+        if spectator.game is not None:
+            spectator.game.draw()
+        else:
+            screen.fill(theme.background)
+            text = FONT.render("Waiting for a Snake or Minesweeper game...", True, theme.text_color)
+            screen.blit(text, (WIDTH // 2 - text.get_width() // 2, HEIGHT // 2))
+            pygame.display.flip()
+        clock.tick(60)
         await asyncio.sleep(1.0 / 60)
-
-# Pyodide compatibility
-if platform.system() == "Emscripten":
-    asyncio.ensure_future(main())
-else:
-    if __name__ == "__main__":
-        asyncio.run(main())
\ No newline at end of file
+    if not frames.cancelled() and frames.exception() is not None:
+        print(f"Could not watch port {port}: {frames.exception()}")
+    pygame.quit()
+
+# Pyodide compatibility; imported by the launcher (main.py), the suite does not start its own loop
+if __name__ == "__main__":
+    if platform.system() == "Emscripten":
+        asyncio.ensure_future(main())
+    else:
+        # python game_suit.py [--broadcast [PORT] | --watch [PORT]]
+        port = int(sys.argv[2]) if len(sys.argv) > 2 else spectate.PORT
+        if sys.argv[1:2] == ["--watch"]:
+            asyncio.run(watch(port))
+        else:
+            asyncio.run(main(port if sys.argv[1:2] == ["--broadcast"] else None))
\ No newline at end of file
@@ -0,0 +1,63 @@
+from array import array
+import pygame
+
+# Moves kept per game; each move is one packed 64-bit delta, so the ring costs 8 bytes per entry
+HISTORY_LIMIT = 1024
+
+
+# Undo/redo log: a preallocated ring of integer deltas (swapped tiles, moved cells, toggled flags).
+# Once full, the oldest move is dropped; recording a new move discards the redo tail.
+class MoveHistory:
+    def __init__(self, limit=HISTORY_LIMIT):
+        self.limit = limit
+        self.deltas = array("q", bytes(8 * limit))
+        self.start = 0  # ring slot of the oldest move kept
+        self.length = 0  # moves kept, including undone ones that can be redone
+        self.position = 0  # moves currently applied
+
+    def __len__(self):
+        return self.length
+
+    def record(self, delta):
+        if self.position == self.limit:
+            self.start = (self.start + 1) % self.limit
+            self.position -= 1
+        self.deltas[(self.start + self.position) % self.limit] = delta
+        self.position += 1
+        self.length = self.position
+
+    def undo(self):
+        if self.position == 0:
+            return None
+        self.position -= 1
+        return self.deltas[(self.start + self.position) % self.limit]
+
+    def redo(self):
+        if self.position == self.length:
+            return None
+        delta = self.deltas[(self.start + self.position) % self.limit]
+        self.position += 1
+        return delta
+
+    def seek(self, position, apply):
+        # Rewind or replay to any kept move; apply(delta, forward) is called once per step
+        position = max(0, min(position, self.length))
+        while self.position > position:
+            apply(self.undo(), False)
+        while self.position < position:
+            apply(self.redo(), True)
+
+    def clear(self):
+        self.start = self.length = self.position = 0
+
+
+# Shared key bindings: Ctrl+Z / Ctrl+Y step back and forward, Home / End jump to the first or latest move
+def handle_history_key(history, event, apply):
+    if event.key == pygame.K_z and event.mod & pygame.KMOD_CTRL:
+        history.seek(history.position - 1, apply)
+    elif event.key == pygame.K_y and event.mod & pygame.KMOD_CTRL:
+        history.seek(history.position + 1, apply)
+    elif event.key == pygame.K_HOME:
+        history.seek(0, apply)
+    elif event.key == pygame.K_END:
+        history.seek(len(history), apply)
@@ -0,0 +1,231 @@
+import asyncio
+import importlib
+import platform
+import sys
+import pygame
+import telemetry
+import ui
+
+# One window for both suites: every game is listed here, and its module is imported the first time it is picked
+from ui import WIDTH, HEIGHT, screen, theme, starfield, timers
+FONT = ui.font(24)
+
+TELEMETRY_DIR = "telemetry"
+
+# Colors
+GREEN = (0, 255, 0)
+CYAN = (0, 255, 255)
+
+
+# Game descriptor: where the game class lives and how the loop drives it
+class GameInfo:
+    def __init__(self, name, module, class_name, fps=60, updates=False, space=False):
+        self.name = name
+        self.module = module
+        self.class_name = class_name
+        self.fps = fps  # frame rate while playing; Snake moves one cell per frame
+        self.updates = updates  # update() is called every frame, not only from handle_input()
+        self.space = space  # a Cosmic Quest game: a space fact is shown before and after playing
+
+    def load(self):
+        return getattr(importlib.import_module(self.module), self.class_name)
+
+
+GAMES = [
+    GameInfo("Snake", "game_suit", "SnakeGame", fps=10, updates=True),
+    GameInfo("Tic-Tac-Toe", "game_suit", "TicTacToe", updates=True),
+    GameInfo("Hangman", "game_suit", "Hangman"),
+    GameInfo("Minesweeper", "game_suit", "Minesweeper"),
+    GameInfo("Number Guessing", "game_suit", "NumberGuessingGame"),
+    GameInfo("Snake Arena", "game_suit", "SnakeArena", fps=10, updates=True),
+    GameInfo("Alien Code Breaker", "space_exploration_game", "AlienCodeBreaker", space=True),
+    GameInfo("Meteorite Match-Up", "space_exploration_game", "MeteoriteMatchUp", space=True),
+    GameInfo("Quantum Circuit Puzzle", "space_exploration_game", "QuantumCircuitPuzzle", space=True),
+    GameInfo("Astro-Puzzle Navigator", "space_exploration_game", "AstroPuzzleNavigator", space=True),
+    GameInfo("Cosmic Jigsaw Explore", "space_exploration_game", "CosmicJigsawExplore", space=True),
+    GameInfo("Nebula Maze Runner", "space_exploration_game", "NebulaMazeRunner", updates=True, space=True),
+]
+
+
+# Classic games answer "restart" / "menu" / None and Cosmic Quest games (state, player name, next game);
+# both become "restart", "menu", "fact" or None
+def outcome(result):
+    if isinstance(result, tuple):
+        result = result[0]
+    return "fact" if result == "space_fact" else result
+
+
+# Launcher Menu
+class LauncherMenu:
+    def __init__(self):
+        self.options = [game.name for game in GAMES] + ["Quit"]
+        self.selected = 0
+        self.player_name = ""
+        self.name_input = False
+
+    def draw(self):
+        screen.fill(theme.background)
+        starfield.draw(screen, theme.background, theme.text_color)
+        if self.name_input:
+            text = FONT.render(f"Enter Name: {self.player_name}", True, theme.text_color)
+            screen.blit(text, (WIDTH // 2 - text.get_width() // 2, HEIGHT // 2))
+            text = ui.text("Press ENTER to confirm", 24, theme.text_color)
+            screen.blit(text, (WIDTH // 2 - text.get_width() // 2, HEIGHT // 2 + 50))
+        else:
+            for i, option in enumerate(self.options):
+                if i == self.selected:
+                    color = CYAN if i < len(GAMES) and GAMES[i].space else GREEN
+                else:
+                    color = theme.text_color
+                text = ui.text(option, 24, color)
+                screen.blit(text, (WIDTH // 2 - text.get_width() // 2, HEIGHT // 2 - 250 + i * 40))
+            text = ui.text("Press T to toggle theme", 24, theme.text_color)
+            screen.blit(text, (10, HEIGHT - 40))
+        pygame.display.flip()
+
+    def handle_input(self, event):
+        if self.name_input:
+            if event.type == pygame.KEYDOWN:
+                if event.key == pygame.K_RETURN and self.player_name:
+                    return "start_game"
+                elif event.key == pygame.K_BACKSPACE:
+                    self.player_name = self.player_name[:-1]
+                elif event.unicode.isalnum() and len(self.player_name) < 10:
+                    self.player_name += event.unicode
+                elif event.key == pygame.K_ESCAPE:
+                    self.name_input = False
+                    self.player_name = ""
+        else:
+            if event.type == pygame.KEYDOWN:
+                if event.key == pygame.K_UP:
+                    self.selected = (self.selected - 1) % len(self.options)
+                elif event.key == pygame.K_DOWN:
+                    self.selected = (self.selected + 1) % len(self.options)
+                elif event.key == pygame.K_RETURN:
+                    if self.options[self.selected] == "Quit":
+                        return "quit"
+                    else:
+                        self.name_input = True
+                        return None
+                elif event.key == pygame.K_t:
+                    theme.toggle()
+        return None
+
+
+# Launcher state machine: one handler per state ("menu", "fact", "game") consumes the frame's events and
+# returns False to quit; the state it leaves behind is then updated and drawn
+class Launcher:
+    def __init__(self):
+        self.menu = LauncherMenu()
+        self.state = "menu"
+        self.info = None  # GameInfo of the game picked last
+        self.game = None  # the game or space fact screen being shown
+        self.handlers = {"menu": self.menu_input, "fact": self.fact_input, "game": self.game_input}
+
+    def frame(self, events):
+        if not self.handlers[self.state](events):
+            return False
+        timers.run_due()
+        if self.state == "menu":
+            self.menu.draw()
+        else:
+            if self.state == "game" and self.info.updates:
+                self.game.update()
+            self.game.draw()
+        return True
+
+    def frame_ms(self):
+        return 1000 // (self.info.fps if self.state == "game" else 60)
+
+    def start(self, player_name):
+        timers.clear()
+        if self.info.module not in sys.modules:
+            screen.fill(theme.background)
+            text = FONT.render("Loading...", True, theme.text_color)
+            screen.blit(text, (WIDTH // 2 - text.get_width() // 2, HEIGHT // 2))
+            pygame.display.flip()
+        self.game = self.info.load()(player_name)
+        self.state = "game"
+
+    def show_fact(self, next_state, player_name):
+        timers.clear()
+        fact_screen = importlib.import_module("space_exploration_game").SpaceFactScreen
+        self.game = fact_screen(next_state, player_name, self.info.name)
+        self.state = "fact"
+
+    def to_menu(self):
+        timers.clear()
+        self.game = None
+        self.state = "menu"
+
+    def menu_input(self, events):
+        for event in events:
+            result = self.menu.handle_input(event)
+            if result == "start_game":
+                self.info = GAMES[self.menu.selected]
+                if self.info.space:
+                    self.show_fact("game", self.menu.player_name)
+                else:
+                    self.start(self.menu.player_name)
+                return True
+            elif result == "quit":
+                return False
+        return True
+
+    def fact_input(self, events):
+        for event in events:
+            next_state = self.game.handle_input(event)[0]
+            if next_state == "game":
+                self.start(self.game.player_name)
+                return True
+            elif next_state == "menu":
+                self.to_menu()
+                return True
+        return True
+
+    def game_input(self, events):
+        for event in events:
+            result = outcome(self.game.handle_input(event))
+            if result == "restart":
+                timers.clear()
+                self.game = self.info.load()(self.game.player_name)
+            elif result == "fact":
+                self.show_fact("menu", self.game.player_name)
+                return True
+            elif result == "menu":
+                self.to_menu()
+                return True
+        return True
+
+
+# Main game loop
+async def main(telemetry_dir=None):
+    pygame.display.set_caption("Game Suite")
+    if telemetry_dir is not None:
+        telemetry.start(telemetry_dir)
+    launcher = Launcher()
+    inputs = ui.InputStage()
+
+    while True:
+        # Input first, then update and draw, so a key press is on screen at the end of the same frame
+        frame_end = pygame.time.get_ticks() + launcher.frame_ms()
+        events = inputs.poll()
+        if any(event.type == pygame.QUIT for event in events) or not launcher.frame(events):
+            print(inputs.summary())
+            print(timers.summary())
+            print(telemetry.stop())
+            pygame.quit()
+            return
+        inputs.flipped()
+        await asyncio.sleep(timers.idle(frame_end) / 1000)
+
+# Pyodide compatibility
+if platform.system() == "Emscripten":
+    asyncio.ensure_future(main())
+else:
+    if __name__ == "__main__":
+        # python main.py [--telemetry [DIR]]: record every session to DIR (default telemetry/) as gzipped NDJSON
+        if sys.argv[1:2] == ["--telemetry"]:
+            asyncio.run(main(sys.argv[2] if len(sys.argv) > 2 else TELEMETRY_DIR))
+        else:
+            asyncio.run(main())
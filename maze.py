@@ -0,0 +1,294 @@
+from array import array
+from collections import OrderedDict, deque
+from itertools import islice
+import numpy as np
+import pygame
+
+# Eller's algorithm: chance that two neighbouring cells in different sets are joined, and that a cell opens downward
+JOIN_CHANCE = 0.5
+DROP_CHANCE = 0.35
+UP, DOWN, LEFT, RIGHT = 1, 2, 4, 8  # bits of Maze.exits()
+CHUNK_CELLS = 32  # cells per side of a pre-rendered chunk surface
+CHUNK_CACHE = 24  # chunk surfaces kept; a full-screen view needs at most 9 at the smallest cell size
+
+
+def eller_rows(width, height, seed=None):
+    # Streams a perfect maze one row at a time as (east walls, south walls) boolean arrays.
+    # Only the current row's set labels are kept, so memory does not grow with the height.
+    rng = np.random.default_rng(seed)
+    labels = np.arange(width, dtype=np.int64)  # every cell of the first row starts in its own set
+    for row in range(height):
+        last = row == height - 1
+        joins = [True] * (width - 1) if last else (rng.random(width - 1) < JOIN_CHANCE).tolist()
+        east = np.ones(width, dtype=bool)
+        parent = list(range(2 * width))  # union-find over this row's labels
+        ids = labels.tolist()
+        # Join left to right, refusing any join between cells already connected (that would make a loop)
+        for col in range(width - 1):
+            if joins[col]:
+                a, b = ids[col], ids[col + 1]
+                while parent[a] != a:
+                    a = parent[a]
+                while parent[b] != b:
+                    b = parent[b]
+                if a != b:
+                    parent[b] = a
+                    east[col] = False
+        roots = []
+        for a in ids:
+            while parent[a] != a:
+                a = parent[a]
+            roots.append(a)
+        roots = np.array(roots, dtype=np.int64)
+        south = np.ones(width, dtype=bool)
+        if not last:
+            # Every set needs at least one way down, or it would be cut off from the rest of the maze
+            drops = rng.random(width) < DROP_CHANCE
+            order = np.lexsort((rng.random(width), roots))
+            first = np.ones(width, dtype=bool)
+            first[1:] = roots[order[1:]] != roots[order[:-1]]
+            drops[order[first]] = True
+            south[drops] = False
+            # Carried cells keep their (renumbered) set; the others start fresh sets in the next row
+            _, carried = np.unique(roots, return_inverse=True)
+            labels = np.where(drops, carried, width + np.arange(width))
+        east[-1] = True
+        yield east, south
+
+
+# A perfect maze stored one bit per wall: east[row] and south[row] are packed little-endian bit rows,
+# so a cell costs two bits whatever the size (a 4000x4000 maze is 4 MB)
+class Maze:
+    def __init__(self, width, height, east=None, south=None):
+        self.width = width
+        self.height = height
+        self.row_bytes = (width + 7) // 8
+        shape = (height, self.row_bytes)
+        self.east = np.full(shape, 0xFF, dtype=np.uint8) if east is None else east
+        self.south = np.full(shape, 0xFF, dtype=np.uint8) if south is None else south
+        self.exit_bits = None
+        self.rows = None  # Eller rows still to come while a maze is generated a slice at a time
+        self.rows_done = height
+
+    @classmethod
+    def generate(cls, width, height, seed=None):
+        maze = cls.start(width, height, seed)
+        maze.extend()
+        return maze
+
+    @classmethod
+    def start(cls, width, height, seed=None):
+        # A maze whose passages are carved later, top row first, by extend(); rows not reached yet are solid wall
+        maze = cls(width, height)
+        maze.rows = enumerate(eller_rows(width, height, seed))
+        maze.rows_done = 0
+        return maze
+
+    @property
+    def done(self):
+        return self.rows_done == self.height
+
+    def extend(self, rows=None):
+        # Carves the next rows (all that are left by default); returns whether the maze is finished
+        for row, (east, south) in islice(self.rows, rows) if self.rows is not None else ():
+            self.east[row] = np.packbits(east, bitorder="little")
+            self.south[row] = np.packbits(south, bitorder="little")
+            self.rows_done = row + 1
+        if self.done:
+            self.rows = None
+        return self.done
+
+    @property
+    def nbytes(self):
+        return self.east.nbytes + self.south.nbytes
+
+    def east_wall(self, row, col):
+        return self.east[row, col >> 3] >> (col & 7) & 1
+
+    def south_wall(self, row, col):
+        return self.south[row, col >> 3] >> (col & 7) & 1
+
+    def can_move(self, row, col, dr, dc):
+        new_row, new_col = row + dr, col + dc
+        if not (0 <= new_row < self.height and 0 <= new_col < self.width):
+            return False
+        if dr:
+            return not self.south_wall(min(row, new_row), col)
+        return not self.east_wall(row, min(col, new_col))
+
+    def walls(self, top, bottom, left=0, right=None):
+        # Unpacked (east, south) boolean walls for rows top..bottom - 1 and columns left..right - 1, for drawing
+        right = self.width if right is None else right
+        skip = left & 7
+        columns = slice(left >> 3, (right + 7) >> 3)
+        east = np.unpackbits(self.east[top:bottom, columns], axis=1, bitorder="little")[:, skip:skip + right - left]
+        south = np.unpackbits(self.south[top:bottom, columns], axis=1, bitorder="little")[:, skip:skip + right - left]
+        return east.astype(bool), south.astype(bool)
+
+    def exits(self):
+        # Open directions of every cell as UP | DOWN | LEFT | RIGHT bits, one byte per cell in row-major order;
+        # built once, for path finding
+        self.map_exits()
+        return self.exit_bits
+
+    def map_exits(self, rows=None):
+        # Builds exits() for the next rows (all that are left by default), so a large maze can be mapped a band
+        # per frame; returns whether every row is mapped
+        if self.exit_bits is None:
+            self.exit_bits = bytearray(self.width * self.height)
+            self.exits_done = 0
+        top = self.exits_done
+        bottom = self.height if rows is None else min(self.height, top + rows)
+        if top < bottom:
+            first = max(0, top - 1)  # the row above the band, for the UP bits of its first row
+            east, south = self.walls(first, bottom)
+            right, down = ~east, ~south
+            left = np.zeros_like(right)
+            left[:, 1:] = right[:, :-1]
+            up = np.zeros_like(down)
+            up[1:] = down[:-1]
+            bits = (up * UP | down * DOWN | left * LEFT | right * RIGHT).astype(np.uint8)[top - first:]
+            self.exit_bits[top * self.width:bottom * self.width] = bits.tobytes()
+            self.exits_done = bottom
+        return self.exits_done == self.height
+
+    def tobytes(self):
+        return self.east.tobytes() + self.south.tobytes()
+
+    @classmethod
+    def frombytes(cls, width, height, data):
+        packed = np.frombuffer(data, dtype=np.uint8).reshape(2, height, (width + 7) // 8).copy()
+        return cls(width, height, packed[0], packed[1])
+
+
+# Breadth-first distances from one cell through a perfect maze's passages. Cells are row-major indices.
+# A whole-maze field lives in a flat array and can be grown a slice at a time with expand(budget);
+# a radius-limited field only reaches a few cells, so it keeps dicts and is rebuilt whenever its source moves.
+class DistanceField:
+    def __init__(self, maze, source, radius=None):
+        self.exits = maze.exits()
+        self.width = maze.width
+        self.source = source
+        self.radius = radius
+        if radius is None:
+            self.distance = array("i", [-1]) * (maze.width * maze.height)
+        else:
+            self.distance = {}
+        self.toward = {source: source}  # radius-limited fields only: the neighbour one step closer to the source
+        self.distance[source] = 0
+        self.frontier = deque([(source, source)])  # (cell, the cell it was reached from)
+
+    @property
+    def done(self):
+        return not self.frontier
+
+    def get(self, cell):
+        # Steps from the source, or None if the cell is out of range or not reached yet
+        if self.radius is None:
+            return self.distance[cell] if self.distance[cell] >= 0 else None
+        return self.distance.get(cell)
+
+    def expand(self, budget=None):
+        distance, frontier, exits, width = self.distance, self.frontier, self.exits, self.width
+        toward = self.toward if self.radius is not None else None
+        limit = self.radius if self.radius is not None else len(exits)
+        steps = ((UP, -width), (DOWN, width), (LEFT, -1), (RIGHT, 1))
+        while frontier and budget != 0:
+            if budget is not None:
+                budget -= 1
+            cell, parent = frontier.popleft()
+            reached = distance[cell] + 1
+            if reached > limit:
+                continue
+            bits = exits[cell]
+            for bit, step in steps:
+                # A perfect maze is a tree, so the only neighbour already reached is the one we came from
+                if bits & bit and cell + step != parent:
+                    distance[cell + step] = reached
+                    if toward is not None:
+                        toward[cell + step] = cell
+                    frontier.append((cell + step, cell))
+        return self.done
+
+    def downhill(self, cell):
+        # The open neighbour closest to the source (whole-maze fields)
+        best, best_distance = None, self.get(cell)
+        bits = self.exits[cell]
+        for bit, step in ((UP, -self.width), (DOWN, self.width), (LEFT, -1), (RIGHT, 1)):
+            if bits & bit:
+                near = self.get(cell + step)
+                if near is not None and (best_distance is None or near < best_distance):
+                    best, best_distance = cell + step, near
+        return best
+
+
+# Draws a maze of any size at a constant cost per frame: walls are pre-rendered into chunk surfaces of
+# CHUNK_CELLS x CHUNK_CELLS cells on first sight, and only the chunks overlapping the viewport are blitted
+class MazeView:
+    def __init__(self, maze, cell_size, wall_color):
+        self.maze = maze
+        self.cell_size = cell_size
+        self.wall_color = wall_color
+        self.line = max(1, cell_size // 16)
+        self.chunks = OrderedDict()  # (chunk row, chunk col) -> surface, least recently drawn first
+        self.background = None
+
+    def invalidate(self, row=None, col=None):
+        # Drop the chunk holding a changed cell, or every chunk
+        if row is None:
+            self.chunks.clear()
+        else:
+            self.chunks.pop((row // CHUNK_CELLS, col // CHUNK_CELLS), None)
+
+    def render_chunk(self, chunk_row, chunk_col):
+        maze, size, line = self.maze, self.cell_size, self.line
+        top, left = chunk_row * CHUNK_CELLS, chunk_col * CHUNK_CELLS
+        bottom, right = min(top + CHUNK_CELLS, maze.height), min(left + CHUNK_CELLS, maze.width)
+        surface = pygame.Surface(((right - left) * size, (bottom - top) * size)).convert()
+        surface.fill(self.background)
+        east, south = maze.walls(top, bottom, left, right)
+        for i, j in zip(*np.nonzero(east)):
+            surface.fill(self.wall_color, ((j + 1) * size - line, i * size, line, size))
+        for i, j in zip(*np.nonzero(south)):
+            surface.fill(self.wall_color, (j * size, (i + 1) * size - line, size, line))
+        # The outer walls of the top row and left column
+        if top == 0:
+            surface.fill(self.wall_color, (0, 0, surface.get_width(), line))
+        if left == 0:
+            surface.fill(self.wall_color, (0, 0, line, surface.get_height()))
+        return surface
+
+    def origin(self, focus, viewport):
+        # Screen position of cell (0, 0): the camera centres on the focus cell, clamped to the maze edges;
+        # a maze smaller than the viewport is centred in it
+        origin = []
+        for cells, cell, start, span in ((self.maze.width, focus[1], viewport.x, viewport.width),
+                                         (self.maze.height, focus[0], viewport.y, viewport.height)):
+            extent = cells * self.cell_size
+            if extent <= span:
+                origin.append(start + (span - extent) // 2)
+            else:
+                camera = cell * self.cell_size + self.cell_size // 2 - span // 2
+                origin.append(start - max(0, min(camera, extent - span)))
+        return origin
+
+    def cell_rect(self, origin, row, col):
+        return pygame.Rect(origin[0] + col * self.cell_size, origin[1] + row * self.cell_size, self.cell_size, self.cell_size)
+
+    def draw(self, surface, viewport, origin, background):
+        if background != self.background:
+            self.background = background
+            self.chunks.clear()
+        span = CHUNK_CELLS * self.cell_size
+        first_col, first_row = (viewport.x - origin[0]) // span, (viewport.y - origin[1]) // span
+        last_col, last_row = (viewport.right - 1 - origin[0]) // span, (viewport.bottom - 1 - origin[1]) // span
+        chunk_cols = (self.maze.width + CHUNK_CELLS - 1) // CHUNK_CELLS
+        chunk_rows = (self.maze.height + CHUNK_CELLS - 1) // CHUNK_CELLS
+        for chunk_row in range(max(0, first_row), min(chunk_rows - 1, last_row) + 1):
+            for chunk_col in range(max(0, first_col), min(chunk_cols - 1, last_col) + 1):
+                key = chunk_row, chunk_col
+                chunk = self.chunks.pop(key, None) or self.render_chunk(chunk_row, chunk_col)
+                self.chunks[key] = chunk
+                surface.blit(chunk, (origin[0] + chunk_col * span, origin[1] + chunk_row * span))
+        while len(self.chunks) > CHUNK_CACHE:
+            self.chunks.popitem(last=False)
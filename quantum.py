@@ -0,0 +1,177 @@
+import random
+import numpy as np
+
+# Single-qubit gates as 2x2 matrices; CNOT is applied directly as an index swap
+GATES = {
+    "H": np.array([[1, 1], [1, -1]], dtype=np.complex64) / np.float32(np.sqrt(2)),
+    "X": np.array([[0, 1], [1, 0]], dtype=np.complex64),
+    "Z": np.array([[1, 0], [0, -1]], dtype=np.complex64),
+    "S": np.array([[1, 0], [0, 1j]], dtype=np.complex64),  # quarter-turn phase
+}
+GATE_NAMES = ["H", "X", "Z", "S", "CNOT"]  # gate codes in snapshots and history deltas
+CACHE_BYTES = 64 << 20  # prefix states kept per circuit; a 20-qubit state is 8 MB
+MATCH_TOLERANCE = 1e-3  # total variation distance under which two distributions count as equal
+
+
+def zero_state(qubits):
+    state = np.zeros(1 << qubits, dtype=np.complex64)
+    state[0] = 1
+    return state
+
+
+def apply_matrix(state, matrix, qubit):
+    # Qubit q is bit q of the basis index, so the state reshapes to (high bits, q, low bits) without copying
+    # and the gate mixes the two halves along the middle axis. Diagonal and flip gates skip the general case.
+    view = state.reshape(-1, 2, 1 << qubit)
+    zero, one = view[:, 0, :], view[:, 1, :]
+    (m00, m01), (m10, m11) = matrix
+    if m01 == 0 and m10 == 0:
+        if m00 != 1:
+            zero *= m00
+        if m11 != 1:
+            one *= m11
+    elif m00 == 0 and m11 == 0:
+        old = zero.copy()
+        zero[...] = one
+        if m01 != 1:
+            zero *= m01
+        one[...] = old
+        if m10 != 1:
+            one *= m10
+    else:
+        old = zero.copy()
+        zero *= m00
+        zero += m01 * one
+        one *= m11
+        one += m10 * old
+
+
+def apply_cnot(state, control, target):
+    # Flip the target bit of every basis state whose control bit is set: swap two strided slices
+    high, low = max(control, target), min(control, target)
+    view = state.reshape(-1, 2, 1 << (high - low - 1), 2, 1 << low)
+    if control == high:
+        zero, one = view[:, 1, :, 0, :], view[:, 1, :, 1, :]
+    else:
+        zero, one = view[:, 0, :, 1, :], view[:, 1, :, 1, :]
+    old = zero.copy()
+    zero[...] = one
+    one[...] = old
+
+
+def fuse(gates):
+    # Compile gates (name, qubits) into operations, multiplying runs of single-qubit gates on the same
+    # qubit into one 2x2 matrix. Gates on different qubits commute, so a run only ends at a CNOT on that qubit.
+    pending = {}
+    ops = []
+    for name, qubits in gates:
+        if name == "CNOT":
+            for qubit in qubits:
+                if qubit in pending:
+                    ops.append(("U", (qubit,), pending.pop(qubit)))
+            ops.append((name, qubits, None))
+        else:
+            qubit = qubits[0]
+            pending[qubit] = GATES[name] @ pending[qubit] if qubit in pending else GATES[name]
+    ops.extend(("U", (qubit,), matrix) for qubit, matrix in pending.items())
+    return ops
+
+
+def run(state, gates):
+    for name, qubits, matrix in fuse(gates):
+        if name == "CNOT":
+            apply_cnot(state, *qubits)
+        else:
+            apply_matrix(state, matrix, qubits[0])
+    return state
+
+
+def probabilities(state):
+    return state.real ** 2 + state.imag ** 2
+
+
+def distance(p, q):
+    # Total variation distance between two measurement distributions
+    return 0.5 * float(np.abs(p - q).sum())
+
+
+def fidelity(a, b):
+    # Overlap of two states, blind to a global phase
+    return abs(complex(np.vdot(a, b))) ** 2
+
+
+def random_circuit(qubits, length, rng=random):
+    gates = []
+    for _ in range(length):
+        name = rng.choice(GATE_NAMES if qubits > 1 else GATE_NAMES[:-1])
+        if name == "CNOT":
+            gates.append((name, tuple(rng.sample(range(qubits), 2))))
+        else:
+            gates.append((name, (rng.randrange(qubits),)))
+    return gates
+
+
+def encode_gates(gates):
+    # Three bytes per gate: code, first qubit, second qubit (CNOT target)
+    return bytes(b for name, qubits in gates for b in (GATE_NAMES.index(name), qubits[0], qubits[-1]))
+
+
+def decode_gates(data):
+    gates = []
+    for k in range(0, len(data), 3):
+        name = GATE_NAMES[data[k]]
+        gates.append((name, (data[k + 1], data[k + 2]) if name == "CNOT" else (data[k + 1],)))
+    return gates
+
+
+# An editable circuit that remembers the state after some of its prefixes, so an edit at position k
+# re-simulates only from the nearest remembered prefix at or before k. Checkpoints are spaced so that they
+# fit in CACHE_BYTES; when they do not, the one closest to its predecessor is dropped first.
+class Circuit:
+    def __init__(self, qubits, gates=()):
+        self.qubits = qubits
+        self.gates = list(gates)
+        self.cache = {}  # prefix length -> state after gates[:length], never written to
+        self.state_bytes = (1 << qubits) * np.dtype(np.complex64).itemsize
+
+    def __len__(self):
+        return len(self.gates)
+
+    def invalidate(self, position):
+        for length in [length for length in self.cache if length > position]:
+            del self.cache[length]
+
+    def insert(self, position, gate):
+        self.gates.insert(position, gate)
+        self.invalidate(position)
+
+    def append(self, gate):
+        self.insert(len(self.gates), gate)
+
+    def remove(self, position):
+        self.invalidate(position)
+        return self.gates.pop(position)
+
+    def state(self):
+        end = len(self.gates)
+        if end in self.cache:
+            return self.cache[end]
+        start = max((length for length in self.cache if length < end), default=0)
+        state = self.cache[start].copy() if start else zero_state(self.qubits)
+        stride = max(1, -(-end * self.state_bytes // CACHE_BYTES))
+        while start < end:
+            stop = min(end, (start // stride + 1) * stride)
+            run(state, self.gates[start:stop])
+            start = stop
+            self.remember(start, state.copy() if start < end else state)
+        return state
+
+    def remember(self, length, state):
+        self.cache[length] = state
+        while len(self.cache) * self.state_bytes > CACHE_BYTES and len(self.cache) > 1:
+            lengths = sorted(self.cache)
+            gaps = [(kept - previous, kept) for previous, kept in zip([0] + lengths, lengths[:-1])]
+            del self.cache[min(gaps)[1]]
+
+    def probabilities(self):
+        return probabilities(self.state())
@@ -0,0 +1,64 @@
+import struct
+
+# Compact save-state format shared by both suites:
+# header (magic, format version, 4-byte game tag), fixed-size fields, then length-prefixed blobs.
+MAGIC = b"GS"
+VERSION = 1
+HEADER = struct.Struct("<2sB4s")
+BLOB_SIZE = struct.Struct("<I")
+
+_BIT_CHARS = bytes.maketrans(b"\x00\x01", b"01")
+
+
+def dump(tag, layout, fields, *blobs):
+    parts = [HEADER.pack(MAGIC, VERSION, tag), struct.pack(layout, *fields)]
+    for blob in blobs:
+        parts.append(BLOB_SIZE.pack(len(blob)))
+        parts.append(blob)
+    return b"".join(parts)
+
+
+def load(tag, layout, data):
+    magic, version, found = HEADER.unpack_from(data)
+    if magic != MAGIC or version != VERSION:
+        raise ValueError("Not a save state (or an unsupported version)")
+    if found != tag:
+        raise ValueError(f"Save state is for {found.decode()!r}, not {tag.decode()!r}")
+    offset = HEADER.size
+    fields = struct.unpack_from(layout, data, offset)
+    offset += struct.calcsize(layout)
+    blobs = []
+    while offset < len(data):
+        (size,) = BLOB_SIZE.unpack_from(data, offset)
+        offset += BLOB_SIZE.size
+        blobs.append(data[offset:offset + size])
+        offset += size
+    return fields, blobs
+
+
+def peek_tag(data):
+    return HEADER.unpack_from(data)[2]
+
+
+def pack_bits(flags):
+    # Any sequence of bools (or a bytes object of 0/1) -> little-endian bitset, one bit per flag
+    if not flags:
+        return b""
+    bits = bytes(flags).translate(_BIT_CHARS)[::-1]
+    return int(bits, 2).to_bytes((len(flags) + 7) // 8, "little")
+
+
+def unpack_bits(data, count):
+    if not count:
+        return []
+    bits = format(int.from_bytes(data, "little"), f"0{count}b")[::-1]
+    return [bit == "1" for bit in bits]
+
+
+def pack_rows(rows):
+    return pack_bits(b"".join(map(bytes, rows)))
+
+
+def unpack_rows(data, width, height):
+    flags = unpack_bits(data, width * height)
+    return [flags[i * width:(i + 1) * width] for i in range(height)]
@@ -0,0 +1,128 @@
+import heapq
+import itertools
+import pygame
+
+
+# Easing: slow at both ends
+def smoothstep(t):
+    return t * t * (3 - 2 * t)
+
+
+# One entry on the timer heap, ordered by due time (milliseconds on the scheduler's clock), then by scheduling order.
+# Cancelling only clears the callback: the entry is dropped when it reaches the top of the heap.
+class Timer:
+    __slots__ = ("due", "order", "callback", "period")
+
+    def __init__(self, due, order, callback, period):
+        self.due = due
+        self.order = order
+        self.callback = callback
+        self.period = period  # None for a one-shot timer
+
+    def __lt__(self, other):
+        return (self.due, self.order) < (other.due, other.order)
+
+    @property
+    def active(self):
+        return self.callback is not None
+
+    def cancel(self):
+        self.callback = None
+
+
+# Eased progress from 0 to 1 over a duration, read by draw() each frame; an optional done callback
+# is an ordinary timer on the scheduler, so a running tween costs nothing until it is read or finishes
+class Tween:
+    def __init__(self, clock, duration, ease=smoothstep):
+        self.clock = clock
+        self.start = clock()
+        self.duration = duration
+        self.ease = ease
+        self.timer = None
+
+    @property
+    def done(self):
+        return self.clock() - self.start >= self.duration
+
+    def value(self):
+        return self.ease(min(1.0, (self.clock() - self.start) / self.duration))
+
+    def cancel(self):
+        if self.timer is not None:
+            self.timer.cancel()
+
+
+# Timers, intervals and tweens for every game on one priority queue. Each frame the loop fires what is due
+# (O(log n) per timer, one comparison when nothing is) and asks idle() how long it may sleep before the next
+# frame or the next timer, whichever comes first.
+class Scheduler:
+    def __init__(self, clock=pygame.time.get_ticks):
+        self.clock = clock
+        self.heap = []
+        self.order = itertools.count()
+        self.fired = 0
+        self.slept = 0  # milliseconds handed to idle sleeps
+        self.started = None
+
+    def push(self, timer):
+        heapq.heappush(self.heap, timer)
+        return timer
+
+    def after(self, delay, callback):
+        return self.push(Timer(self.clock() + delay, next(self.order), callback, None))
+
+    def every(self, period, callback):
+        return self.push(Timer(self.clock() + period, next(self.order), callback, period))
+
+    def tween(self, duration, done=None, ease=smoothstep):
+        tween = Tween(self.clock, duration, ease)
+        if done is not None:
+            tween.timer = self.after(duration, done)
+        return tween
+
+    def run_due(self):
+        now = self.clock()
+        heap = self.heap
+        while heap and heap[0].due <= now:
+            timer = heap[0]
+            callback = timer.callback
+            if callback is not None and timer.period is not None:
+                # Intervals keep their phase; beats missed while the loop stalled are skipped, not replayed
+                timer.due += timer.period
+                if timer.due <= now:
+                    timer.due = now + timer.period
+                heapq.heapreplace(heap, timer)
+            else:
+                heapq.heappop(heap)
+                timer.callback = None
+            if callback is not None:
+                callback()
+                self.fired += 1
+
+    def next_due(self):
+        heap = self.heap
+        while heap and heap[0].callback is None:
+            heapq.heappop(heap)
+        return heap[0].due if heap else None
+
+    def idle(self, frame_end):
+        # Milliseconds the loop may sleep: until frame_end, or until the next timer falls due if that is sooner
+        now = self.clock()
+        if self.started is None:
+            self.started = now
+        due = self.next_due()
+        wait = max(0, (frame_end if due is None else min(frame_end, due)) - now)
+        self.slept += wait
+        return wait
+
+    def clear(self):
+        # Drops every timer, when the loop leaves a game
+        for timer in self.heap:
+            timer.callback = None
+        self.heap.clear()
+
+    def summary(self):
+        elapsed = self.clock() - self.started if self.started is not None else 0
+        if not elapsed:
+            return "Idle: no frames"
+        return f"Idle: slept {self.slept / elapsed:.0%} of {elapsed / 1000:.1f} s, {self.fired} timers fired"
@@ -0,0 +1,258 @@
+import asyncio
+import json
+import random
+import string
+import sys
+import time
+import content
+from code_breaker import score_guess
+
+# Headless multiplayer server: players connect over TCP and exchange one JSON object per line.
+#   {"op": "join", "game": "tictactoe" | "hangman" | "codebreaker", "name": "..."}  wait for an opponent
+#   {"op": "move", "move": ..., "id": n}  a cell 0-8, a letter or a 4-letter guess; the reply carries "reply": n
+#   {"op": "stats"}  sessions, players, moves served and server CPU time
+# Every session is its own state object; a finished session frees both players to join again.
+HOST, PORT = "127.0.0.1", 8765
+MAX_MESSAGE = 1024  # longest request line in bytes; a longer one drops the client
+OUTBOX_BYTES = 64 * 1024  # unsent bytes a client may fall behind by before its session waits for it
+SEND_TIMEOUT = 10  # seconds a stalled client is waited for before it is dropped
+
+
+# Tic-Tac-Toe between two people: seat 0 plays X and moves first.
+# winner is None while the game runs, then the winning seat, or -1 for a draw.
+class TicTacToeSession:
+    game = "tictactoe"
+    lines = [(0, 1, 2), (3, 4, 5), (6, 7, 8), (0, 3, 6), (1, 4, 7), (2, 5, 8), (0, 4, 8), (2, 4, 6)]
+
+    def __init__(self):
+        self.board = [""] * 9
+        self.turn = 0
+        self.winner = None
+
+    def move(self, seat, cell):
+        if self.winner is not None:
+            raise ValueError("game over")
+        if seat != self.turn:
+            raise ValueError("not your turn")
+        if not isinstance(cell, int) or not 0 <= cell < 9 or self.board[cell]:
+            raise ValueError("pick an empty cell 0-8")
+        self.board[cell] = "XO"[seat]
+        if any(self.board[a] == self.board[b] == self.board[c] != "" for a, b, c in self.lines):
+            self.winner = seat
+        elif all(self.board):
+            self.winner = -1
+        self.turn = 1 - seat
+
+    def view(self, seat):
+        return {"game": self.game, "you": seat, "board": self.board, "turn": self.turn, "winner": self.winner}
+
+
+# Competitive Hangman: both players race to uncover the same word, each with their own guesses and lives.
+# Running out of lives hands the win to the opponent.
+class HangmanSession:
+    game = "hangman"
+    lives = 6
+
+    def __init__(self):
+        self.word = random.choice(content.section("hangman"))  # the same words as the Hangman game
+        self.guessed = [set(), set()]
+        self.lives_left = [self.lives, self.lives]
+        self.winner = None
+
+    def found(self, seat):
+        return sum(letter in self.guessed[seat] for letter in self.word)
+
+    def move(self, seat, letter):
+        if self.winner is not None:
+            raise ValueError("game over")
+        if not isinstance(letter, str) or len(letter) != 1 or not letter.isalpha():
+            raise ValueError("guess one letter")
+        letter = letter.upper()
+        if letter in self.guessed[seat]:
+            raise ValueError("already guessed")
+        self.guessed[seat].add(letter)
+        if letter not in self.word:
+            self.lives_left[seat] -= 1
+        if self.found(seat) == len(self.word):
+            self.winner = seat
+        elif self.lives_left[seat] == 0:
+            self.winner = 1 - seat
+
+    def view(self, seat):
+        masked = "".join(letter if letter in self.guessed[seat] or self.winner is not None else "_" for letter in self.word)
+        return {"game": self.game, "you": seat, "word": masked, "guessed": "".join(sorted(self.guessed[seat])),
+                "lives": self.lives_left, "found": [self.found(0), self.found(1)], "turn": None, "winner": self.winner}
+
+
+# Competitive Alien Code Breaker: both players attack the same 4-letter code with 5 attempts each;
+# the first to crack it wins, and it is a draw if neither does
+class CodeBreakerSession:
+    game = "codebreaker"
+    attempts = 5
+
+    def __init__(self):
+        self.code = "".join(random.choices(string.ascii_uppercase, k=4))
+        self.guesses = [[], []]  # (guess, correct letters) per seat
+        self.winner = None
+
+    def move(self, seat, guess):
+        if self.winner is not None:
+            raise ValueError("game over")
+        if len(self.guesses[seat]) == self.attempts:
+            raise ValueError("no attempts left")
+        if not isinstance(guess, str) or len(guess) != 4 or not guess.isalpha():
+            raise ValueError("guess 4 letters")
+        guess = guess.upper()
+        self.guesses[seat].append((guess, score_guess(guess, self.code)))
+        if guess == self.code:
+            self.winner = seat
+        elif all(len(guesses) == self.attempts for guesses in self.guesses):
+            self.winner = -1
+
+    def view(self, seat):
+        return {"game": self.game, "you": seat, "guesses": self.guesses[seat],
+                "attempts": [self.attempts - len(guesses) for guesses in self.guesses],
+                "best": [max((correct for _, correct in guesses), default=0) for guesses in self.guesses],
+                "code": self.code if self.winner is not None else None, "turn": None, "winner": self.winner}
+
+
+SESSIONS = {session.game: session for session in (TicTacToeSession, HangmanSession, CodeBreakerSession)}
+
+
+class Player:
+    def __init__(self, writer):
+        self.writer = writer
+        self.name = ""
+        self.session = None
+        self.seat = None
+        self.waiting_for = None  # game the player is queued for
+
+
+# Matchmaking and move routing. Each client is served by its own reader coroutine, which applies moves
+# one at a time and awaits the replies' delivery: a slow reader stalls only its own session, and only once
+# OUTBOX_BYTES are queued for it, instead of buffering without bound.
+class GameServer:
+    def __init__(self):
+        self.waiting = {}  # game -> the player waiting for an opponent
+        self.sessions = {}  # session id -> (session, players)
+        self.next_id = 0
+        self.players = 0
+        self.moves = 0
+        self.started = time.perf_counter()
+
+    async def send(self, player, message):
+        writer = player.writer
+        if writer.is_closing():
+            return
+        writer.write(json.dumps(message, separators=(",", ":")).encode() + b"\n")
+        if writer.transport.get_write_buffer_size() > OUTBOX_BYTES:
+            try:
+                await asyncio.wait_for(writer.drain(), SEND_TIMEOUT)
+            except (ConnectionError, asyncio.TimeoutError):
+                writer.transport.abort()  # its own reader coroutine then cleans up
+
+    async def handle_client(self, reader, writer):
+        player = Player(writer)
+        self.players += 1
+        try:
+            while True:
+                line = await reader.readline()
+                if not line:
+                    break
+                try:
+                    request = json.loads(line)
+                    op = request["op"]
+                except (ValueError, KeyError, TypeError):
+                    await self.send(player, {"op": "error", "reason": "bad request"})
+                    continue
+                if op == "join":
+                    await self.join(player, request)
+                elif op == "move":
+                    await self.move(player, request)
+                elif op == "stats":
+                    await self.send(player, self.stats())
+                else:
+                    await self.send(player, {"op": "error", "reason": f"unknown op {op!r}"})
+        except (ConnectionError, ValueError):
+            pass  # disconnected, or a line over MAX_MESSAGE
+        finally:
+            self.players -= 1
+            await self.leave(player)
+            writer.close()
+
+    async def join(self, player, request):
+        game = request.get("game")
+        if player.session is not None or player.waiting_for is not None:
+            await self.send(player, {"op": "error", "reason": "already playing"})
+            return
+        if game not in SESSIONS:
+            await self.send(player, {"op": "error", "reason": f"games: {', '.join(SESSIONS)}"})
+            return
+        player.name = str(request.get("name", ""))[:10]
+        opponent = self.waiting.pop(game, None)
+        if opponent is None:
+            self.waiting[game] = player
+            player.waiting_for = game
+            await self.send(player, {"op": "waiting", "game": game})
+            return
+        session = SESSIONS[game]()
+        players = [opponent, player]
+        self.sessions[self.next_id] = session, players
+        for seat, seated in enumerate(players):
+            seated.session, seated.seat, seated.waiting_for = self.next_id, seat, None
+        self.next_id += 1
+        for seat, seated in enumerate(players):
+            await self.send(seated, {"op": "start", "opponent": players[1 - seat].name, **session.view(seat)})
+
+    async def move(self, player, request):
+        if player.session is None:
+            await self.send(player, {"op": "error", "reason": "not in a game", "reply": request.get("id")})
+            return
+        session_id = player.session
+        session, players = self.sessions[session_id]
+        try:
+            session.move(player.seat, request.get("move"))
+        except ValueError as error:
+            await self.send(player, {"op": "error", "reason": str(error), "reply": request.get("id")})
+            return
+        self.moves += 1
+        if session.winner is not None:
+            del self.sessions[session_id]
+            for seated in players:
+                seated.session = seated.seat = None
+        for seat, seated in enumerate(players):
+            message = {"op": "state", **session.view(seat)}
+            if seated is player:
+                message["reply"] = request.get("id")
+            await self.send(seated, message)
+
+    async def leave(self, player):
+        if player.waiting_for is not None:
+            self.waiting.pop(player.waiting_for, None)
+        elif player.session is not None:
+            session, players = self.sessions.pop(player.session)
+            for seated in players:
+                seated.session = seated.seat = None
+            for seated in players:
+                if seated is not player:
+                    await self.send(seated, {"op": "end", "reason": "opponent left"})
+
+    def stats(self):
+        return {"op": "stats", "sessions": len(self.sessions), "players": self.players, "moves": self.moves,
+                "cpu": time.process_time(), "uptime": time.perf_counter() - self.started}
+
+
+async def main(host=HOST, port=PORT):
+    server = GameServer()
+    listener = await asyncio.start_server(server.handle_client, host, port, limit=MAX_MESSAGE, backlog=1024)
+    print(f"Listening on {host}:{listener.sockets[0].getsockname()[1]}", flush=True)
+    async with listener:
+        await listener.serve_forever()
+
+
+if __name__ == "__main__":
+    # python server.py [PORT]; port 0 picks a free one
+    try:
+        asyncio.run(main(port=int(sys.argv[1]) if len(sys.argv) > 1 else PORT))
+    except KeyboardInterrupt:
+        pass
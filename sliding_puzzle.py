@@ -0,0 +1,382 @@
+import bisect
+import copy
+import mmap
+import os
+import random
+import struct
+import sys
+
+import numpy as np
+
+
+def count_inversions(tiles):
+    # Fenwick tree over tile values, scanning right to left: each tile adds the smaller tiles already seen
+    tree = [0] * (len(tiles) + 1)
+    inversions = 0
+    for tile in reversed(tiles):
+        i = tile - 1
+        while i > 0:
+            inversions += tree[i]
+            i -= i & -i
+        i = tile
+        while i < len(tree):
+            tree[i] += 1
+            i += i & -i
+    return inversions
+
+
+def inversion_parity(tiles):
+    # Parity of a permutation of 1..n from its cycle count, in O(n) without counting inversions
+    seen = [False] * (len(tiles) + 1)
+    cycles = 0
+    for start in tiles:
+        if not seen[start]:
+            cycles += 1
+            tile = start
+            while not seen[tile]:
+                seen[tile] = True
+                tile = tiles[tile - 1]
+    return (len(tiles) - cycles) % 2
+
+
+def is_solvable(puzzle, width):
+    # Odd widths: the inversion count must be even. Even widths: a vertical move also shifts the blank's row,
+    # so inversions plus the blank's row counted from the bottom (1-based) must be odd.
+    inversions = count_inversions([tile for tile in puzzle if tile])
+    if width % 2:
+        return inversions % 2 == 0
+    return (inversions + width - puzzle.index(0) // width) % 2 == 1
+
+
+def random_solvable(width, rng=random):
+    # One shuffle, then swapping two tiles flips the parity if needed: linear time, no reshuffling
+    puzzle = list(range(width * width))
+    rng.shuffle(puzzle)
+    tiles = [tile for tile in puzzle if tile]
+    parity = inversion_parity(tiles)
+    if width % 2 == 0:
+        parity = (parity + width - puzzle.index(0) // width + 1) % 2
+    if parity:
+        first, second = [i for i, tile in enumerate(puzzle[:3]) if tile][:2]
+        puzzle[first], puzzle[second] = puzzle[second], puzzle[first]
+    return puzzle
+
+
+# Optimal solving: IDA* over additive pattern databases where they have been built, Manhattan distance plus
+# linear conflicts otherwise. Databases are built offline (python sliding_puzzle.py build 4 5) and memory-mapped.
+DB_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "pattern_db")
+DB_HEADER = struct.Struct("<4sBBB")  # magic, format version, width, tiles in the pattern (tile numbers follow)
+DB_MAGIC = b"SPDB"
+DB_VERSION = 1
+PARTITIONS = {4: [(1, 2, 3, 5, 6), (4, 7, 8, 11, 12), (9, 10, 13, 14, 15)]}
+PATTERN_TILES = 4  # default group size for other widths: tables hold cells ** group bytes each
+HINT_NODE_BUDGET = 200000  # search nodes per hint before falling back to the best greedy move
+PAR_NODE_BUDGET = 50000  # spent when a board is dealt; par stays a lower bound if that runs out
+MAX_OPTIMAL_WIDTH = 4  # wider boards, and 4x4 without its pattern databases, only get greedy hints and a par bound
+MAX_SEARCH_DEPTH = 400  # deeper bounds are hopeless for optimal search and would exhaust the stack
+
+
+def partition(width):
+    if width in PARTITIONS:
+        return PARTITIONS[width]
+    tiles = list(range(1, width * width))
+    return [tuple(tiles[i:i + PATTERN_TILES]) for i in range(0, len(tiles), PATTERN_TILES)]
+
+
+def database_path(width, group):
+    return os.path.join(DB_DIR, f"{width}x{width}-{group}.pdb")
+
+
+def build_pattern_database(width, tiles):
+    # Additive PDB: fewest moves of *these* tiles to bring them home, whatever the other tiles do.
+    # Layered 0-1 BFS backwards from the goal over (pattern positions, blank) states, vectorized per layer;
+    # blank moves through non-pattern cells are free, moving a pattern tile costs 1.
+    cells = width * width
+    k = len(tiles)
+    powers = cells ** np.arange(k - 1, -1, -1, dtype=np.int64)
+    table = np.full(cells ** k, 255, dtype=np.uint8)
+    visited = np.zeros(cells ** (k + 1), dtype=bool)
+    goal = sum((tile - 1) * int(power) for tile, power in zip(tiles, powers))
+    frontier = np.array([goal * cells + cells - 1], dtype=np.int64)
+    steps = [(-width, lambda blank: blank >= width), (width, lambda blank: blank < cells - width),
+             (-1, lambda blank: blank % width > 0), (1, lambda blank: blank % width < width - 1)]
+    cost = 0
+    while frontier.size:
+        visited[frontier] = True
+        layer, paid = [frontier], []
+        level = frontier
+        while level.size:
+            index, blank = np.divmod(level, cells)
+            positions = (index[:, None] // powers) % cells
+            free = []
+            for step, allowed in steps:
+                ok = allowed(blank)
+                moved_index, moved_blank, moved_positions = index[ok], blank[ok] + step, positions[ok]
+                hit = moved_positions == moved_blank[:, None]
+                pushed = hit.any(axis=1)
+                free.append(moved_index[~pushed] * cells + moved_blank[~pushed])
+                # The blank swaps with a pattern tile: that tile takes the blank's old cell
+                tile = hit[pushed].argmax(axis=1)
+                shifted = moved_index[pushed] + (blank[ok][pushed] - moved_blank[pushed]) * powers[tile]
+                paid.append(shifted * cells + moved_blank[pushed])
+            level = np.unique(np.concatenate(free))
+            level = level[~visited[level]]
+            visited[level] = True
+            layer.append(level)
+        reached = np.concatenate(layer) // cells
+        fresh = reached[table[reached] == 255]
+        table[fresh] = cost
+        frontier = np.unique(np.concatenate(paid))
+        frontier = frontier[~visited[frontier]]
+        cost += 1
+    return table
+
+
+def build_pattern_databases(width):
+    os.makedirs(DB_DIR, exist_ok=True)
+    for group, tiles in enumerate(partition(width)):
+        table = build_pattern_database(width, tiles)
+        with open(database_path(width, group), "wb") as f:
+            f.write(DB_HEADER.pack(DB_MAGIC, DB_VERSION, width, len(tiles)))
+            f.write(bytes(tiles))
+            f.write(table.tobytes())
+
+
+def load_pattern_databases(width):
+    # Memory-mapped read-only tables, or None if any group hasn't been built
+    databases = []
+    for group, tiles in enumerate(partition(width)):
+        try:
+            with open(database_path(width, group), "rb") as f:
+                table = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        except (OSError, ValueError):
+            return None
+        magic, version, found_width, count = DB_HEADER.unpack_from(table)
+        offset = DB_HEADER.size + count
+        if (magic, version, found_width) != (DB_MAGIC, DB_VERSION, width) or tuple(table[DB_HEADER.size:offset]) != tiles:
+            return None
+        databases.append((tiles, table, offset))
+    return databases
+
+
+def longest_increasing(values):
+    tails = []
+    for value in values:
+        i = bisect.bisect_left(tails, value)
+        if i == len(tails):
+            tails.append(value)
+        else:
+            tails[i] = value
+    return len(tails)
+
+
+class ManhattanHeuristic:
+    # Manhattan distance plus linear conflicts: tiles sharing their goal row (or column) but in the wrong order
+    # must step out of the line, two extra moves for each tile outside the longest correctly ordered subsequence
+    def __init__(self, width):
+        self.width = width
+        cells = width * width
+        self.distance = [[0] * cells] + [[abs(cell // width - (tile - 1) // width) + abs(cell % width - (tile - 1) % width)
+                                          for cell in range(cells)] for tile in range(1, cells)]
+
+    def row_conflicts(self, puzzle, row):
+        w = self.width
+        goals = [(tile - 1) % w for tile in puzzle[row * w:row * w + w] if tile and (tile - 1) // w == row]
+        return 2 * (len(goals) - longest_increasing(goals))
+
+    def column_conflicts(self, puzzle, column):
+        w = self.width
+        goals = [(tile - 1) // w for tile in puzzle[column::w] if tile and (tile - 1) % w == column]
+        return 2 * (len(goals) - longest_increasing(goals))
+
+    def reset(self, puzzle):
+        self.rows = [self.row_conflicts(puzzle, line) for line in range(self.width)]
+        self.columns = [self.column_conflicts(puzzle, line) for line in range(self.width)]
+        self.saved = []
+        return sum(self.distance[tile][cell] for cell, tile in enumerate(puzzle)) + sum(self.rows) + sum(self.columns)
+
+    def move(self, puzzle, tile, source, dest):
+        # Called after the swap: a sideways move can only change the two columns' conflicts, a vertical one the rows'
+        w = self.width
+        change = self.distance[tile][dest] - self.distance[tile][source]
+        if source // w == dest // w:
+            values, lines, conflicts = self.columns, (source % w, dest % w), self.column_conflicts
+        else:
+            values, lines, conflicts = self.rows, (source // w, dest // w), self.row_conflicts
+        for line in lines:
+            value = conflicts(puzzle, line)
+            self.saved.append((values, line, values[line]))
+            change += value - values[line]
+            values[line] = value
+        return change
+
+    def unmove(self, tile, source, dest):
+        for _ in range(2):
+            values, line, value = self.saved.pop()
+            values[line] = value
+
+
+class PatternHeuristic:
+    # Sum of disjoint pattern databases; each table index moves by a fixed weight per tile step, so one move is O(1)
+    def __init__(self, width, databases):
+        cells = width * width
+        self.databases = databases
+        self.group = [None] * cells
+        self.weight = [0] * cells
+        for group, (tiles, _, _) in enumerate(databases):
+            for i, tile in enumerate(tiles):
+                self.group[tile] = group
+                self.weight[tile] = cells ** (len(tiles) - 1 - i)
+
+    def reset(self, puzzle):
+        self.index = [0] * len(self.databases)
+        for cell, tile in enumerate(puzzle):
+            if tile:
+                self.index[self.group[tile]] += cell * self.weight[tile]
+        return sum(table[offset + index] for (_, table, offset), index in zip(self.databases, self.index))
+
+    def move(self, puzzle, tile, source, dest):
+        group = self.group[tile]
+        _, table, offset = self.databases[group]
+        old = self.index[group]
+        new = self.index[group] = old + (dest - source) * self.weight[tile]
+        return table[offset + new] - table[offset + old]
+
+    def unmove(self, tile, source, dest):
+        self.index[self.group[tile]] -= (dest - source) * self.weight[tile]
+
+
+class SlidingSolver:
+    def __init__(self, width):
+        self.width = width
+        cells = width * width
+        self.neighbors = [[cell + step for step, ok in ((-width, cell >= width), (width, cell < cells - width),
+                                                        (-1, cell % width > 0), (1, cell % width < width - 1)) if ok]
+                          for cell in range(cells)]
+        databases = load_pattern_databases(width) if width > 3 else None
+        self.heuristic = PatternHeuristic(width, databases) if databases else ManhattanHeuristic(width)
+        self.optimal = width < 4 or width <= MAX_OPTIMAL_WIDTH and databases is not None  # worth an optimal search
+
+    def lower_bound(self, puzzle):
+        return self.heuristic.reset(puzzle)
+
+    def solve(self, puzzle, max_nodes=HINT_NODE_BUDGET):
+        # IDA* run to the end in one call: the moves (cells slid into the blank) of a shortest solution, or None
+        search = Search(self, puzzle, max_nodes)
+        search.step(max_nodes)
+        self.nodes = search.nodes
+        return search.path
+
+    def best_move(self, puzzle, avoid=None):
+        # Fallback hint when optimal search is over budget: the move that lowers the heuristic most
+        blank = puzzle.index(0)
+        scored = []
+        for cell in self.neighbors[blank]:
+            if cell != avoid:
+                moved = list(puzzle)
+                moved[blank], moved[cell] = moved[cell], 0
+                scored.append((self.heuristic.reset(moved), cell))
+        return min(scored)[1]
+
+
+# IDA* that can stop after any number of nodes and carry on later, so the game spreads a search over frames.
+# The recursion lives on an explicit stack of [blank, g, previous blank, h, next neighbour, smallest f over the
+# bound]; each search has its own copy of the solver's heuristic state, so a par search and a hint search can
+# both be under way.
+class Search:
+    def __init__(self, solver, puzzle, max_nodes=HINT_NODE_BUDGET):
+        self.neighbors = solver.neighbors
+        self.heuristic = copy.copy(solver.heuristic)
+        self.puzzle = list(puzzle)
+        self.max_nodes = max_nodes
+        self.nodes = 0
+        self.done = False
+        self.path = None  # the moves (cells slid into the blank) of a shortest solution, once found
+        self.h = self.heuristic.reset(self.puzzle)
+        self.bound = self.h
+        self.stack, self.moves = [], []
+        self.start_iteration()
+
+    def start_iteration(self):
+        if self.h == 0:
+            self.path, self.done = [], True
+            return
+        self.nodes += 1
+        self.stack = [[self.puzzle.index(0), 0, -1, self.h, 0, None]]
+        self.moves = []  # (tile, cell, blank) of each move down the stack
+
+    def step(self, budget):
+        # Expands up to budget more nodes; returns True once the search is over, found or not
+        puzzle, heuristic, neighbors, stack, moves = self.puzzle, self.heuristic, self.neighbors, self.stack, self.moves
+        nodes, bound = self.nodes, self.bound
+        limit = min(nodes + budget, self.max_nodes)
+        while not self.done:
+            if not stack:
+                # Iteration over: deepen to the smallest f that went over the bound
+                if bound is None or bound > MAX_SEARCH_DEPTH:
+                    self.done = True
+                    break
+                self.nodes, self.bound = nodes, bound
+                self.start_iteration()
+                stack, moves, nodes = self.stack, self.moves, self.nodes
+                continue
+            frame = stack[-1]
+            blank, g, previous, h, i, over = frame
+            options = neighbors[blank]
+            if i == len(options):
+                stack.pop()
+                if moves:
+                    tile, cell, parent = moves.pop()
+                    heuristic.unmove(tile, cell, parent)
+                    puzzle[parent], puzzle[cell] = 0, tile
+                if not stack:
+                    bound = over
+                elif over is not None and (stack[-1][5] is None or over < stack[-1][5]):
+                    stack[-1][5] = over
+                continue
+            cell = options[i]
+            frame[4] = i + 1
+            if cell == previous:
+                continue
+            if nodes >= limit:
+                frame[4] = i
+                if nodes >= self.max_nodes:
+                    self.done = True  # over budget: path stays None
+                break
+            tile = puzzle[cell]
+            puzzle[blank], puzzle[cell] = tile, 0
+            h += heuristic.move(puzzle, tile, cell, blank)
+            f = g + 1 + h
+            if f > bound:
+                heuristic.unmove(tile, cell, blank)
+                puzzle[blank], puzzle[cell] = 0, tile
+                if over is None or f < over:
+                    frame[5] = f
+                continue
+            moves.append((tile, cell, blank))
+            if h == 0:
+                self.path = [move[1] for move in moves]
+                self.done = True
+                break
+            nodes += 1
+            stack.append([cell, g + 1, blank, h, 0, None])
+        self.nodes, self.bound = nodes, bound
+        return self.done
+
+
+_solvers = {}
+
+
+def get_solver(width):
+    # One solver per width, so pattern databases are mapped once per process
+    if width not in _solvers:
+        _solvers[width] = SlidingSolver(width)
+    return _solvers[width]
+
+
+if __name__ == "__main__":
+    if len(sys.argv) > 2 and sys.argv[1] == "build":
+        for width in map(int, sys.argv[2:]):
+            build_pattern_databases(width)
+    else:
+        print("usage: python sliding_puzzle.py build WIDTH [WIDTH ...]")
@@ -1,18 +1,29 @@
 import asyncio
+import bisect
 import platform
 import pygame
 import random
 import string
-from collections import defaultdict
+import time
+import numpy as np
+from array import array
+from collections import deque
+from functools import lru_cache
+import save_state
+from history import MoveHistory, handle_history_key
+from code_breaker import CodeBreakerSolver
+import quantum
+import content
+import sliding_puzzle
+import word_jigsaw
+from maze import UP, DOWN, LEFT, RIGHT, DistanceField, Maze, MazeView
+import telemetry
+import ui
 
-# Initialize Pygame
-pygame.init()
-
-# Screen settings
-WIDTH, HEIGHT = 800, 600
-screen = pygame.display.set_mode((WIDTH, HEIGHT))
-pygame.display.set_caption("Cosmic Quest Suite")
-FONT = pygame.font.SysFont("arial", 24)
+# Window, theme and leaderboard are shared with the classic suite and the launcher (ui.py)
+from ui import WIDTH, HEIGHT, screen, theme, starfield, leaderboard, timers
+FONT = ui.font(24)
+SMALL_FONT = ui.font(16)
 
 # Colors
 WHITE = (255, 255, 255)
@@ -22,39 +33,10 @@ GREEN = (0, 255, 0)
 BLUE = (0, 0, 255)
 CYAN = (0, 255, 255)
 GRAY = (128, 128, 128)
+MAGENTA = (255, 0, 255)
 
-# Theme settings
-class Theme:
-    def __init__(self):
-        self.is_dark = True
-        self.background = BLACK
-        self.text_color = WHITE
-        self.border_color = WHITE
-
-    def toggle(self):
-        self.is_dark = not self.is_dark
-        self.background = BLACK if self.is_dark else WHITE
-        self.text_color = WHITE if self.is_dark else BLACK
-        self.border_color = WHITE if self.is_dark else BLACK
-
-theme = Theme()
-
-# Leaderboard
-leaderboard = defaultdict(list)  # {game: [(name, score), ...]}
-
-# Space facts
-SPACE_FACTS = [
-    "The Sun is a star, about 4.6 billion years old, and makes up 99.86% of the Solar System's mass.",
-    "Jupiter has 79 known moons, the largest being Ganymede, which is bigger than Mercury.",
-    "A light-year is the distance light travels in one year, about 5.88 trillion miles (9.46 trillion km).",
-    "The Milky Way galaxy contains an estimated 100-400 billion stars and is about 100,000 light-years across.",
-    "Black holes have such strong gravity that not even light can escape; they form from massive star collapses.",
-    "The first human in space was Yuri Gagarin, who orbited Earth on April 12, 1961, aboard Vostok 1.",
-    "Mars has the largest volcano in the Solar System, Olympus Mons, which is 13.6 miles (22 km) high.",
-    "Neutron stars are so dense that a teaspoon of their material would weigh as much as Mount Everest.",
-    "The Hubble Space Telescope has been observing the universe since 1990, capturing images of distant galaxies.",
-    "Saturn's rings are made of ice and rock particles, some as small as dust and others as large as mountains."
-]
+# Space facts, from the content pack when one has been built
+SPACE_FACTS = content.section("facts")
 
 # Space Fact Screen
 class SpaceFactScreen:
@@ -63,12 +45,10 @@ class SpaceFactScreen:
         self.next_state = next_state
         self.player_name = player_name
         self.game_name = game_name
-        self.stars = [(random.randint(0, WIDTH), random.randint(0, HEIGHT)) for _ in range(50)]  # Starfield
 
     def draw(self):
         screen.fill(theme.background)
-        for star in self.stars:
-            pygame.draw.circle(screen, theme.text_color, star, 1)
+        starfield.draw(screen, theme.background, theme.text_color)
         y = HEIGHT // 2 - 100
         text = FONT.render("Did You Know?", True, theme.text_color)
         screen.blit(text, (WIDTH // 2 - text.get_width() // 2, y))
@@ -124,6 +104,7 @@ class MainMenu:
 
     def draw(self):
         screen.fill(theme.background)
+        starfield.draw(screen, theme.background, theme.text_color)
         if self.name_input:
             text = FONT.render(f"Enter Name: {self.player_name}", True, theme.text_color)
             screen.blit(text, (WIDTH // 2 - text.get_width() // 2, HEIGHT // 2))
@@ -170,12 +151,27 @@ class MainMenu:
 class AlienCodeBreaker:
     def __init__(self, player_name):
         self.player_name = player_name
+        self.telemetry = telemetry.Session("Alien Code Breaker", player_name, self.snapshot)
         self.code = ''.join(random.choices(string.ascii_uppercase, k=4))
         self.attempts_left = 5
         self.current_guess = ""
         self.feedback = ""
         self.score = 0
         self.game_over = False
+        self.guesses = []  # (guess, correct letters) in order
+        self.solver = None  # built on the first hint
+
+    def hint(self):
+        if self.solver is None:
+            self.solver = CodeBreakerSolver(len(self.code))
+            for guess, correct in self.guesses:
+                self.solver.observe(guess, correct)
+        suggestion = self.solver.hint()
+        if suggestion:
+            self.current_guess = suggestion
+            self.score -= 10  # Hints cost points
+            self.telemetry.event("hint", suggestion=suggestion)
+            self.feedback = f"Hint: {suggestion} ({self.solver.candidates_left()} codes still possible)"
 
     def draw(self):
         screen.fill(theme.background)
@@ -197,7 +193,7 @@ class AlienCodeBreaker:
             text = FONT.render(f"{result} Press R to Restart or ESC to Menu", True, theme.text_color)
             screen.blit(text, (WIDTH // 2 - text.get_width() // 2, y))
         else:
-            text = FONT.render("Enter 4 letters and press ENTER, ESC to Menu", True, theme.text_color)
+            text = FONT.render("Enter 4 letters and press ENTER, TAB for a hint, ESC to Menu", True, theme.text_color)
             screen.blit(text, (WIDTH // 2 - text.get_width() // 2, y))
         pygame.display.flip()
 
@@ -212,23 +208,32 @@ class AlienCodeBreaker:
                     leaderboard["Alien Code Breaker"].append((self.player_name, self.score))
                     leaderboard["Alien Code Breaker"].sort(key=lambda x: x[1], reverse=True)
                     leaderboard["Alien Code Breaker"] = leaderboard["Alien Code Breaker"][:5]
+                self.telemetry.end("quit", self.score)
                 return "space_fact", self.player_name, "menu"
             elif event.key == pygame.K_BACKSPACE:
                 self.current_guess = self.current_guess[:-1]
+            elif event.key == pygame.K_TAB and not self.game_over:
+                self.hint()
             elif event.key == pygame.K_RETURN and self.current_guess and not self.game_over:
                 if len(self.current_guess) == 4 and self.current_guess.isalpha():
                     self.attempts_left -= 1
                     correct = sum(a == b for a, b in zip(self.current_guess.upper(), self.code))
                     self.score += correct * 10
+                    self.guesses.append((self.current_guess.upper(), correct))
+                    self.telemetry.move(guess=self.current_guess.upper(), correct=correct, attempt=len(self.guesses))
+                    if self.solver is not None:
+                        self.solver.observe(self.current_guess.upper(), correct)
                     if self.current_guess.upper() == self.code:
                         self.game_over = True
                         self.score += 50
+                        self.telemetry.end("won", self.score)
                         leaderboard["Alien Code Breaker"].append((self.player_name, self.score))
                         leaderboard["Alien Code Breaker"].sort(key=lambda x: x[1], reverse=True)
                         leaderboard["Alien Code Breaker"] = leaderboard["Alien Code Breaker"][:5]
                         return "space_fact", self.player_name, "menu"
                     elif self.attempts_left == 0:
                         self.game_over = True
+                        self.telemetry.end("lost", self.score)
                         leaderboard["Alien Code Breaker"].append((self.player_name, self.score))
                         leaderboard["Alien Code Breaker"].sort(key=lambda x: x[1], reverse=True)
                         leaderboard["Alien Code Breaker"] = leaderboard["Alien Code Breaker"][:5]
@@ -242,62 +247,168 @@ class AlienCodeBreaker:
                 self.current_guess += event.unicode
         return None, None, None
 
+    def snapshot(self):
+        return save_state.dump(b"ACO2", "<hi?", (self.attempts_left, self.score, self.game_over),
+                               self.player_name.encode(), self.code.encode(),
+                               self.current_guess.encode(), self.feedback.encode(),
+                               "".join(guess for guess, _ in self.guesses).encode(),
+                               bytes(correct for _, correct in self.guesses))
+
+    def restore(self, data):
+        fields, (name, code, guess, feedback, guesses, correct) = save_state.load(b"ACO2", "<hi?", data)
+        self.attempts_left, self.score, self.game_over = fields
+        self.player_name = name.decode()
+        self.code = code.decode()
+        self.current_guess = guess.decode()
+        self.feedback = feedback.decode()
+        guesses = guesses.decode()
+        size = len(self.code)
+        self.guesses = [(guesses[i * size:(i + 1) * size], hits) for i, hits in enumerate(correct)]
+        self.solver = None
+
 # Meteorite Match-Up
+MISMATCH_MS = 500  # How long a mismatched pair stays face up
+FLIP_MS = 150  # Card turn animation
+SYMBOL_COLORS = [("Red", (220, 60, 60)), ("Blue", (60, 110, 230)), ("Green", (60, 190, 80)), ("Yellow", (230, 210, 60)),
+                 ("Purple", (200, 90, 220)), ("Orange", (240, 140, 40)), ("Cyan", (60, 200, 210)),
+                 ("White", (240, 240, 240)), ("Brown", (150, 100, 60)), ("Silver", (130, 130, 130))]
+SYMBOL_GLYPHS = "123456789ACDEFHJKLMNPQTUVXZ"  # Marks for the second and later rounds of colours
+
+
+@lru_cache(maxsize=8)
+def card_atlas(cell_size, symbols, dark):
+    # Every card face baked once into one surface: symbol k at slot k, its matched (dimmed) face at
+    # slot symbols + k, and the card back last. Symbols are a colour marked with its initial, then with a glyph.
+    columns = 16
+    slots = 2 * symbols + 1
+    atlas = pygame.Surface((columns * cell_size, (slots + columns - 1) // columns * cell_size)).convert()
+    atlas.fill(BLACK if dark else WHITE)
+    font = pygame.font.SysFont("arial", max(10, cell_size * 3 // 5))
+    inset = max(1, cell_size // 16)
+    for slot in range(slots):
+        x, y = slot % columns * cell_size, slot // columns * cell_size
+        card = pygame.Rect(x + inset, y + inset, cell_size - 2 * inset, cell_size - 2 * inset)
+        if slot == 2 * symbols:
+            pygame.draw.rect(atlas, WHITE if dark else BLACK, card, 2)
+            continue
+        symbol = slot % symbols
+        name, color = SYMBOL_COLORS[symbol % len(SYMBOL_COLORS)]
+        rounds = symbol // len(SYMBOL_COLORS)
+        if slot >= symbols:
+            color = tuple(channel // 3 for channel in color)
+        pygame.draw.rect(atlas, color, card)
+        text = font.render(name[0] if rounds == 0 else SYMBOL_GLYPHS[(rounds - 1) % len(SYMBOL_GLYPHS)], True, BLACK)
+        atlas.blit(text, (card.centerx - text.get_width() // 2, card.centery - text.get_height() // 2))
+    return atlas
+
+
 class MeteoriteMatchUp:
-    def __init__(self, player_name):
+    board_size = (4, 2)  # Last board picked with +/-, kept across restarts
+    sizes = [(4, 2), (4, 4), (6, 6), (8, 8), (10, 10), (12, 12), (16, 16), (20, 20)]
+    flip_back = None  # Timer turning a mismatched pair back over
+
+    def __init__(self, player_name, board_size=None):
         self.player_name = player_name
-        self.cell_size = 80
-        self.grid_width, self.grid_height = 4, 2
-        self.colors = ["Red", "Blue", "Green", "Yellow"] * 2
-        random.shuffle(self.colors)
-        self.revealed = [False] * 8
-        self.matched = [False] * 8
+        self.telemetry = telemetry.Session("Meteorite Match-Up", player_name, self.snapshot)
+        self.new_board(*(board_size or MeteoriteMatchUp.board_size))
+
+    def new_board(self, grid_width, grid_height):
+        self.grid_width, self.grid_height = grid_width, grid_height
+        cards = grid_width * grid_height
+        self.cell_size = min(80, 720 // grid_width, 400 // grid_height)
+        self.pairs = cards // 2
+        self.symbols = list(range(self.pairs)) * 2
+        random.shuffle(self.symbols)
+        self.revealed = [False] * cards
+        self.matched = [False] * cards
+        self.matched_pairs = 0
         self.first_click = None
+        self.second_click = None
         self.score = 0
         self.game_over = False
-        self.flip_back = False
-        self.flip_timer = 0
+        if self.flip_back is not None:
+            self.flip_back.cancel()  # Still pending from the previous board
+        self.flip_back = None
+        self.flips = {}  # card -> (tween, atlas slot of the face it turns from) while it turns over
 
     def draw(self):
         screen.fill(theme.background)
-        offset_x, offset_y = (WIDTH - self.grid_width * self.cell_size) // 2, (HEIGHT - self.grid_height * self.cell_size) // 2
-        for i in range(self.grid_height):
-            for j in range(self.grid_width):
-                idx = i * self.grid_width + j
-                rect = (offset_x + j * self.cell_size, offset_y + i * self.cell_size, self.cell_size, self.cell_size)
-                if self.matched[idx]:
-                    pygame.draw.rect(screen, GRAY, rect)
-                    text = FONT.render(self.colors[idx][0], True, theme.text_color)
-                    screen.blit(text, (rect[0] + self.cell_size // 2 - text.get_width() // 2, rect[1] + self.cell_size // 2 - text.get_height() // 2))
-                elif self.revealed[idx]:
-                    pygame.draw.rect(screen, GRAY, rect)
-                    text = FONT.render(self.colors[idx][0], True, theme.text_color)
-                    screen.blit(text, (rect[0] + self.cell_size // 2 - text.get_width() // 2, rect[1] + self.cell_size // 2 - text.get_height() // 2))
-                else:
-                    pygame.draw.rect(screen, theme.border_color, rect, 2)
-        text = FONT.render(f"Score: {self.score}", True, theme.text_color)
+        size = self.cell_size
+        atlas = card_atlas(size, self.pairs, theme.is_dark)
+        columns = atlas.get_width() // size
+        back = 2 * self.pairs
+        offset_x, offset_y = (WIDTH - self.grid_width * size) // 2, (HEIGHT - self.grid_height * size) // 2
+        blits = []
+        for idx in range(len(self.symbols)):
+            if self.matched[idx]:
+                slot = self.pairs + self.symbols[idx]
+            elif self.revealed[idx]:
+                slot = self.symbols[idx]
+            else:
+                slot = back
+            i, j = divmod(idx, self.grid_width)
+            x, y = offset_x + j * size, offset_y + i * size
+            flip = self.flips.get(idx)
+            if flip is not None:
+                tween, before = flip
+                if not tween.done:
+                    # The card narrows to its edge showing the old face, then widens showing the new one
+                    progress = tween.value()
+                    face = before if progress < 0.5 else slot
+                    width = max(1, round(size * abs(1 - 2 * progress)))
+                    card = atlas.subsurface((face % columns * size, face // columns * size, size, size))
+                    blits.append((pygame.transform.scale(card, (width, size)), (x + (size - width) // 2, y)))
+                    continue
+                del self.flips[idx]
+            blits.append((atlas, (x, y), (slot % columns * size, slot // columns * size, size, size)))
+        screen.blits(blits, doreturn=False)
+        text = FONT.render(f"Score: {self.score}  Pairs: {self.matched_pairs}/{self.pairs}", True, theme.text_color)
         screen.blit(text, (10, HEIGHT - 40))
         if self.game_over:
             text = FONT.render("All matched! Press R to Restart or ESC to Menu", True, theme.text_color)
             screen.blit(text, (WIDTH // 2 - text.get_width() // 2, HEIGHT // 2))
         else:
-            text = FONT.render("Click to reveal, ESC to Menu", True, theme.text_color)
+            text = FONT.render("Click to reveal, +/- board size, ESC to Menu", True, theme.text_color)
             screen.blit(text, (WIDTH // 2 - text.get_width() // 2, HEIGHT - 80))
         pygame.display.flip()
 
-    def update(self):
-        if self.flip_back and pygame.time.get_ticks() > self.flip_timer:
-            if self.first_click is not None:
-                self.revealed[self.first_click] = False
-                self.revealed[self.second_click] = False
-                self.first_click = None
-                self.flip_back = False
-        if all(self.matched):
-            self.game_over = True
-            self.score += 50
-            leaderboard["Meteorite Match-Up"].append((self.player_name, self.score))
-            leaderboard["Meteorite Match-Up"].sort(key=lambda x: x[1], reverse=True)
-            leaderboard["Meteorite Match-Up"] = leaderboard["Meteorite Match-Up"][:5]
+    def turn_over(self, idx, face_before):
+        self.flips[idx] = timers.tween(FLIP_MS), face_before
+
+    def hide_mismatch(self):
+        if self.flip_back is not None:
+            self.flip_back.cancel()
+            self.flip_back = None
+        for idx in (self.first_click, self.second_click):
+            self.revealed[idx] = False
+            self.turn_over(idx, self.symbols[idx])
+        self.first_click = self.second_click = None
+
+    def reveal(self, idx):
+        if self.flip_back is not None:
+            self.hide_mismatch()  # A click during the 500 ms preview turns the mismatch over straight away
+        self.revealed[idx] = True
+        self.turn_over(idx, 2 * self.pairs)
+        self.score += 5
+        self.telemetry.move(card=idx, second=self.first_click is not None)
+        if self.first_click is None:
+            self.first_click = idx
+            return
+        self.second_click = idx
+        if self.symbols[self.first_click] == self.symbols[idx]:
+            self.matched[self.first_click] = self.matched[idx] = True
+            self.matched_pairs += 1
+            self.score += 20
+            self.first_click = self.second_click = None
+            if self.matched_pairs == self.pairs:
+                self.game_over = True
+                self.score += 50
+                self.telemetry.end("won", self.score)
+                leaderboard["Meteorite Match-Up"].append((self.player_name, self.score))
+                leaderboard["Meteorite Match-Up"].sort(key=lambda x: x[1], reverse=True)
+                leaderboard["Meteorite Match-Up"] = leaderboard["Meteorite Match-Up"][:5]
+        else:
+            self.flip_back = timers.after(MISMATCH_MS, self.hide_mismatch)
 
     def handle_input(self, event):
         if event.type == pygame.MOUSEBUTTONDOWN and not self.game_over:
@@ -306,22 +417,9 @@ class MeteoriteMatchUp:
             j, i = (x - offset_x) // self.cell_size, (y - offset_y) // self.cell_size
             idx = i * self.grid_width + j
             if 0 <= i < self.grid_height and 0 <= j < self.grid_width and not self.revealed[idx] and not self.matched[idx]:
-                self.revealed[idx] = True
-                self.score += 5
-                if self.first_click is None:
-                    self.first_click = idx
-                else:
-                    self.second_click = idx
-                    if self.colors[self.first_click] == self.colors[idx]:
-                        self.matched[self.first_click] = self.matched[idx] = True
-                        self.score += 20
-                        self.first_click = None
-                    else:
-                        self.flip_back = True
-                        self.flip_timer = pygame.time.get_ticks() + 500
-                    self.update()
-                    if self.game_over:
-                        return "space_fact", self.player_name, "menu"
+                self.reveal(idx)
+                if self.game_over:
+                    return "space_fact", self.player_name, "menu"
         elif event.type == pygame.KEYDOWN:
             if event.key == pygame.K_r and self.game_over:
                 return "restart", self.player_name, None
@@ -332,149 +430,446 @@ class MeteoriteMatchUp:
                     leaderboard["Meteorite Match-Up"].append((self.player_name, self.score))
                     leaderboard["Meteorite Match-Up"].sort(key=lambda x: x[1], reverse=True)
                     leaderboard["Meteorite Match-Up"] = leaderboard["Meteorite Match-Up"][:5]
+                self.telemetry.end("quit", self.score)
                 return "space_fact", self.player_name, "menu"
+            elif not self.game_over:
+                index = self.sizes.index((self.grid_width, self.grid_height)) if (self.grid_width, self.grid_height) in self.sizes else 0
+                if event.key in (pygame.K_PLUS, pygame.K_EQUALS, pygame.K_KP_PLUS) and index < len(self.sizes) - 1:
+                    MeteoriteMatchUp.board_size = self.sizes[index + 1]
+                    self.new_board(*MeteoriteMatchUp.board_size)
+                elif event.key in (pygame.K_MINUS, pygame.K_KP_MINUS) and index > 0:
+                    MeteoriteMatchUp.board_size = self.sizes[index - 1]
+                    self.new_board(*MeteoriteMatchUp.board_size)
         return None, None, None
 
+    def snapshot(self):
+        first = -1 if self.first_click is None else self.first_click
+        second = -1 if self.second_click is None else self.second_click
+        flip_left = max(0, self.flip_back.due - timers.clock()) if self.flip_back is not None else 0
+        return save_state.dump(b"MET2", "<BBhhi??I", (
+            self.grid_width, self.grid_height, first, second,
+            self.score, self.game_over, self.flip_back is not None, flip_left),
+            self.player_name.encode(), bytes(self.symbols),
+            save_state.pack_bits(self.revealed), save_state.pack_bits(self.matched))
+
+    def restore(self, data):
+        fields, (name, symbols, revealed, matched) = save_state.load(b"MET2", "<BBhhi??I", data)
+        self.grid_width, self.grid_height, first, second, self.score, self.game_over, flip_back, flip_left = fields
+        cards = self.grid_width * self.grid_height
+        self.cell_size = min(80, 720 // self.grid_width, 400 // self.grid_height)
+        self.player_name = name.decode()
+        self.symbols = list(symbols)
+        self.pairs = cards // 2
+        self.revealed = save_state.unpack_bits(revealed, cards)
+        self.matched = save_state.unpack_bits(matched, cards)
+        self.matched_pairs = sum(self.matched) // 2
+        self.first_click = None if first < 0 else first
+        self.second_click = None if second < 0 else second
+        if self.flip_back is not None:
+            self.flip_back.cancel()
+        self.flip_back = timers.after(flip_left, self.hide_mismatch) if flip_back else None
+        self.flips = {}
+
 # Quantum Circuit Puzzle
+GATE_KEYS = {pygame.K_h: "H", pygame.K_x: "X", pygame.K_z: "Z", pygame.K_s: "S", pygame.K_c: "CNOT"}
+QUBIT_KEYS = [pygame.K_0, pygame.K_1, pygame.K_2, pygame.K_3, pygame.K_4,
+              pygame.K_5, pygame.K_6, pygame.K_7, pygame.K_8, pygame.K_9]
+
+
 class QuantumCircuitPuzzle:
-    def __init__(self, player_name):
+    register_size = 3  # Last qubit count picked with +/-, kept across restarts
+    min_qubits, max_qubits = 1, 20
+    match_state = False  # M: match the target state, phases included, instead of its measurement distribution
+    max_bars = 16  # basis states shown; bigger registers show the most likely ones
+    circuit_area = pygame.Rect(60, 50, 700, 290)
+    bar_area = pygame.Rect(60, 350, 700, 130)
+    board_layer = ui.StaticLayer()  # Title, wires and qubit labels, baked once per theme, register and mode
+
+    def __init__(self, player_name, qubits=None):
         self.player_name = player_name
-        self.target = random.randint(1, 20)
-        self.current_value = 0
+        self.telemetry = telemetry.Session("Quantum Circuit Puzzle", player_name, self.snapshot)
+        self.new_puzzle(qubits or QuantumCircuitPuzzle.register_size)
+
+    def new_puzzle(self, qubits, target_gates=None):
+        self.qubits = qubits
+        start = quantum.probabilities(quantum.zero_state(qubits))
+        # The target comes from a hidden random circuit; its length is the par
+        while target_gates is None:
+            target_gates = quantum.random_circuit(qubits, qubits + 2)
+            target = quantum.run(quantum.zero_state(qubits), target_gates)
+            if quantum.distance(quantum.probabilities(target), start) < quantum.MATCH_TOLERANCE:
+                target_gates = None
+        self.target_gates = target_gates
+        self.target = quantum.run(quantum.zero_state(qubits), target_gates)
+        self.target_probs = quantum.probabilities(self.target)
+        self.par = len(target_gates)
+        self.circuit = quantum.Circuit(qubits)
+        self.history = MoveHistory()
+        self.pending = None  # (gate, qubits picked so far) while a gate waits for its qubits
         self.score = 0
         self.game_over = False
+        self.wire_gap = min(40, self.circuit_area.height // qubits)
+        self.update_distribution()
+
+    def update_distribution(self):
+        state = self.circuit.state()
+        self.probs = quantum.probabilities(state)
+        if self.match_state:
+            self.gap = 1 - quantum.fidelity(state, self.target)
+        else:
+            self.gap = quantum.distance(self.probs, self.target_probs)
+        if len(self.probs) <= self.max_bars:
+            self.bars = list(range(len(self.probs)))
+        else:
+            # Most amplitudes are usually zero, and selection over masses of ties is slow, so only rank the rest
+            weight = np.maximum(self.probs, self.target_probs)
+            candidates = np.flatnonzero(weight)
+            if len(candidates) > self.max_bars:
+                candidates = candidates[np.argpartition(weight[candidates], -self.max_bars)[-self.max_bars:]]
+            self.bars = sorted(candidates.tolist())
+
+    def wire_y(self, qubit):
+        return self.circuit_area.y + self.wire_gap // 2 + qubit * self.wire_gap
+
+    def columns(self):
+        # Column width and the first gate shown: gates narrow as the circuit grows, then the oldest scroll off
+        width = max(20, min(40, self.circuit_area.width // max(1, len(self.circuit))))
+        return width, max(0, len(self.circuit) - self.circuit_area.width // width)
+
+    def bake_board(self, surface):
+        goal = "state (phases count)" if self.match_state else "measurement distribution"
+        text = FONT.render(f"Quantum Circuit: match the target {goal}", True, theme.text_color)
+        surface.blit(text, (WIDTH // 2 - text.get_width() // 2, 10))
+        area = self.circuit_area
+        for qubit in range(self.qubits):
+            y = self.wire_y(qubit)
+            pygame.draw.line(surface, GRAY, (area.x, y), (area.right, y), 1)
+            text = SMALL_FONT.render(f"q{qubit}", True, theme.text_color)
+            surface.blit(text, (area.x - 10 - text.get_width(), y - text.get_height() // 2))
 
     def draw(self):
-        screen.fill(theme.background)
-        y = HEIGHT // 2 - 100
-        text = FONT.render(f"Quantum Circuit: Reach value {self.target}!", True, theme.text_color)
-        screen.blit(text, (WIDTH // 2 - text.get_width() // 2, y))
-        y += 50
-        text = FONT.render(f"Current Value: {self.current_value} Score: {self.score}", True, theme.text_color)
-        screen.blit(text, (WIDTH // 2 - text.get_width() // 2, y))
-        y += 50
-        pygame.draw.rect(screen, theme.border_color, (WIDTH // 2 - 50, y, 50, 50), 2)
-        text = FONT.render("+1", True, theme.text_color)
-        screen.blit(text, (WIDTH // 2 - 50 + 25 - text.get_width() // 2, y + 25 - text.get_height() // 2))
-        pygame.draw.rect(screen, theme.border_color, (WIDTH // 2 + 10, y, 50, 50), 2)
-        text = FONT.render("-1", True, theme.text_color)
-        screen.blit(text, (WIDTH // 2 + 10 + 25 - text.get_width() // 2, y + 25 - text.get_height() // 2))
-        y += 100
+        self.board_layer.draw(screen, self.bake_board, self.qubits, self.match_state)
+        area = self.circuit_area
+        if self.pending is not None:
+            for qubit in self.pending[1]:
+                pygame.draw.line(screen, CYAN, (area.x, self.wire_y(qubit)), (area.right, self.wire_y(qubit)), 2)
+        width, first = self.columns()
+        box = max(8, min(width, self.wire_gap) - 6)
+        for column, (name, qubits) in enumerate(self.circuit.gates[first:]):
+            x = area.x + column * width + width // 2
+            if name == "CNOT":
+                control, target = self.wire_y(qubits[0]), self.wire_y(qubits[1])
+                pygame.draw.line(screen, theme.border_color, (x, control), (x, target), 2)
+                pygame.draw.circle(screen, theme.border_color, (x, control), max(3, box // 5))
+                pygame.draw.circle(screen, theme.border_color, (x, target), box // 2, 2)
+            else:
+                rect = pygame.Rect(0, 0, box, box)
+                rect.center = (x, self.wire_y(qubits[0]))
+                pygame.draw.rect(screen, BLUE, rect)
+                text = ui.text(name, 16, WHITE)
+                screen.blit(text, (rect.centerx - text.get_width() // 2, rect.centery - text.get_height() // 2))
+        if first:
+            text = SMALL_FONT.render(f"+{first} earlier", True, theme.text_color)
+            screen.blit(text, (area.x, area.bottom - text.get_height()))
+        # Target (cyan) and current (green) probability of each basis state shown, scaled to the tallest bar
+        area = self.bar_area
+        slot = area.width // len(self.bars)
+        scale = area.height / max(float(self.probs[self.bars].max()), float(self.target_probs[self.bars].max()))
+        for k, basis in enumerate(self.bars):
+            x = area.x + k * slot
+            for offset, probs, color in ((0, self.target_probs, CYAN), (slot // 2 - 1, self.probs, GREEN)):
+                height = int(scale * float(probs[basis]))
+                pygame.draw.rect(screen, color, (x + offset + 1, area.bottom - height, slot // 2 - 2, height))
+            label = format(basis, f"0{self.qubits}b")[::-1] if self.qubits <= 6 else str(basis)
+            text = SMALL_FONT.render(label, True, theme.text_color)
+            row = k % 2 if text.get_width() > slot - 4 else 0  # stagger labels too wide for their slot
+            screen.blit(text, (x + slot // 2 - text.get_width() // 2, area.bottom + 2 + row * text.get_height()))
+        match = f"Fidelity: {1 - self.gap:.1%}" if self.match_state else f"Match: {1 - self.gap:.1%}"
+        text = FONT.render(f"Score: {self.score}  Gates: {len(self.circuit)}  Par: {self.par}  {match}", True, theme.text_color)
+        screen.blit(text, (10, HEIGHT - 70))
         if self.game_over:
             text = FONT.render("Circuit aligned! Press R to Restart or ESC to Menu", True, theme.text_color)
-            screen.blit(text, (WIDTH // 2 - text.get_width() // 2, y))
+        elif self.pending is not None:
+            role = "target" if self.pending[1] else ("control" if self.pending[0] == "CNOT" else "qubit")
+            text = FONT.render(f"{self.pending[0]}: pick the {role} (0-9 or click a wire), ESC to cancel", True, theme.text_color)
         else:
-            text = FONT.render("Click buttons or use +/- keys, ESC to Menu", True, theme.text_color)
-            screen.blit(text, (WIDTH // 2 - text.get_width() // 2, y))
+            text = FONT.render("H/X/Z/S/C gate, right-click removes, M mode, +/- qubits, ESC", True, theme.text_color)
+        screen.blit(text, (10, HEIGHT - 40))
         pygame.display.flip()
 
+    def pick_qubit(self, qubit):
+        name, qubits = self.pending
+        if qubit in qubits or not 0 <= qubit < self.qubits:
+            return
+        qubits = qubits + (qubit,)
+        if len(qubits) < (2 if name == "CNOT" else 1):
+            self.pending = name, qubits
+            return
+        self.pending = None
+        self.edit(len(self.circuit), name, qubits, True)
+
+    def edit(self, position, name, qubits, insert):
+        # Delta: position << 32 | insert << 24 | gate code << 16 | first qubit << 8 | second qubit
+        delta = position << 32 | insert << 24 | quantum.GATE_NAMES.index(name) << 16 | qubits[0] << 8 | qubits[-1]
+        self.history.record(delta)
+        self.telemetry.move(gate=name, qubits=qubits, position=position, insert=insert)
+        self.replay_edit(delta, True)
+
+    def replay_edit(self, delta, forward):
+        # Undoing an insertion removes the gate again and vice versa; the circuit re-simulates only from
+        # the last cached prefix before the edited position
+        position, insert = delta >> 32, bool(delta >> 24 & 1)
+        name = quantum.GATE_NAMES[delta >> 16 & 0xFF]
+        qubits = (delta >> 8 & 0xFF, delta & 0xFF) if name == "CNOT" else (delta >> 8 & 0xFF,)
+        if insert == forward:
+            self.circuit.insert(position, (name, qubits))
+        else:
+            self.circuit.remove(position)
+        self.score += 5 if forward else -5
+        self.update_distribution()
+        self.update()
+
+    def update(self):
+        if self.gap < quantum.MATCH_TOLERANCE:
+            self.game_over = True
+            self.score += 50
+            if len(self.circuit) <= self.par:
+                self.score += 100  # Matched within par
+            self.telemetry.end("won", self.score)
+            leaderboard["Quantum Circuit Puzzle"].append((self.player_name, self.score))
+            leaderboard["Quantum Circuit Puzzle"].sort(key=lambda x: x[1], reverse=True)
+            leaderboard["Quantum Circuit Puzzle"] = leaderboard["Quantum Circuit Puzzle"][:5]
+
     def handle_input(self, event):
         if event.type == pygame.MOUSEBUTTONDOWN and not self.game_over:
             x, y = event.pos
-            if WIDTH // 2 - 50 <= x <= WIDTH // 2 and HEIGHT // 2 + 50 <= y <= HEIGHT // 2 + 100:
-                self.current_value += 1
-                self.score += 5
-            elif WIDTH // 2 + 10 <= x <= WIDTH // 2 + 60 and HEIGHT // 2 + 50 <= y <= HEIGHT // 2 + 100:
-                self.current_value -= 1
-                self.score += 5
-            if self.current_value == self.target:
-                self.game_over = True
-                self.score += 50
-                leaderboard["Quantum Circuit Puzzle"].append((self.player_name, self.score))
-                leaderboard["Quantum Circuit Puzzle"].sort(key=lambda x: x[1], reverse=True)
-                leaderboard["Quantum Circuit Puzzle"] = leaderboard["Quantum Circuit Puzzle"][:5]
+            if not self.circuit_area.collidepoint(x, y):
+                return None, None, None
+            qubit = (y - self.circuit_area.y) // self.wire_gap
+            if event.button == 1 and self.pending is not None:
+                self.pick_qubit(qubit)
+            elif event.button == 3:
+                width, first = self.columns()
+                position = first + (x - self.circuit_area.x) // width
+                if position < len(self.circuit) and qubit in self.circuit.gates[position][1]:
+                    self.edit(position, *self.circuit.gates[position], False)
+            if self.game_over:
                 return "space_fact", self.player_name, "menu"
         elif event.type == pygame.KEYDOWN:
             if event.key == pygame.K_r and self.game_over:
                 return "restart", self.player_name, None
             elif event.key == pygame.K_t:
                 theme.toggle()
+            elif event.key == pygame.K_ESCAPE and self.pending is not None:
+                self.pending = None
             elif event.key == pygame.K_ESCAPE:
                 if not self.game_over:
                     leaderboard["Quantum Circuit Puzzle"].append((self.player_name, self.score))
                     leaderboard["Quantum Circuit Puzzle"].sort(key=lambda x: x[1], reverse=True)
                     leaderboard["Quantum Circuit Puzzle"] = leaderboard["Quantum Circuit Puzzle"][:5]
+                self.telemetry.end("quit", self.score)
                 return "space_fact", self.player_name, "menu"
-            elif event.key == pygame.K_PLUS or event.key == pygame.K_EQUALS and not self.game_over:
-                self.current_value += 1
-                self.score += 5
-                if self.current_value == self.target:
-                    self.game_over = True
-                    self.score += 50
-                    leaderboard["Quantum Circuit Puzzle"].append((self.player_name, self.score))
-                    leaderboard["Quantum Circuit Puzzle"].sort(key=lambda x: x[1], reverse=True)
-                    leaderboard["Quantum Circuit Puzzle"] = leaderboard["Quantum Circuit Puzzle"][:5]
-                    return "space_fact", self.player_name, "menu"
-            elif event.key == pygame.K_MINUS and not self.game_over:
-                self.current_value -= 1
-                self.score += 5
-                if self.current_value == self.target:
-                    self.game_over = True
-                    self.score += 50
-                    leaderboard["Quantum Circuit Puzzle"].append((self.player_name, self.score))
-                    leaderboard["Quantum Circuit Puzzle"].sort(key=lambda x: x[1], reverse=True)
-                    leaderboard["Quantum Circuit Puzzle"] = leaderboard["Quantum Circuit Puzzle"][:5]
+            elif not self.game_over:
+                handle_history_key(self.history, event, self.replay_edit)
+                if event.key in GATE_KEYS and not event.mod & pygame.KMOD_CTRL:
+                    self.pending = GATE_KEYS[event.key], ()
+                elif event.key in QUBIT_KEYS and self.pending is not None:
+                    self.pick_qubit(QUBIT_KEYS.index(event.key))
+                elif event.key == pygame.K_m:
+                    QuantumCircuitPuzzle.match_state = not self.match_state
+                    self.update_distribution()
+                    self.update()
+                elif event.key in (pygame.K_PLUS, pygame.K_EQUALS, pygame.K_KP_PLUS) and self.qubits < self.max_qubits:
+                    QuantumCircuitPuzzle.register_size = self.qubits + 1
+                    self.new_puzzle(self.qubits + 1)
+                elif event.key in (pygame.K_MINUS, pygame.K_KP_MINUS) and self.qubits > self.min_qubits:
+                    QuantumCircuitPuzzle.register_size = self.qubits - 1
+                    self.new_puzzle(self.qubits - 1)
+                if self.game_over:
                     return "space_fact", self.player_name, "menu"
         return None, None, None
 
+    def snapshot(self):
+        return save_state.dump(b"QCI2", "<Bi??", (self.qubits, self.score, self.game_over, self.match_state),
+                               self.player_name.encode(), quantum.encode_gates(self.target_gates),
+                               quantum.encode_gates(self.circuit.gates))
+
+    def restore(self, data):
+        fields, (name, target_gates, gates) = save_state.load(b"QCI2", "<Bi??", data)
+        qubits, score, game_over, QuantumCircuitPuzzle.match_state = fields
+        self.player_name = name.decode()
+        self.new_puzzle(qubits, quantum.decode_gates(target_gates))
+        self.circuit = quantum.Circuit(qubits, quantum.decode_gates(gates))
+        self.score, self.game_over = score, game_over
+        self.update_distribution()
+
 # Astro-Puzzle Navigator
+@lru_cache(maxsize=4)
+def tile_atlas(grid_size, cell_size, dark):
+    # Every numbered tile face baked once: tile n at slot n - 1, in rows of grid_size
+    atlas = pygame.Surface((grid_size * cell_size, grid_size * cell_size)).convert()
+    text_color = WHITE if dark else BLACK
+    for tile in range(1, grid_size * grid_size):
+        row, col = divmod(tile - 1, grid_size)
+        rect = pygame.Rect(col * cell_size, row * cell_size, cell_size, cell_size)
+        atlas.fill(GRAY, rect)
+        text = FONT.render(str(tile), True, text_color)
+        atlas.blit(text, (rect.centerx - text.get_width() // 2, rect.centery - text.get_height() // 2))
+    return atlas
+
+
 class AstroPuzzleNavigator:
-    def __init__(self, player_name):
+    board_size = 3  # Last size picked with +/-, kept across restarts
+    min_size, max_size = 3, 12
+    board_layer = ui.StaticLayer()  # Cell outlines, baked once per theme and board size
+    search_period = 16  # Milliseconds between slices of the par and hint searches
+    search_slice = 0.004  # Seconds of search per slice, so a frame never waits on the solver
+    search_chunk = 64  # Nodes searched between clock checks
+    search_clock = None  # Interval stepping the searches while one is under way
+
+    def __init__(self, player_name, grid_size=None):
         self.player_name = player_name
-        self.cell_size = 100
-        self.grid_size = 3
-        self.puzzle = list(range(1, 9)) + [0]
-        random.shuffle(self.puzzle)
-        while not self.is_solvable():
-            random.shuffle(self.puzzle)
+        self.telemetry = telemetry.Session("Astro-Puzzle Navigator", player_name, self.snapshot)
+        self.new_board(grid_size or AstroPuzzleNavigator.board_size)
+
+    def new_board(self, grid_size):
+        self.grid_size = grid_size
+        self.cell_size = min(100, 480 // grid_size)
+        self.puzzle = sliding_puzzle.random_solvable(grid_size)
+        self.blank = self.puzzle.index(0)
+        self.misplaced = sum(self.is_misplaced(i) for i in range(len(self.puzzle)))
         self.score = 0
         self.game_over = False
+        self.history = MoveHistory()
+        self.moves = 0
+        self.solver = sliding_puzzle.get_solver(grid_size)
+        self.par_bound = self.solver.lower_bound(self.puzzle)
+        self.par = None  # Optimal move count, once the par search finishes in budget
+        self.plan = None  # Remaining optimal moves while the player follows them
+        self.hint_cell = None
+        # Optimal searches run a slice per frame: par from the dealt board, a hint from the board it was asked on
+        self.par_search = sliding_puzzle.Search(self.solver, self.puzzle, sliding_puzzle.PAR_NODE_BUDGET) if self.solver.optimal else None
+        self.hint_search = None
+        self.schedule_search()
+
+    def schedule_search(self):
+        if self.search_clock is not None:
+            self.search_clock.cancel()
+        self.search_clock = timers.every(self.search_period, self.search_step) if self.par_search or self.hint_search else None
+
+    def search_step(self):
+        # The hint search goes first, since the player is waiting on it; results show up as their searches finish
+        deadline = time.perf_counter() + self.search_slice
+        while (self.hint_search or self.par_search) and time.perf_counter() < deadline:
+            search = self.hint_search or self.par_search
+            if not search.step(self.search_chunk):
+                continue
+            if search is self.hint_search:
+                self.hint_search = None
+                if search.path:
+                    self.plan = deque(search.path)
+                    self.hint_cell = self.plan[0]
+            else:
+                self.par_search = None
+                if search.path is not None:
+                    self.par = len(search.path)
+                    if self.moves == 0 and not self.plan:
+                        self.plan = deque(search.path)  # Still on the dealt board: the par solution is the plan
+        if not (self.hint_search or self.par_search):
+            self.schedule_search()
 
     def is_solvable(self):
-        inversions = 0
-        for i in range(len(self.puzzle)):
-            for j in range(i + 1, len(self.puzzle)):
-                if self.puzzle[i] != 0 and self.puzzle[j] != 0 and self.puzzle[i] > self.puzzle[j]:
-                    inversions += 1
-        return inversions % 2 == 0
+        return sliding_puzzle.is_solvable(self.puzzle, self.grid_size)
 
-    def draw(self):
-        screen.fill(theme.background)
+    def is_misplaced(self, idx):
+        # Solved board: tile i + 1 at index i, blank (0) in the last cell
+        return self.puzzle[idx] != (idx + 1) % len(self.puzzle)
+
+    def bake_board(self, surface):
         offset_x, offset_y = (WIDTH - self.grid_size * self.cell_size) // 2, (HEIGHT - self.grid_size * self.cell_size) // 2
         for i in range(self.grid_size):
             for j in range(self.grid_size):
-                idx = i * self.grid_size + j
                 rect = (offset_x + j * self.cell_size, offset_y + i * self.cell_size, self.cell_size, self.cell_size)
-                if self.puzzle[idx] != 0:
-                    pygame.draw.rect(screen, GRAY, rect)
-                    text = FONT.render(str(self.puzzle[idx]), True, theme.text_color)
-                    screen.blit(text, (rect[0] + self.cell_size // 2 - text.get_width() // 2, rect[1] + self.cell_size // 2 - text.get_height() // 2))
-                else:
-                    pygame.draw.rect(screen, theme.border_color, rect, 2)
-        text = FONT.render(f"Score: {self.score}", True, theme.text_color)
+                pygame.draw.rect(surface, theme.border_color, rect, 2)
+
+    def draw(self):
+        # The outlined grid is the baked layer; tiles cover it in one blits() call, leaving the blank's outline
+        self.board_layer.draw(screen, self.bake_board, self.grid_size, self.cell_size)
+        offset_x, offset_y = (WIDTH - self.grid_size * self.cell_size) // 2, (HEIGHT - self.grid_size * self.cell_size) // 2
+        size = self.cell_size
+        atlas = tile_atlas(self.grid_size, size, theme.is_dark)
+        blits = []
+        for idx, tile in enumerate(self.puzzle):
+            if tile != 0:
+                i, j = divmod(idx, self.grid_size)
+                row, col = divmod(tile - 1, self.grid_size)
+                blits.append((atlas, (offset_x + j * size, offset_y + i * size), (col * size, row * size, size, size)))
+        screen.blits(blits, doreturn=False)
+        if self.hint_cell is not None:
+            j, i = self.hint_cell % self.grid_size, self.hint_cell // self.grid_size
+            pygame.draw.rect(screen, CYAN, (offset_x + j * self.cell_size, offset_y + i * self.cell_size, self.cell_size, self.cell_size), 3)
+        par = self.par if self.par is not None else f"{self.par_bound}+"
+        text = FONT.render(f"Score: {self.score}  Moves: {self.moves}  Par: {par}", True, theme.text_color)
         screen.blit(text, (10, HEIGHT - 40))
         if self.game_over:
             text = FONT.render("Puzzle solved! Press R to Restart or ESC to Menu", True, theme.text_color)
             screen.blit(text, (WIDTH // 2 - text.get_width() // 2, HEIGHT // 2))
         else:
-            text = FONT.render("Click tiles or use arrows, ESC to Menu", True, theme.text_color)
+            text = FONT.render("Click or arrows, H hint, +/- size, Ctrl+Z/Y undo, ESC to Menu", True, theme.text_color)
             screen.blit(text, (WIDTH // 2 - text.get_width() // 2, HEIGHT - 80))
         pygame.display.flip()
 
     def update(self):
-        if self.puzzle == [1, 2, 3, 4, 5, 6, 7, 8, 0]:
+        if self.misplaced == 0:
             self.game_over = True
             self.score += 50
+            if self.par is not None and self.moves <= self.par:
+                self.score += 100  # Solved in par
+            self.telemetry.end("won", self.score)
+            self.par_search = self.hint_search = None
+            self.schedule_search()
             leaderboard["Astro-Puzzle Navigator"].append((self.player_name, self.score))
             leaderboard["Astro-Puzzle Navigator"].sort(key=lambda x: x[1], reverse=True)
             leaderboard["Astro-Puzzle Navigator"] = leaderboard["Astro-Puzzle Navigator"][:5]
 
     def move_tile(self, idx):
-        zero_idx = self.puzzle.index(0)
-        if abs(idx - zero_idx) in [1, 3] and (idx // 3 == zero_idx // 3 or idx % 3 == zero_idx % 3):
-            self.puzzle[idx], self.puzzle[zero_idx] = self.puzzle[zero_idx], self.puzzle[idx]
-            self.score += 10
-            self.update()
+        row, col = divmod(idx, self.grid_size)
+        blank_row, blank_col = divmod(self.blank, self.grid_size)
+        if abs(row - blank_row) + abs(col - blank_col) == 1:
+            self.history.record(idx << 32 | self.blank)
+            self.telemetry.move(tile=self.puzzle[idx], on_plan=bool(self.plan) and self.plan[0] == idx)
+            self.replay_move(idx << 32 | self.blank, True)
+
+    def replay_move(self, delta, forward):
+        # A move swaps a tile with the blank, so undo is the same swap; only the two cells can change
+        # whether they are in place, which keeps the solved check O(1)
+        a, b = delta >> 32, delta & 0xFFFFFFFF
+        self.misplaced -= self.is_misplaced(a) + self.is_misplaced(b)
+        self.puzzle[a], self.puzzle[b] = self.puzzle[b], self.puzzle[a]
+        self.misplaced += self.is_misplaced(a) + self.is_misplaced(b)
+        self.blank = a if self.puzzle[a] == 0 else b
+        self.score += 10 if forward else -10
+        self.moves += 1 if forward else -1
+        if forward and self.plan and self.plan[0] == a:
+            self.plan.popleft()
+        else:
+            self.plan = None
+        self.hint_cell = None
+        self.hint_search = None  # Its board is gone
+        self.update()
+
+    def hint(self):
+        # Next move of an optimal solution, reused while the player follows it. Until there is one, the greedy best
+        # move, while an optimal search from this board runs over the next frames and replaces it when it finishes.
+        if self.plan:
+            self.hint_cell = self.plan[0]
+        else:
+            self.hint_cell = self.solver.best_move(self.puzzle)
+            if self.solver.optimal and self.hint_search is None:
+                self.hint_search = sliding_puzzle.Search(self.solver, self.puzzle)
+                self.schedule_search()
+        self.score -= 10  # Hints cost points
+        self.telemetry.event("hint", cell=self.hint_cell)
 
     def handle_input(self, event):
         if event.type == pygame.MOUSEBUTTONDOWN and not self.game_over:
@@ -496,150 +891,606 @@ class AstroPuzzleNavigator:
                     leaderboard["Astro-Puzzle Navigator"].append((self.player_name, self.score))
                     leaderboard["Astro-Puzzle Navigator"].sort(key=lambda x: x[1], reverse=True)
                     leaderboard["Astro-Puzzle Navigator"] = leaderboard["Astro-Puzzle Navigator"][:5]
+                self.telemetry.end("quit", self.score)
                 return "space_fact", self.player_name, "menu"
             elif not self.game_over:
-                zero_idx = self.puzzle.index(0)
-                if event.key == pygame.K_UP and zero_idx < 6:
-                    self.move_tile(zero_idx + 3)
+                handle_history_key(self.history, event, self.replay_move)
+                if self.game_over:
+                    return "space_fact", self.player_name, "menu"
+                size = self.grid_size
+                if event.key == pygame.K_h:
+                    self.hint()
+                elif event.key in (pygame.K_PLUS, pygame.K_EQUALS, pygame.K_KP_PLUS) and size < self.max_size:
+                    AstroPuzzleNavigator.board_size = size + 1
+                    self.new_board(size + 1)
+                elif event.key in (pygame.K_MINUS, pygame.K_KP_MINUS) and size > self.min_size:
+                    AstroPuzzleNavigator.board_size = size - 1
+                    self.new_board(size - 1)
+                elif event.key == pygame.K_UP and self.blank < size * (size - 1):
+                    self.move_tile(self.blank + size)
                     if self.game_over:
                         return "space_fact", self.player_name, "menu"
-                elif event.key == pygame.K_DOWN and zero_idx >= 3:
-                    self.move_tile(zero_idx - 3)
+                elif event.key == pygame.K_DOWN and self.blank >= size:
+                    self.move_tile(self.blank - size)
                     if self.game_over:
                         return "space_fact", self.player_name, "menu"
-                elif event.key == pygame.K_LEFT and zero_idx % 3 < 2:
-                    self.move_tile(zero_idx + 1)
+                elif event.key == pygame.K_LEFT and self.blank % size < size - 1:
+                    self.move_tile(self.blank + 1)
                     if self.game_over:
                         return "space_fact", self.player_name, "menu"
-                elif event.key == pygame.K_RIGHT and zero_idx % 3 > 0:
-                    self.move_tile(zero_idx - 1)
+                elif event.key == pygame.K_RIGHT and self.blank % size > 0:
+                    self.move_tile(self.blank - 1)
                     if self.game_over:
                         return "space_fact", self.player_name, "menu"
         return None, None, None
 
+    def snapshot(self):
+        return save_state.dump(b"AST2", "<Bi?hHI", (
+            self.grid_size, self.score, self.game_over, -1 if self.par is None else self.par, self.par_bound, self.moves),
+            self.player_name.encode(), array("H", self.puzzle).tobytes())
+
+    def restore(self, data):
+        fields, (name, puzzle) = save_state.load(b"AST2", "<Bi?hHI", data)
+        self.grid_size, self.score, self.game_over, par, self.par_bound, self.moves = fields
+        self.par = None if par < 0 else par
+        self.player_name = name.decode()
+        self.puzzle = array("H", puzzle).tolist()
+        self.cell_size = min(100, 480 // self.grid_size)
+        self.blank = self.puzzle.index(0)
+        self.misplaced = sum(self.is_misplaced(i) for i in range(len(self.puzzle)))
+        self.history.clear()
+        self.solver = sliding_puzzle.get_solver(self.grid_size)
+        self.plan = None
+        self.hint_cell = None
+        self.par_search = self.hint_search = None  # The dealt board is not in the snapshot: par stays as saved
+        self.schedule_search()
+
 # Cosmic Jigsaw Explore
+PICTURE_SIZE = (640, 384)
+
+
+@lru_cache(maxsize=1)
+def space_picture():
+    # A procedural nebula, ringed planet and starfield, generated once and shared by every jigsaw session.
+    # Colours drift across the frame so that even small tiles can be told apart.
+    width, height = PICTURE_SIZE
+    rng = np.random.default_rng(1969)
+    x = np.linspace(0, 1, width)[:, None]  # surfarray pixels are indexed (x, y)
+    y = np.linspace(0, 1, height)[None, :] * height / width
+    image = np.empty((width, height, 3))
+    image[..., 0] = 20 + 90 * x
+    image[..., 1] = 10 + 50 * y
+    image[..., 2] = 60 + 80 * (1 - x)
+    for cx, cy, radius, color in ((0.25, 0.2, 0.18, (180, 40, 150)), (0.6, 0.35, 0.22, (40, 90, 200)),
+                                  (0.15, 0.5, 0.15, (230, 120, 40)), (0.85, 0.15, 0.12, (60, 200, 170))):
+        glow = np.exp(-((x - cx) ** 2 + (y - cy) ** 2) / (2 * radius ** 2))
+        wisps = 0.6 + 0.4 * np.sin(23 * x + 17 * y + 9 * cx) * np.cos(11 * x - 29 * y + 5 * cy)
+        image += (glow * wisps)[..., None] * color
+    stars = rng.integers(0, (width, height), (width * height // 150, 2))
+    image[stars[:, 0], stars[:, 1]] += rng.uniform(80, 255, (len(stars), 1))
+    # Planet shaded by a light from the upper left, with a ring drawn over it
+    px, py, radius = 0.72, 0.38, 0.11
+    distance = np.sqrt((x - px) ** 2 + (y - py) ** 2) / radius
+    shade = np.clip(1.2 - np.sqrt((x - px + 0.05) ** 2 + (y - py + 0.05) ** 2) / radius, 0.15, 1)
+    body = distance < 1
+    image[body] = (shade[..., None] * (210, 170, 120))[body]
+    ring = np.abs(np.sqrt((x - px) ** 2 + ((y - py) * 4) ** 2) / radius - 1.6) < 0.12
+    image[ring & ((y > py) | ~body)] = (230, 220, 200)
+    pixels = np.clip(image, 0, 255).astype(np.uint8)
+    return pygame.surfarray.make_surface(pixels).convert()
+
+
+@lru_cache(maxsize=8)
+def picture_tiles(columns, rows):
+    # Subsurfaces are views into the shared picture, so cutting it up copies no pixels
+    picture = space_picture()
+    tile_width, tile_height = PICTURE_SIZE[0] // columns, PICTURE_SIZE[1] // rows
+    return [picture.subsurface((c * tile_width, r * tile_height, tile_width, tile_height))
+            for r in range(rows) for c in range(columns)]
+
+
 class CosmicJigsawExplore:
+    picture_mode = False  # P switches between the word and the picture, kept across restarts
+    grid = (4, 3)  # Last picture grid picked with +/-, kept across restarts
+    grids = [(4, 3), (8, 6), (16, 12), (20, 16), (32, 24)]
+    hud = pygame.Rect(0, HEIGHT - 90, WIDTH, 90)  # Score and help lines, redrawn when the score changes
+
     def __init__(self, player_name):
         self.player_name = player_name
-        self.pieces = list("COSMIC")
-        random.shuffle(self.pieces)
+        self.telemetry = telemetry.Session("Cosmic Jigsaw Explore", player_name, self.snapshot)
+        self.new_puzzle()
+
+    def new_puzzle(self, phrase=None):
+        if CosmicJigsawExplore.picture_mode:
+            self.columns, self.rows = CosmicJigsawExplore.grid
+            self.tiles = picture_tiles(self.columns, self.rows)
+            self.tile_width, self.tile_height = self.tiles[0].get_size()
+            self.target = list(range(len(self.tiles)))
+            self.origin = ((WIDTH - PICTURE_SIZE[0]) // 2, (HEIGHT - 100 - PICTURE_SIZE[1]) // 2)
+        else:
+            # Phrases wrap at 16 letters; the last letter of a row is adjacent to the first of the next
+            self.phrase = phrase or random.choice(word_jigsaw.PHRASES)
+            self.columns = min(len(self.phrase), 16)
+            self.rows = (len(self.phrase) + self.columns - 1) // self.columns
+            self.tiles = None
+            self.tile_width = self.tile_height = min(60, 720 // self.columns)
+            self.target = list(self.phrase)
+            self.origin = ((WIDTH - self.columns * self.tile_width) // 2, HEIGHT // 2 - 50 - (self.rows - 1) * self.tile_height // 2)
+        self.pieces = self.target[:]
+        while self.pieces == self.target:
+            if self.tiles is not None:
+                random.shuffle(self.pieces)
+            else:
+                # Random adjacent swaps keep long phrases to a playable number of moves
+                for _ in range(3 * len(self.pieces)):
+                    i = random.randrange(len(self.pieces) - 1)
+                    self.pieces[i], self.pieces[i + 1] = self.pieces[i + 1], self.pieces[i]
+        self.misplaced = sum(piece != goal for piece, goal in zip(self.pieces, self.target))
+        self.compose_board()
+        self.new_par()
         self.score = 0
         self.game_over = False
+        self.history = MoveHistory()
+        self.drag = None  # (slot, grab offset, floating tile rect) while a tile is dragged
+        self.dirty = None  # Slots to redraw next frame; None redraws everything
+        self.stale = []  # Screen areas the dragged tile has left, which may lie outside every slot
 
-    def draw(self):
-        screen.fill(theme.background)
-        y = HEIGHT // 2 - 50
-        cell_size = 60
-        offset_x = (WIDTH - len(self.pieces) * cell_size) // 2
-        for i, letter in enumerate(self.pieces):
-            rect = (offset_x + i * cell_size, y, cell_size, cell_size)
-            pygame.draw.rect(screen, GRAY, rect)
-            text = FONT.render(letter, True, theme.text_color)
-            screen.blit(text, (rect[0] + cell_size // 2 - text.get_width() // 2, rect[1] + cell_size // 2 - text.get_height() // 2))
-        text = FONT.render(f"Score: {self.score}", True, theme.text_color)
-        screen.blit(text, (10, HEIGHT - 40))
-        if self.game_over:
-            text = FONT.render("Jigsaw complete! Press R to Restart or ESC to Menu", True, theme.text_color)
-            screen.blit(text, (WIDTH // 2 - text.get_width() // 2, HEIGHT // 2 + 50))
+    def new_par(self):
+        # Word mode only: the fewest adjacent swaps left, updated per swap, and its starting value as par
+        self.swap_par = word_jigsaw.SwapPar(self.pieces, self.target) if self.tiles is None else None
+        self.par = self.swap_par.inversions if self.swap_par else None
+        self.moves = 0
+        self.hint_slot = None
+
+    def compose_board(self):
+        # The scrambled picture, kept up to date two tiles per swap so a full redraw is a single blit
+        self.board = None
+        if self.tiles is not None:
+            self.board = pygame.Surface(PICTURE_SIZE).convert()
+            self.board.blits([(self.tiles[piece], self.slot_rect(slot).move(-self.origin[0], -self.origin[1]))
+                              for slot, piece in enumerate(self.pieces)], doreturn=False)
+
+    def slot_rect(self, slot):
+        row, col = divmod(slot, self.columns)
+        return pygame.Rect(self.origin[0] + col * self.tile_width, self.origin[1] + row * self.tile_height,
+                           self.tile_width, self.tile_height)
+
+    def slot_at(self, pos):
+        col, row = (pos[0] - self.origin[0]) // self.tile_width, (pos[1] - self.origin[1]) // self.tile_height
+        if 0 <= col < self.columns and 0 <= row < self.rows and row * self.columns + col < len(self.pieces):
+            return row * self.columns + col
+        return None
+
+    def slots_under(self, rect):
+        first_col = max(0, (rect.left - self.origin[0]) // self.tile_width)
+        last_col = min(self.columns - 1, (rect.right - 1 - self.origin[0]) // self.tile_width)
+        first_row = max(0, (rect.top - self.origin[1]) // self.tile_height)
+        last_row = min(self.rows - 1, (rect.bottom - 1 - self.origin[1]) // self.tile_height)
+        return [row * self.columns + col for row in range(first_row, last_row + 1) for col in range(first_col, last_col + 1)]
+
+    def draw_piece(self, piece, rect):
+        if self.tiles is not None:
+            screen.blit(self.tiles[piece], rect)
+        else:
+            pygame.draw.rect(screen, theme.background, rect)
+            pygame.draw.rect(screen, GRAY, rect.inflate(-4, -4))
+            text = FONT.render(piece, True, theme.text_color)
+            screen.blit(text, (rect.centerx - text.get_width() // 2, rect.centery - text.get_height() // 2))
+
+    def draw_slot(self, slot):
+        rect = self.slot_rect(slot)
+        if self.drag is not None and self.drag[0] == slot:
+            pygame.draw.rect(screen, theme.background, rect)
+            pygame.draw.rect(screen, theme.border_color, rect, 1)
+        elif self.board is not None:
+            screen.blit(self.board, rect, rect.move(-self.origin[0], -self.origin[1]))
         else:
-            text = FONT.render("Click adjacent letters to swap, ESC to Menu", True, theme.text_color)
+            self.draw_piece(self.pieces[slot], rect)
+        if self.hint_slot is not None and slot in (self.hint_slot, self.hint_slot + 1):
+            pygame.draw.rect(screen, CYAN, rect, 3)
+        return rect
+
+    def draw_hud(self):
+        pygame.draw.rect(screen, theme.background, self.hud)
+        score = f"Score: {self.score}"
+        if self.par is not None:
+            score += f"  Moves: {self.moves}  Par: {self.par}"
+        text = FONT.render(score, True, theme.text_color)
+        screen.blit(text, (10, HEIGHT - 40))
+        if not self.game_over:
+            if self.tiles is not None:
+                help_text = "Drag tiles to swap, +/- grid, P word, Ctrl+Z/Y undo, ESC to Menu"
+            else:
+                help_text = "Click a letter to swap it with the next, H hint, P picture, Ctrl+Z/Y undo, ESC Menu"
+            text = FONT.render(help_text, True, theme.text_color)
             screen.blit(text, (WIDTH // 2 - text.get_width() // 2, HEIGHT - 80))
-        pygame.display.flip()
+        return self.hud
+
+    def draw(self):
+        # Only slots that changed since the last frame are redrawn and pushed to the display
+        if self.dirty is None:
+            screen.fill(theme.background)
+            if self.board is not None:
+                screen.blit(self.board, self.origin)
+                if self.drag is not None:
+                    self.draw_slot(self.drag[0])
+                    self.draw_piece(self.pieces[self.drag[0]], self.drag[2])
+            else:
+                for slot in range(len(self.pieces)):
+                    self.draw_slot(slot)
+            self.draw_hud()
+            if self.game_over:
+                text = FONT.render("Jigsaw complete! Press R to Restart or ESC to Menu", True, theme.text_color)
+                screen.blit(text, (WIDTH // 2 - text.get_width() // 2, HEIGHT // 2 + 50 if self.tiles is None else HEIGHT - 120))
+            pygame.display.flip()
+            self.dirty = set()
+            self.stale = []
+            return
+        if not self.dirty:
+            return
+        for rect in self.stale:
+            pygame.draw.rect(screen, theme.background, rect)
+        rects = self.stale + [self.draw_slot(slot) for slot in self.dirty]
+        if self.drag is not None:
+            self.draw_piece(self.pieces[self.drag[0]], self.drag[2])
+            rects.append(self.drag[2])
+        rects.append(self.draw_hud())
+        pygame.display.update(rects)
+        self.dirty = set()
+        self.stale = []
+
+    def mark(self, *slots):
+        if self.dirty is not None:
+            self.dirty.update(slots)
 
     def update(self):
-        if ''.join(self.pieces) == "COSMIC":
+        if self.misplaced == 0:
             self.game_over = True
+            self.dirty = None
             self.score += 50
+            if self.par:
+                self.score += 100 * self.par // self.moves  # Efficiency: the full 100 for solving in par
+            self.telemetry.end("won", self.score)
             leaderboard["Cosmic Jigsaw Explore"].append((self.player_name, self.score))
             leaderboard["Cosmic Jigsaw Explore"].sort(key=lambda x: x[1], reverse=True)
             leaderboard["Cosmic Jigsaw Explore"] = leaderboard["Cosmic Jigsaw Explore"][:5]
 
+    def replay_swap(self, delta, forward):
+        # Deltas hold the two swapped slots; a swap is its own inverse
+        a, b = divmod(delta, 1 << 32)
+        pieces, target = self.pieces, self.target
+        self.misplaced -= (pieces[a] != target[a]) + (pieces[b] != target[b])
+        pieces[a], pieces[b] = pieces[b], pieces[a]
+        self.misplaced += (pieces[a] != target[a]) + (pieces[b] != target[b])
+        if self.board is not None:
+            for slot in (a, b):
+                self.board.blit(self.tiles[pieces[slot]], self.slot_rect(slot).move(-self.origin[0], -self.origin[1]))
+        self.score += 10 if forward else -10
+        self.mark(a, b)
+        if self.swap_par is not None:
+            self.swap_par.swap(a)
+            self.moves += 1 if forward else -1
+            if self.hint_slot is not None:
+                self.mark(self.hint_slot, self.hint_slot + 1)
+                self.hint_slot = None
+        self.update()
+
+    def hint(self):
+        # Highlights an adjacent pair whose swap is on a shortest solution
+        if self.swap_par is not None and self.hint_slot is None:
+            self.hint_slot = self.swap_par.hint()
+            if self.hint_slot is not None:
+                self.score -= 10  # Hints cost points
+                self.telemetry.event("hint", slot=self.hint_slot)
+                self.mark(self.hint_slot, self.hint_slot + 1)
+
+    def swap(self, a, b):
+        self.history.record(a << 32 | b)
+        self.telemetry.move(slots=(a, b), picture=self.tiles is not None)
+        self.replay_swap(a << 32 | b, True)
+
     def handle_input(self, event):
-        if event.type == pygame.MOUSEBUTTONDOWN and not self.game_over:
-            cell_size = 60
-            offset_x = (WIDTH - len(self.pieces) * cell_size) // 2
-            x, y = event.pos
-            if HEIGHT // 2 - 50 <= y <= HEIGHT // 2 + 10:
-                idx = (x - offset_x) // cell_size
-                if 0 <= idx < len(self.pieces) - 1:
-                    self.pieces[idx], self.pieces[idx + 1] = self.pieces[idx + 1], self.pieces[idx]
-                    self.score += 10
-                    self.update()
-                    if self.game_over:
-                        return "space_fact", self.player_name, "menu"
+        if event.type == pygame.MOUSEBUTTONDOWN and event.button == 1 and not self.game_over:
+            slot = self.slot_at(event.pos)
+            if slot is None:
+                pass
+            elif self.tiles is not None:
+                rect = self.slot_rect(slot)
+                self.drag = (slot, (event.pos[0] - rect.x, event.pos[1] - rect.y), rect)
+                self.mark(slot)
+            elif slot < len(self.pieces) - 1:
+                self.swap(slot, slot + 1)
+                if self.game_over:
+                    return "space_fact", self.player_name, "menu"
+        elif event.type == pygame.MOUSEMOTION and self.drag is not None:
+            slot, grab, old = self.drag
+            rect = pygame.Rect(event.pos[0] - grab[0], event.pos[1] - grab[1], self.tile_width, self.tile_height)
+            self.drag = (slot, grab, rect)
+            self.mark(*self.slots_under(old), *self.slots_under(rect))
+            self.stale.append(old)
+        elif event.type == pygame.MOUSEBUTTONUP and event.button == 1 and self.drag is not None:
+            slot, _, rect = self.drag
+            self.drag = None
+            self.mark(slot, *self.slots_under(rect))
+            self.stale.append(rect)
+            target = self.slot_at(event.pos)
+            if target is not None and target != slot and not self.game_over:
+                self.swap(slot, target)
+                if self.game_over:
+                    return "space_fact", self.player_name, "menu"
         elif event.type == pygame.KEYDOWN:
             if event.key == pygame.K_r and self.game_over:
                 return "restart", self.player_name, None
             elif event.key == pygame.K_t:
                 theme.toggle()
+                self.dirty = None
             elif event.key == pygame.K_ESCAPE:
                 if not self.game_over:
                     leaderboard["Cosmic Jigsaw Explore"].append((self.player_name, self.score))
                     leaderboard["Cosmic Jigsaw Explore"].sort(key=lambda x: x[1], reverse=True)
                     leaderboard["Cosmic Jigsaw Explore"] = leaderboard["Cosmic Jigsaw Explore"][:5]
+                self.telemetry.end("quit", self.score)
                 return "space_fact", self.player_name, "menu"
+            elif not self.game_over:
+                handle_history_key(self.history, event, self.replay_swap)
+                if self.game_over:
+                    return "space_fact", self.player_name, "menu"
+                index = self.grids.index(CosmicJigsawExplore.grid)
+                if event.key == pygame.K_p:
+                    CosmicJigsawExplore.picture_mode = not CosmicJigsawExplore.picture_mode
+                    self.new_puzzle()
+                elif self.tiles is None:
+                    if event.key == pygame.K_h:
+                        self.hint()
+                elif event.key in (pygame.K_PLUS, pygame.K_EQUALS, pygame.K_KP_PLUS) and index < len(self.grids) - 1:
+                    CosmicJigsawExplore.grid = self.grids[index + 1]
+                    self.new_puzzle()
+                elif event.key in (pygame.K_MINUS, pygame.K_KP_MINUS) and index > 0:
+                    CosmicJigsawExplore.grid = self.grids[index - 1]
+                    self.new_puzzle()
         return None, None, None
 
+    def snapshot(self):
+        if self.tiles is not None:
+            pieces, phrase = array("H", self.pieces).tobytes(), b""
+        else:
+            pieces, phrase = "".join(self.pieces).encode(), self.phrase.encode()
+        return save_state.dump(b"JIG3", "<i??BBIi", (
+            self.score, self.game_over, self.tiles is not None, self.columns, self.rows,
+            self.moves, -1 if self.par is None else self.par),
+            self.player_name.encode(), pieces, phrase)
+
+    def restore(self, data):
+        fields, (name, pieces, phrase) = save_state.load(b"JIG3", "<i??BBIi", data)
+        score, game_over, picture, columns, rows, moves, par = fields
+        CosmicJigsawExplore.picture_mode = picture
+        if picture:
+            CosmicJigsawExplore.grid = (columns, rows)
+        self.new_puzzle(phrase.decode())
+        self.score, self.game_over = score, game_over
+        self.player_name = name.decode()
+        self.pieces = array("H", pieces).tolist() if picture else list(pieces.decode())
+        self.misplaced = sum(piece != goal for piece, goal in zip(self.pieces, self.target))
+        self.compose_board()
+        self.new_par()
+        self.moves = moves
+        self.par = None if par < 0 else par
+
 # Nebula Maze Runner
 class NebulaMazeRunner:
-    def __init__(self, player_name):
+    maze_size = 15  # Last size picked with +/-, kept across restarts
+    hazard = False  # Drone hazard mode, toggled with M and kept across restarts
+    sizes = (5, 10, 15, 20, 30, 45, 60, 100, 250, 500, 1000, 2000)
+    viewport = pygame.Rect(0, 0, WIDTH, HEIGHT - 100)  # Maze area above the score and help lines
+    drone_radius = 40  # Drones within this many steps of the player chase it; the rest drift
+    drone_period = 350  # Milliseconds between drone steps
+    drone_clock = None  # Interval stepping the drones
+    max_drones = 500
+    exit_field_budget = 5000  # Cells of the exit distance field mapped per frame on large mazes
+    build_period = 16  # Milliseconds between slices of a large maze's generation
+    build_slice = 0.008  # Seconds of generation per slice, so +/- to a 2000x2000 maze never stalls a frame
+    build_band = 64  # Rows of exits mapped between clock checks once the maze is carved
+    build_clock = None  # Interval carving the maze while it is generated
+
+    def __init__(self, player_name, grid_size=None):
         self.player_name = player_name
-        self.cell_size = 80
-        self.grid_size = 5
-        self.maze = [
-            [1, 1, 1, 1, 1],
-            [1, 0, 0, 0, 1],
-            [1, 1, 1, 0, 1],
-            [1, 0, 0, 0, 1],
-            [1, 1, 1, 1, 1]
-        ]
-        self.player_pos = [1, 1]
-        self.maze[1][1] = 2
-        self.target = [3, 3]
+        self.telemetry = telemetry.Session("Nebula Maze Runner", player_name, self.snapshot)
+        self.new_maze(grid_size or NebulaMazeRunner.maze_size)
+
+    def new_maze(self, grid_size, seed=None):
+        # Small mazes are carved at once; large ones a slice per frame behind a progress line, and play starts
+        # (fields, drone clock) once the last row is in
+        self.grid_size = grid_size
+        self.seed = random.getrandbits(32) if seed is None else seed
+        self.maze = Maze.start(grid_size, grid_size, self.seed)
+        self.exit_field = None
+        self.par = None
+        self.hint_cell = None
+        self.new_view()
+        self.player_pos = [0, 0]
+        self.target = [grid_size - 1, grid_size - 1]
         self.score = 0
         self.game_over = False
+        self.caught = False
+        self.history = MoveHistory()
+        self.moves = 0
+        self.drones = []
+        if NebulaMazeRunner.hazard:
+            rng = random.Random(self.seed)
+            count = min(self.max_drones, grid_size * grid_size // 45)
+            while len(self.drones) < count:
+                row, col = rng.randrange(grid_size), rng.randrange(grid_size)
+                if row + col >= min(10, grid_size):  # Keep the start clear
+                    self.drones.append(row * grid_size + col)
+        for clock in (self.build_clock, self.drone_clock):
+            if clock is not None:
+                clock.cancel()
+        self.build_clock = self.drone_clock = None
+        if self.build_step():
+            self.build_clock = timers.every(self.build_period, self.build_step)
+
+    def build_step(self):
+        # Carves rows, then maps their exits for path finding, for one slice; returns whether generation is still
+        # under way
+        deadline = time.perf_counter() + self.build_slice
+        while not self.maze.extend(1) or not self.maze.map_exits(self.build_band):
+            if time.perf_counter() >= deadline:
+                return True
+        if self.build_clock is not None:
+            self.build_clock.cancel()
+            self.build_clock = None
+        self.new_fields()
+        return False
+
+    def new_fields(self):
+        # The exit field (distances to the exit) is mapped a slice per frame; the player field is rebuilt on each move
+        self.exit_field = DistanceField(self.maze, self.target[0] * self.grid_size + self.target[1])
+        self.exit_field.expand(self.exit_field_budget)
+        self.par = self.exit_field.get(0)  # Shortest escape from the start, once mapped
+        self.hint_cell = None
+        if self.drone_clock is not None:
+            self.drone_clock.cancel()
+        self.drone_clock = timers.every(self.drone_period, self.drone_step) if self.drones else None
+        self.update_player_field()
+
+    def update_player_field(self):
+        if self.drones:
+            self.player_field = DistanceField(self.maze, self.player_pos[0] * self.grid_size + self.player_pos[1], self.drone_radius)
+            self.player_field.expand()
+
+    def new_view(self):
+        # Large mazes keep a readable cell size and scroll with the player instead of shrinking to fit
+        self.cell_size = max(16, min(80, 480 // self.grid_size))
+        self.view = MazeView(self.maze, self.cell_size, GRAY)
 
     def draw(self):
         screen.fill(theme.background)
-        offset_x, offset_y = (WIDTH - self.grid_size * self.cell_size) // 2, (HEIGHT - self.grid_size * self.cell_size) // 2
-        for i in range(self.grid_size):
-            for j in range(self.grid_size):
-                rect = (offset_x + j * self.cell_size, offset_y + i * self.cell_size, self.cell_size, self.cell_size)
-                if self.maze[i][j] == 1:
-                    pygame.draw.rect(screen, GRAY, rect)
-                elif self.maze[i][j] == 2:
-                    pygame.draw.rect(screen, GREEN, rect)
-                    text = FONT.render("P", True, theme.text_color)
-                    screen.blit(text, (rect[0] + self.cell_size // 2 - text.get_width() // 2, rect[1] + self.cell_size // 2 - text.get_height() // 2))
-                elif (i, j) == (self.target[0], self.target[1]):
-                    pygame.draw.rect(screen, RED, rect)
-                    text = FONT.render("T", True, theme.text_color)
-                    screen.blit(text, (rect[0] + self.cell_size // 2 - text.get_width() // 2, rect[1] + self.cell_size // 2 - text.get_height() // 2))
-                else:
-                    pygame.draw.rect(screen, theme.border_color, rect, 2)
-        text = FONT.render(f"Score: {self.score}", True, theme.text_color)
+        if not self.maze.done:
+            percent = self.maze.rows_done * 100 // self.grid_size
+            text = FONT.render(f"Generating {self.grid_size}x{self.grid_size} maze... {percent}%", True, theme.text_color)
+            screen.blit(text, (WIDTH // 2 - text.get_width() // 2, HEIGHT // 2))
+            text = FONT.render("+/- size, M drones, ESC Menu", True, theme.text_color)
+            screen.blit(text, (WIDTH // 2 - text.get_width() // 2, HEIGHT - 80))
+            pygame.display.flip()
+            return
+        origin = self.view.origin(self.player_pos, self.viewport)
+        screen.set_clip(self.viewport)
+        self.view.draw(screen, self.viewport, origin, theme.background)
+        cells = [(self.target, RED, "T"), (self.player_pos, GREEN, "P")]
+        if self.hint_cell is not None:
+            cells.insert(0, (divmod(self.hint_cell, self.grid_size), CYAN, ""))
+        for (i, j), color, label in cells:
+            rect = self.view.cell_rect(origin, i, j)
+            if not rect.colliderect(self.viewport):
+                continue
+            pygame.draw.rect(screen, color, rect.inflate(-2 * self.view.line, -2 * self.view.line))
+            if label and self.cell_size >= 40:
+                text = FONT.render(label, True, theme.text_color)
+                screen.blit(text, (rect.centerx - text.get_width() // 2, rect.centery - text.get_height() // 2))
+        # Only drones inside the visible cell range are drawn
+        first_col, first_row = (self.viewport.x - origin[0]) // self.cell_size, (self.viewport.y - origin[1]) // self.cell_size
+        last_col = first_col + self.viewport.width // self.cell_size + 1
+        last_row = first_row + self.viewport.height // self.cell_size + 1
+        for drone in self.drones:
+            i, j = divmod(drone, self.grid_size)
+            if first_row <= i <= last_row and first_col <= j <= last_col:
+                rect = self.view.cell_rect(origin, i, j)
+                pygame.draw.circle(screen, MAGENTA, rect.center, self.cell_size // 3)
+        screen.set_clip(None)
+        par = "?" if self.par is None else self.par
+        text = FONT.render(f"Score: {self.score}  Moves: {self.moves}  Par: {par}{self.exit_hint()}", True, theme.text_color)
         screen.blit(text, (10, HEIGHT - 40))
         if self.game_over:
-            text = FONT.render("Maze escaped! Press R to Restart or ESC to Menu", True, theme.text_color)
+            message = "Caught by a drone!" if self.caught else "Maze escaped!"
+            text = FONT.render(f"{message} Press R to Restart or ESC to Menu", True, theme.text_color)
             screen.blit(text, (WIDTH // 2 - text.get_width() // 2, HEIGHT // 2))
         else:
-            text = FONT.render("Use arrow keys or WASD, ESC to Menu", True, theme.text_color)
+            undo = "" if self.drones else ", Ctrl+Z/Y undo"
+            text = FONT.render(f"Arrows/WASD, H hint, M drones, +/- size{undo}, ESC Menu", True, theme.text_color)
             screen.blit(text, (WIDTH // 2 - text.get_width() // 2, HEIGHT - 80))
         pygame.display.flip()
 
+    def exit_hint(self):
+        if self.hint_cell is None:
+            return ""
+        distance = self.exit_field.get(self.player_pos[0] * self.grid_size + self.player_pos[1])
+        return f"  Exit: {distance} steps"
+
+    def hint(self):
+        # Next step toward the exit, once the exit field has reached the player
+        cell = self.player_pos[0] * self.grid_size + self.player_pos[1]
+        if self.hint_cell is None and self.exit_field is not None and self.exit_field.get(cell) is not None:
+            self.hint_cell = self.exit_field.downhill(cell)
+            self.score -= 10  # Hints cost points
+            self.telemetry.event("hint", cell=self.hint_cell)
+
+    def update(self):
+        if self.exit_field is None:
+            return
+        if not self.exit_field.done:
+            self.exit_field.expand(self.exit_field_budget)
+        if self.par is None:
+            self.par = self.exit_field.get(0)
+
+    def drone_step(self):
+        if self.game_over:
+            self.drone_clock.cancel()
+        else:
+            self.step_drones()
+
+    def step_drones(self):
+        # Drones in range step downhill on the shared player field in O(1); the others drift to a random open neighbour
+        toward, exits, size = self.player_field.toward, self.maze.exits(), self.grid_size
+        for k, drone in enumerate(self.drones):
+            step = toward.get(drone)
+            if step is None:
+                bits = exits[drone]
+                step = random.choice([drone + offset for bit, offset in ((UP, -size), (DOWN, size), (LEFT, -1), (RIGHT, 1)) if bits & bit])
+            self.drones[k] = step
+        self.check_caught()
+
+    def check_caught(self):
+        if self.player_field.source in self.drones:
+            self.game_over = True
+            self.caught = True
+            self.telemetry.end("lost", self.score)
+            leaderboard["Nebula Maze Runner"].append((self.player_name, self.score))
+            leaderboard["Nebula Maze Runner"].sort(key=lambda x: x[1], reverse=True)
+            leaderboard["Nebula Maze Runner"] = leaderboard["Nebula Maze Runner"][:5]
+
     def move_player(self, dx, dy):
-        new_x, new_y = self.player_pos[0] + dx, self.player_pos[1] + dy
-        if 0 <= new_x < self.grid_size and 0 <= new_y < self.grid_size and self.maze[new_x][new_y] != 1:
-            self.maze[self.player_pos[0]][self.player_pos[1]] = 0
+        if self.maze.done and self.maze.can_move(self.player_pos[0], self.player_pos[1], dx, dy):
+            new_x, new_y = self.player_pos[0] + dx, self.player_pos[1] + dy
+            old_cell = self.player_pos[0] * self.grid_size + self.player_pos[1]
+            self.history.record(old_cell << 32 | new_x * self.grid_size + new_y)
+            self.telemetry.move(step=(dx, dy), cell=(new_x, new_y))
             self.player_pos = [new_x, new_y]
-            self.maze[new_x][new_y] = 2
             self.score += 10
+            self.moves += 1
+            self.hint_cell = None
+            self.update_player_field()
             if self.player_pos == self.target:
                 self.game_over = True
                 self.score += 50
+                if self.par is not None and self.moves <= self.par:
+                    self.score += 100  # Escaped along the shortest path
+                self.telemetry.end("won", self.score)
                 leaderboard["Nebula Maze Runner"].append((self.player_name, self.score))
                 leaderboard["Nebula Maze Runner"].sort(key=lambda x: x[1], reverse=True)
                 leaderboard["Nebula Maze Runner"] = leaderboard["Nebula Maze Runner"][:5]
+            elif self.drones:
+                self.check_caught()
+
+    def replay_move(self, delta, forward):
+        # Deltas hold (from cell, to cell); undo walks the player back without re-scoring the target
+        source, dest = divmod(delta, 1 << 32)
+        if not forward:
+            source, dest = dest, source
+        self.player_pos = list(divmod(dest, self.grid_size))
+        self.score += 10 if forward else -10
+        self.moves += 1 if forward else -1
+        self.hint_cell = None
+        self.update_player_field()
 
     def handle_input(self, event):
         if event.type == pygame.KEYDOWN:
@@ -652,9 +1503,24 @@ class NebulaMazeRunner:
                     leaderboard["Nebula Maze Runner"].append((self.player_name, self.score))
                     leaderboard["Nebula Maze Runner"].sort(key=lambda x: x[1], reverse=True)
                     leaderboard["Nebula Maze Runner"] = leaderboard["Nebula Maze Runner"][:5]
+                self.telemetry.end("quit", self.score)
                 return "space_fact", self.player_name, "menu"
             elif not self.game_over:
-                if event.key == pygame.K_UP or event.key == pygame.K_w:
+                if not self.drones and self.maze.done:  # No rewinding away from drones
+                    handle_history_key(self.history, event, self.replay_move)
+                size = self.grid_size
+                if event.key == pygame.K_h:
+                    self.hint()
+                elif event.key == pygame.K_m:
+                    NebulaMazeRunner.hazard = not NebulaMazeRunner.hazard
+                    self.new_maze(size)
+                elif event.key in (pygame.K_PLUS, pygame.K_EQUALS, pygame.K_KP_PLUS) and size < self.sizes[-1]:
+                    NebulaMazeRunner.maze_size = self.sizes[bisect.bisect_right(self.sizes, size)]
+                    self.new_maze(NebulaMazeRunner.maze_size)
+                elif event.key in (pygame.K_MINUS, pygame.K_KP_MINUS) and size > self.sizes[0]:
+                    NebulaMazeRunner.maze_size = self.sizes[bisect.bisect_left(self.sizes, size) - 1]
+                    self.new_maze(NebulaMazeRunner.maze_size)
+                elif event.key == pygame.K_UP or event.key == pygame.K_w:
                     self.move_player(-1, 0)
                     if self.game_over:
                         return "space_fact", self.player_name, "menu"
@@ -672,17 +1538,46 @@ class NebulaMazeRunner:
                         return "space_fact", self.player_name, "menu"
         return None, None, None
 
+    def snapshot(self):
+        # A maze still being generated is saved without its walls; restore carves it again from the seed
+        walls = self.maze.tobytes() if self.maze.done else b""
+        return save_state.dump(b"MAZ3", "<5HIi??I", (
+            self.grid_size, *self.player_pos, *self.target, self.seed, self.score, self.game_over, self.caught, self.moves),
+            self.player_name.encode(), walls, array("I", self.drones).tobytes())
+
+    def restore(self, data):
+        fields, (name, walls, drones) = save_state.load(b"MAZ3", "<5HIi??I", data)
+        self.grid_size, px, py, tx, ty, self.seed, self.score, self.game_over, self.caught, self.moves = fields
+        self.player_name = name.decode()
+        self.player_pos = [px, py]
+        self.target = [tx, ty]
+        if walls:
+            self.maze = Maze.frombytes(self.grid_size, self.grid_size, walls)
+        else:
+            self.maze = Maze.generate(self.grid_size, self.grid_size, self.seed)
+        if self.build_clock is not None:
+            self.build_clock.cancel()
+            self.build_clock = None
+        self.new_view()
+        self.drones = array("I", drones).tolist()
+        self.history.clear()
+        self.new_fields()
+
 # Main game loop
 async def main():
+    pygame.display.set_caption("Cosmic Quest Suite")
     state = "menu"
     game = None
     menu = MainMenu()
-    clock = pygame.time.Clock()
+
+    inputs = ui.InputStage()
 
     while True:
+        # Input first, then update and draw, so a key press is on screen at the end of the same frame
+        frame_end = pygame.time.get_ticks() + 1000 // 60
+        events = inputs.poll()
         if state == "menu":
-            menu.draw()
-            for event in pygame.event.get():
+            for event in events:
                 next_state, player_name, game_name = menu.handle_input(event)
                 if next_state == "space_fact" and game_name != "Quit":
                     game = SpaceFactScreen(
@@ -695,12 +1590,14 @@ async def main():
                             "Nebula Maze Runner": "nebula_maze"
                         }[game_name], player_name, game_name)
                     state = "space_fact"
+                    break
                 elif next_state == "quit":
+                    print(inputs.summary())
+                    print(timers.summary())
                     pygame.quit()
                     return
         elif state == "space_fact":
-            game.draw()
-            for event in pygame.event.get():
+            for event in events:
                 next_state, player_name, next_game = game.handle_input(event)
                 if next_state in ["alien_code", "meteorite_match", "quantum_circuit", "astro_puzzle", "cosmic_jigsaw", "nebula_maze"]:
                     if next_state == "alien_code":
@@ -716,16 +1613,16 @@ async def main():
                     elif next_state == "nebula_maze":
                         game = NebulaMazeRunner(player_name)
                     state = next_state
+                    break
                 elif next_state == "menu":
                     game = None
                     state = "menu"
+                    break
         elif state in ["alien_code", "meteorite_match", "quantum_circuit", "astro_puzzle", "cosmic_jigsaw", "nebula_maze"]:
-            game.draw()
-            if state == "meteorite_match":
-                game.update()
-            for event in pygame.event.get():
+            for event in events:
                 next_state, player_name, next_game = game.handle_input(event)
                 if next_state == "restart":
+                    timers.clear()
                     if state == "alien_code":
                         game = AlienCodeBreaker(player_name)
                     elif state == "meteorite_match":
@@ -739,13 +1636,24 @@ async def main():
                     elif state == "nebula_maze":
                         game = NebulaMazeRunner(player_name)
                 elif next_state == "space_fact":
+                    timers.clear()
                     game = SpaceFactScreen("menu", player_name)
                     state = "space_fact"
-        clock.tick(60)
-        await asyncio.sleep(1.0 / 60)
+                    break
+
+        timers.run_due()
+        if state == "menu":
+            menu.draw()
+        else:
+            if state == "nebula_maze":
+                game.update()
+            game.draw()
+        inputs.flipped()
+        await asyncio.sleep(timers.idle(frame_end) / 1000)
 
-if platform.system() == "Emscripten":
-    asyncio.ensure_future(main())
-else:
-    if __name__ == "__main__":
+# Imported by the launcher (main.py), the suite does not start its own loop
+if __name__ == "__main__":
+    if platform.system() == "Emscripten":
+        asyncio.ensure_future(main())
+    else:
         asyncio.run(main())
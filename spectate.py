@@ -0,0 +1,212 @@
+import asyncio
+import struct
+import save_state
+
+# Live spectating: the playing suite publishes one frame per game tick to every local spectator.
+# A frame is a keyframe (the game's own snapshot()) or a delta against the state spectators already have,
+# such as the Snake head and tail moving or the Minesweeper cells a click uncovered.
+HOST, PORT = "127.0.0.1", 8766
+KEYFRAME_TICKS = 100  # a full snapshot at least this often, so lagging spectators resync
+SLOW_BYTES = 256 * 1024  # a spectator this far behind skips deltas and picks up again at the next keyframe
+FRAME = struct.Struct("<IBI")  # payload length, kind, tick
+KEYFRAME, DELTA = 0, 1
+
+
+# Snake: each tick the head moves one cell and the tail follows it unless the snake ate
+class SnakeDeltas:
+    tag = b"SNAK"
+    MOVED, GREW, OVER = 1, 2, 4
+    HEAD = struct.Struct("<BHH")  # flags, new head x, y
+    MEAL = struct.Struct("<HHi")  # new food x, y and the score after eating
+
+    def __init__(self, game):
+        self.sync(game)
+
+    def sync(self, game):
+        self.head, self.length, self.food = game.snake[0], len(game.snake), game.food
+        self.score, self.game_over = game.score, game.game_over
+
+    def encode(self, game):
+        # The bytes taking a spectator from the last synced state to this one: b"" if nothing changed,
+        # None if the change is more than one tick of play and needs a keyframe
+        moved = game.snake[0] != self.head
+        grew = len(game.snake) == self.length + 1
+        if not moved and game.food == self.food and game.game_over == self.game_over:
+            return b""
+        if not moved and (len(game.snake) != self.length or game.food != self.food):
+            return None
+        if moved and ((len(game.snake) > 1 and game.snake[1] != self.head) or not grew and len(game.snake) != self.length):
+            return None
+        flags = moved * self.MOVED | grew * self.GREW | game.game_over * self.OVER
+        payload = self.HEAD.pack(flags, *game.snake[0])
+        if grew:
+            payload += self.MEAL.pack(*game.food, game.score)
+        self.sync(game)
+        return payload
+
+    @classmethod
+    def apply(cls, game, payload):
+        flags, x, y = cls.HEAD.unpack_from(payload)
+        if flags & cls.MOVED:
+            game.snake.insert(0, (x, y))
+            if flags & cls.GREW:
+                fx, fy, game.score = cls.MEAL.unpack_from(payload, cls.HEAD.size)
+                game.food = (fx, fy)
+            else:
+                game.snake.pop()
+        game.game_over = bool(flags & cls.OVER)
+
+
+# Minesweeper: the cells uncovered since the last tick with their numbers, the flags toggled, and the score
+class MinesweeperDeltas:
+    tag = b"MINE"
+    OVER, WON = 1, 2
+    HEADER = struct.Struct("<BiHH")  # flags, score, uncovered cells, toggled flags
+    CELL = struct.Struct("<Hb")  # cell index, its number (-1 for a mine)
+    FLAG = struct.Struct("<H")
+
+    def __init__(self, game):
+        self.sync(game)
+
+    def sync(self, game):
+        self.size = game.grid_size
+        self.revealed = [cell for row in game.revealed for cell in row]
+        self.flags = [cell for row in game.flags for cell in row]
+        self.score, self.game_over, self.won = game.score, game.game_over, game.won
+
+    def encode(self, game):
+        if game.grid_size != self.size:
+            return None
+        revealed = [cell for row in game.revealed for cell in row]
+        flags = [cell for row in game.flags for cell in row]
+        uncovered = [k for k, (now, before) in enumerate(zip(revealed, self.revealed)) if now != before]
+        toggled = [k for k, (now, before) in enumerate(zip(flags, self.flags)) if now != before]
+        if any(not revealed[k] for k in uncovered):
+            return None  # cells never cover up again during play
+        if not uncovered and not toggled and (game.score, game.game_over, game.won) == (self.score, self.game_over, self.won):
+            return b""
+        size = self.size
+        payload = b"".join([
+            self.HEADER.pack(game.game_over * self.OVER | game.won * self.WON, game.score, len(uncovered), len(toggled)),
+            *(self.CELL.pack(k, game.grid[k // size][k % size]) for k in uncovered),
+            *(self.FLAG.pack(k) for k in toggled)])
+        self.revealed, self.flags = revealed, flags
+        self.score, self.game_over, self.won = game.score, game.game_over, game.won
+        return payload
+
+    @classmethod
+    def apply(cls, game, payload):
+        flags, game.score, uncovered, toggled = cls.HEADER.unpack_from(payload)
+        offset = cls.HEADER.size
+        for _ in range(uncovered):
+            k, value = cls.CELL.unpack_from(payload, offset)
+            offset += cls.CELL.size
+            game.revealed[k // game.grid_size][k % game.grid_size] = True
+            game.grid[k // game.grid_size][k % game.grid_size] = value
+        for _ in range(toggled):
+            (k,) = cls.FLAG.unpack_from(payload, offset)
+            offset += cls.FLAG.size
+            game.flags[k // game.grid_size][k % game.grid_size] ^= True
+        game.game_over, game.won = bool(flags & cls.OVER), bool(flags & cls.WON)
+
+
+DELTAS = {deltas.tag: deltas for deltas in (SnakeDeltas, MinesweeperDeltas)}
+
+
+# Publisher side: call publish(game) once per tick. Every frame is encoded once and written as the same
+# bytes to each spectator; a new spectator is sent the last keyframe and the deltas since, then joins live.
+class SpectatorFeed:
+    def __init__(self, keyframe_ticks=KEYFRAME_TICKS):
+        self.keyframe_ticks = keyframe_ticks
+        self.game = None
+        self.deltas = None
+        self.tick = 0
+        self.since_keyframe = 0
+        self.backlog = []  # the last keyframe and every delta after it
+        self.spectators = {}  # writer -> False while it waits for a keyframe to resync
+        self.bytes_published = 0
+        self.server = None
+
+    async def start(self, host=HOST, port=PORT):
+        self.server = await asyncio.start_server(self.add_spectator, host, port, backlog=1024)
+        return self.server.sockets[0].getsockname()[1]
+
+    async def add_spectator(self, reader, writer):
+        writer.writelines(self.backlog)
+        self.spectators[writer] = True
+        try:
+            await reader.read()  # spectators never send anything; this returns when they hang up
+        except ConnectionError:
+            pass
+        finally:
+            del self.spectators[writer]
+            writer.close()
+
+    def publish(self, game):
+        self.tick += 1
+        self.since_keyframe += 1
+        if game is self.game and self.since_keyframe < self.keyframe_ticks:
+            payload = self.deltas.encode(game)
+            if payload == b"":
+                return
+            if payload is not None:
+                self.send(DELTA, payload)
+                return
+        snapshot = game.snapshot()
+        deltas = DELTAS.get(save_state.peek_tag(snapshot))
+        if deltas is None:
+            return  # no delta format for this game
+        self.game, self.deltas, self.since_keyframe = game, deltas(game), 0
+        self.send(KEYFRAME, snapshot)
+
+    def send(self, kind, payload):
+        frame = FRAME.pack(len(payload), kind, self.tick) + payload
+        if kind == KEYFRAME:
+            self.backlog = [frame]
+        else:
+            self.backlog.append(frame)
+        self.bytes_published += len(frame)
+        for writer, in_sync in self.spectators.items():
+            if writer.transport.get_write_buffer_size() > SLOW_BYTES:
+                self.spectators[writer] = False
+            elif in_sync or kind == KEYFRAME:
+                self.spectators[writer] = True
+                writer.write(frame)
+
+    async def close(self):
+        if self.server is not None:
+            self.server.close()
+        for writer in list(self.spectators):
+            writer.close()
+        await asyncio.sleep(0)  # lets each spectator handler see its hang-up and finish
+
+
+# Spectator side: rebuilds the watched game from frames. games maps a snapshot tag to a function making a
+# blank game object of that kind, which keyframes restore() into and deltas update in place.
+class Spectator:
+    def __init__(self, games):
+        self.games = games
+        self.game = None
+        self.tag = None
+        self.tick = 0
+
+    def apply(self, kind, tick, payload):
+        self.tick = tick
+        if kind == KEYFRAME:
+            tag = save_state.peek_tag(payload)
+            if tag != self.tag:
+                self.game, self.tag = self.games[tag](), tag
+            self.game.restore(payload)
+        elif self.game is not None:
+            DELTAS[self.tag].apply(self.game, payload)
+
+    async def watch(self, host=HOST, port=PORT):
+        reader, writer = await asyncio.open_connection(host, port)
+        try:
+            while True:
+                size, kind, tick = FRAME.unpack(await reader.readexactly(FRAME.size))
+                self.apply(kind, tick, await reader.readexactly(size))
+        except asyncio.IncompleteReadError:
+            pass  # the publisher quit
+        finally:
+            writer.close()
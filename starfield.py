@@ -0,0 +1,51 @@
+import numpy as np
+import pygame
+
+# Parallax layers, far to near: (stars, drift in pixels per second, brightness between background and star colour)
+LAYERS = ((2400, 6, 0.3), (1200, 18, 0.6), (400, 48, 1.0))
+MAX_STEP = 0.1  # longest time step in seconds, so the field does not lurch after a pause
+
+
+# Thousands of one-pixel stars drifting left at a speed per layer. Positions live in NumPy arrays, are advanced
+# in one vectorized step per frame and written straight into the surface's pixels, with no draw call per star.
+class Starfield:
+    def __init__(self, width, height, layers=LAYERS, seed=None):
+        rng = np.random.default_rng(seed)
+        count = sum(stars for stars, _, _ in layers)
+        self.width, self.height = width, height
+        self.layers = layers
+        self.layer = np.repeat(np.arange(len(layers)), [stars for stars, _, _ in layers])
+        self.speed = np.array([speed for _, speed, _ in layers], dtype=np.float32)[self.layer]
+        self.x = rng.uniform(0, width, count).astype(np.float32)
+        self.y = rng.integers(0, height, count)
+        self.columns = np.empty(count, dtype=np.intp)
+        self.colors = None
+        self.palette = None  # (surface format, background, star colour) the mapped colours were made for
+        self.last_tick = None
+
+    def update(self, seconds):
+        self.x -= self.speed * min(seconds, MAX_STEP)
+        np.mod(self.x, self.width, out=self.x)
+
+    def map_colors(self, surface, background, color):
+        # One mapped pixel value per layer, blended from the background towards the star colour
+        key = surface.get_bitsize(), surface.get_masks(), background, color
+        if key != self.palette:
+            shades = [surface.map_rgb([round(b + (c - b) * brightness) for b, c in zip(background, color)])
+                      for _, _, brightness in self.layers]
+            self.colors = np.array(shades, dtype=np.uint32)[self.layer]
+            self.palette = key
+        return self.colors
+
+    def draw(self, surface, background, color):
+        # Advances by the time since the last draw, then plots every star; the caller fills the background
+        now = pygame.time.get_ticks()
+        if self.last_tick is not None:
+            self.update((now - self.last_tick) / 1000)
+        self.last_tick = now
+        colors = self.map_colors(surface, background, color)
+        np.copyto(self.columns, self.x, casting="unsafe")
+        np.minimum(self.columns, self.width - 1, out=self.columns)  # x % width can round up to width in float32
+        pixels = pygame.surfarray.pixels2d(surface)
+        pixels[self.columns, self.y] = colors
+        del pixels  # unlocks the surface
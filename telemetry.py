@@ -0,0 +1,239 @@
+import base64
+import gzip
+import itertools
+import json
+import os
+import queue
+import shutil
+import threading
+import time
+
+# Gameplay telemetry: every game reports its session start, its moves (with the time since the previous one)
+# and how it ended, as one JSON object per line. Recording only drops a tuple into a preallocated ring; a
+# background thread takes the ring every few frames and encodes it, and a second one writes the encoded chunks,
+# so a slow disk never holds up a frame. Events are taken young and encoded to plain bytes, which the garbage
+# collector never walks, even while the disk stalls. When the disk falls MAX_PENDING behind and the ring fills
+# up, new events are counted as dropped instead of waited on.
+#   {"t": 1760000000.123, "session": 3, "game": "Minesweeper", "event": "move", "ms": 840, "cell": [4, 7], "first": true}
+# The end event carries the game's final snapshot() in base64 as "state", which thumbnails.py renders.
+RING_SLOTS = 1 << 14  # events buffered between flushes; a power of two
+FLUSH_SECONDS = 0.05  # the ring is taken at least this often, and early when it is half full
+ENCODE_CHUNK = 64  # events encoded between hand-backs of the GIL, so a frame never waits out a whole batch
+MAX_PENDING = 16 << 20  # encoded bytes waiting for the disk before the ring is left to fill
+ROTATE_BYTES = 4 << 20  # a stream file is closed and gzipped at this size, and when recording stops
+KEEP_FILES = 50  # compressed stream files kept; the oldest are deleted
+
+
+# Single-producer, single-consumer ring: the game loop puts, the encoder thread takes. Each side only advances
+# its own counter, and a slot is filled before the put counter moves past it, so no lock is needed.
+class Ring:
+    def __init__(self, slots=RING_SLOTS):
+        self.slots = [None] * slots
+        self.mask = slots - 1
+        self.put_count = 0
+        self.take_count = 0
+        self.dropped = 0
+
+    def __len__(self):
+        return self.put_count - self.take_count
+
+    def put(self, event):
+        if self.put_count - self.take_count > self.mask:
+            self.dropped += 1
+            return False
+        self.slots[self.put_count & self.mask] = event
+        self.put_count += 1
+        return True
+
+    def take(self):
+        start, end = self.take_count, self.put_count
+        slots, mask = self.slots, self.mask
+        batch = [slots[i & mask] for i in range(start, end)]
+        for i in range(start, end):
+            slots[i & mask] = None
+        self.take_count = end
+        return batch
+
+
+# Owns the ring, the encoder and disk threads and the stream files in one directory
+class Recorder:
+    def __init__(self, directory, slots=RING_SLOTS, rotate_bytes=ROTATE_BYTES, keep_files=KEEP_FILES,
+                 flush_seconds=FLUSH_SECONDS):
+        os.makedirs(directory, exist_ok=True)
+        self.directory = directory
+        self.ring = Ring(slots)
+        self.rotate_bytes = rotate_bytes
+        self.keep_files = keep_files
+        self.flush_seconds = flush_seconds
+        self.wake = threading.Event()
+        self.stopping = False
+        self.thread = threading.Thread(target=self.run, name="telemetry", daemon=True)
+        self.disk = threading.Thread(target=self.run_disk, name="telemetry-disk", daemon=True)
+        self.chunks = queue.SimpleQueue()  # (encoded bytes, event count) for the disk thread; None to finish
+        self.bytes_encoded = 0
+        self.file = None
+        self.path = None
+        self.size = 0
+        self.files = itertools.count()
+        self.events_written = 0
+        self.bytes_written = 0
+        self.batches = 0
+
+    def start(self):
+        self.thread.start()
+        self.disk.start()
+        return self
+
+    def record(self, event):
+        ring = self.ring
+        ring.put(event)
+        if len(ring) > ring.mask // 2 and not self.wake.is_set():
+            self.wake.set()
+
+    def run(self):
+        while not self.stopping:
+            self.wake.wait(self.flush_seconds)
+            self.wake.clear()
+            self.flush()
+        self.flush()
+        self.chunks.put(None)
+        self.disk.join()
+
+    def run_disk(self):
+        # Writes whatever has been encoded since the last write in one go, so a stalled disk catches up at once
+        finishing = False
+        while not finishing:
+            chunks = [self.chunks.get()]
+            while True:
+                try:
+                    chunks.append(self.chunks.get_nowait())
+                except queue.Empty:
+                    break
+            if chunks[-1] is None:
+                chunks.pop()
+                finishing = True
+            if chunks:
+                self.write(b"".join(data for data, _ in chunks), sum(count for _, count in chunks))
+        if self.file is not None:
+            self.rotate()
+
+    def flush(self):
+        # Encoder thread: takes the ring and queues it for the disk as one chunk of NDJSON
+        if not self.stopping and self.bytes_encoded - self.bytes_written > MAX_PENDING:
+            return  # the disk is far behind: leave the events in the ring, which drops new ones once full
+        batch = self.ring.take()
+        if not batch:
+            return
+        count = len(batch)
+        lines = []
+        for k, (t, session, game, kind, fields) in enumerate(batch, 1):
+            lines.append(encoder.encode({"t": round(t, 3), "session": session, "game": game, "event": kind, **fields}))
+            if k % ENCODE_CHUNK == 0:
+                time.sleep(0)  # releases the GIL to the game thread
+        del batch
+        data = ("\n".join(lines) + "\n").encode()
+        self.bytes_encoded += len(data)
+        self.chunks.put((data, count))
+
+    def write(self, data, count):
+        # Disk thread: appends to the current stream file, rotating it once it is big enough
+        if self.file is None:
+            self.path = os.path.join(self.directory, f"telemetry-{time.strftime('%Y%m%d-%H%M%S')}-{next(self.files)}.ndjson")
+            self.file = open(self.path, "ab")
+            self.size = 0
+        self.file.write(data)
+        self.file.flush()
+        self.size += len(data)
+        self.events_written += count
+        self.bytes_written += len(data)
+        self.batches += 1
+        if self.size >= self.rotate_bytes:
+            self.rotate()
+
+    def rotate(self):
+        # Compresses the finished stream file next to itself and prunes the oldest compressed files
+        self.file.close()
+        self.file = None
+        with open(self.path, "rb") as source, gzip.open(self.path + ".gz", "wb") as target:
+            shutil.copyfileobj(source, target)
+        os.remove(self.path)
+        archived = sorted(name for name in os.listdir(self.directory) if name.endswith(".ndjson.gz"))
+        for name in archived[:-self.keep_files]:
+            os.remove(os.path.join(self.directory, name))
+
+    def close(self):
+        # Encodes what is left in the ring, waits for the disk thread to write it and compress the last file
+        self.stopping = True
+        self.wake.set()
+        self.thread.join()
+
+    def summary(self):
+        return (f"Telemetry: {self.events_written} events ({self.bytes_written / 1024:.0f} KiB) in {self.batches} batches "
+                f"written to {self.directory}, {self.ring.dropped} dropped")
+
+
+def encode_value(value):
+    # JSON fallback: snapshots as base64, anything else as its str()
+    if isinstance(value, bytes):
+        return base64.b64encode(value).decode()
+    return str(value)
+
+
+encoder = json.JSONEncoder(separators=(",", ":"), default=encode_value)
+recorder = None  # the running Recorder; None (the default, and always in the browser) records nothing
+session_ids = itertools.count(1)
+
+
+def start(directory, **options):
+    global recorder
+    recorder = Recorder(directory, **options).start()
+    return recorder
+
+
+def stop():
+    # Writes out what is still buffered, compresses the last stream file and returns the summary line
+    global recorder
+    if recorder is None:
+        return "Telemetry: off"
+    recorder.close()
+    summary = recorder.summary()
+    recorder = None
+    return summary
+
+
+# One game played from start to finish. Every game object holds one and reports through it; without a
+# running recorder each call returns straight away. snapshot is the game's snapshot method, called once at the end.
+class Session:
+    def __init__(self, game, player_name, snapshot=None):
+        self.id = next(session_ids)
+        self.game = game
+        self.snapshot = snapshot
+        self.started = self.last_move = time.perf_counter()
+        self.moves = 0
+        self.ended = False
+        self.event("start", player=player_name)
+
+    def event(self, kind, **fields):
+        if recorder is not None:
+            recorder.record((time.time(), self.id, self.game, kind, fields))
+
+    def move(self, **fields):
+        # A player move, stamped with the milliseconds since the previous move (or since the start)
+        now = time.perf_counter()
+        self.moves += 1
+        if recorder is not None:
+            fields["ms"] = round((now - self.last_move) * 1000)
+            recorder.record((time.time(), self.id, self.game, "move", fields))
+        self.last_move = now
+
+    def end(self, outcome, score):
+        # "won", "lost", "draw" or "quit"; only the first call counts, so a finished game left with ESC ends once
+        if self.ended:
+            return
+        self.ended = True
+        if recorder is None:
+            return
+        fields = {"outcome": outcome, "score": score, "moves": self.moves, "seconds": round(time.perf_counter() - self.started, 3)}
+        if self.snapshot is not None:
+            fields["state"] = self.snapshot()
+        self.event("end", **fields)
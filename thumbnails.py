@@ -0,0 +1,109 @@
+import base64
+import gzip
+import json
+import multiprocessing
+import os
+import sys
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+
+# Headless: the workers draw with the SDL dummy driver, whose display surface is an ordinary in-memory surface
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+
+# Leaderboard wall thumbnails: a PNG of every session's final board, rendered from the "state" snapshots that
+# telemetry end events carry. Each worker process keeps one blank game per kind, restores a snapshot into it and
+# calls its own draw(), so a thumbnail looks exactly like the last frame the player saw. Workers are spawned, not
+# forked, so none of them carries a copy of the parent's heap.
+#   python thumbnails.py TELEMETRY_DIR OUT_DIR [WORKERS]
+THUMB_SIZE = (200, 150)
+IN_FLIGHT = 4  # snapshots queued per worker; the rest of the streams stay on disk until a worker frees up
+
+infos = {}  # worker side: game name -> GameInfo from the launcher
+games = {}  # worker side: game name -> blank game object restored into for each thumbnail
+
+
+def final_states(directory):
+    # (output name, game name, snapshot) for every finished session in the telemetry streams, read line by line
+    for name in sorted(os.listdir(directory)):
+        if name.endswith(".ndjson.gz"):
+            stream = gzip.open(os.path.join(directory, name), "rt")
+        elif name.endswith(".ndjson"):
+            stream = open(os.path.join(directory, name))
+        else:
+            continue
+        stem = name.split(".")[0]
+        with stream:
+            for line in stream:
+                try:
+                    event = json.loads(line)
+                except ValueError:
+                    continue  # the last line of a stream cut off mid-write
+                if event.get("event") == "end" and "state" in event:
+                    yield f"{stem}-{event['session']}.png", event["game"], base64.b64decode(event["state"])
+
+
+def peak_memory():
+    # This process's peak resident memory in KiB, from /proc (Linux); 0 where there is none
+    try:
+        with open("/proc/self/status") as status:
+            for line in status:
+                if line.startswith("VmHWM"):
+                    return int(line.split()[1])
+    except OSError:
+        pass
+    return 0
+
+
+def init_worker():
+    from main import GAMES
+    infos.update((info.name, info) for info in GAMES)
+
+
+def render(game_name, state, path):
+    import pygame
+    from ui import screen, timers
+
+    game = games.get(game_name)
+    if game is None:
+        game = games[game_name] = infos[game_name].load()("")
+    game.restore(state)
+    game.draw()
+    timers.clear()  # restore() may schedule timers (a pending Meteorite flip-back) that never run here
+    pygame.image.save(pygame.transform.smoothscale(screen, THUMB_SIZE), path)
+    return peak_memory()
+
+
+def render_all(source, target, workers=None):
+    # Renders every final state in source that has no thumbnail in target yet; returns how many were rendered
+    # and the largest peak memory of a worker in KiB
+    os.makedirs(target, exist_ok=True)
+    workers = workers or os.cpu_count() or 1
+    rendered = peak = 0
+    with ProcessPoolExecutor(workers, multiprocessing.get_context("spawn"), initializer=init_worker) as pool:
+        pending = set()
+        for name, game_name, state in final_states(source):
+            path = os.path.join(target, name)
+            if os.path.exists(path):
+                continue
+            if len(pending) >= workers * IN_FLIGHT:
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    peak = max(peak, future.result())
+                rendered += len(done)
+            pending.add(pool.submit(render, game_name, state, path))
+        for future in pending:
+            peak = max(peak, future.result())
+        rendered += len(pending)
+    return rendered, peak
+
+
+if __name__ == "__main__":
+    if len(sys.argv) < 3:
+        print("usage: python thumbnails.py TELEMETRY_DIR OUT_DIR [WORKERS]")
+        sys.exit(2)
+    start = time.perf_counter()
+    count, peak = render_all(sys.argv[1], sys.argv[2], int(sys.argv[3]) if len(sys.argv) > 3 else None)
+    elapsed = time.perf_counter() - start
+    print(f"{count} thumbnails in {elapsed:.1f} s ({count / elapsed * 3600 if elapsed else 0:.0f} per hour), "
+          f"peak worker memory {peak / 1024:.0f} MB")
@@ -0,0 +1,135 @@
+import os
+import time
+import pygame
+from collections import defaultdict, deque
+from functools import lru_cache
+from scheduler import Scheduler
+from starfield import Starfield
+
+# Shared by both suites and the launcher: one window, one theme, one leaderboard and cached fonts and text,
+# so games from either suite can run in the same process
+
+# Initialize Pygame
+pygame.init()
+
+# Screen settings: every game draws on the 800x600 logical surface screen. On a real display the window can be
+# resized (F11 toggles fullscreen) and SDL's renderer scales each flipped frame to it on the GPU, letterboxed to 4:3,
+# and maps mouse positions back to logical pixels, so a frame costs the same in a 4K window as at 800x600.
+# GAME_SCALING=smooth filters the upscale; the default, nearest, keeps edges and text pixel-sharp.
+WIDTH, HEIGHT = 800, 600
+HEADLESS = os.environ.get("SDL_VIDEODRIVER") == "dummy"  # benchmarks and thumbnails: no window to scale to
+SCALING = os.environ.get("GAME_SCALING", "nearest")
+if not HEADLESS:
+    os.environ.setdefault("SDL_RENDER_SCALE_QUALITY", "linear" if SCALING == "smooth" else "nearest")
+screen = pygame.display.set_mode((WIDTH, HEIGHT), 0 if HEADLESS else pygame.SCALED | pygame.RESIZABLE)
+
+# Event types the games read; everything else (key releases, text input, wheel, window chatter) is dropped
+# by SDL before it reaches the queue. Timed behaviour goes through timers, not timer events.
+INPUT_EVENTS = [pygame.QUIT, pygame.KEYDOWN, pygame.MOUSEBUTTONDOWN, pygame.MOUSEBUTTONUP, pygame.MOUSEMOTION]
+LATENCY_SAMPLES = 4096  # input-to-flip latencies kept for the report
+
+WHITE = (255, 255, 255)
+BLACK = (0, 0, 0)
+
+
+# Theme settings
+class Theme:
+    def __init__(self):
+        self.is_dark = True
+        self.background = BLACK
+        self.text_color = WHITE
+        self.border_color = WHITE
+
+    def toggle(self):
+        self.is_dark = not self.is_dark
+        self.background = BLACK if self.is_dark else WHITE
+        self.text_color = WHITE if self.is_dark else BLACK
+        self.border_color = WHITE if self.is_dark else BLACK
+
+theme = Theme()
+starfield = Starfield(WIDTH, HEIGHT)  # Drifts behind the menus and the space fact screens
+timers = Scheduler()  # Timers, intervals and tweens of the game being played; cleared when the loop leaves it
+
+# Leaderboard (in-memory storage)
+leaderboard = defaultdict(list)  # {game: [(name, score), ...]}
+
+
+@lru_cache(maxsize=None)
+def font(size):
+    return pygame.font.SysFont("arial", size)
+
+
+@lru_cache(maxsize=512)
+def text(string, size, color):
+    # Rendered text surfaces for labels that repeat every frame (menus, fixed prompts); do not draw on them
+    return font(size).render(string, True, color)
+
+
+# Static board layer: grid lines, borders and labels that stay put for a whole game, baked once into a window-sized
+# surface in display format and blitted in place of screen.fill(). bake(surface) draws onto the layer filled with
+# the background; the layer is baked again only when the theme, the window size or the caller's key changes.
+class StaticLayer:
+    def __init__(self):
+        self.surface = None
+        self.key = None
+
+    def draw(self, surface, bake, *key):
+        key = (theme.is_dark, surface.get_size(), *key)
+        if key != self.key:
+            self.surface = pygame.Surface(surface.get_size()).convert()
+            self.surface.fill(theme.background)
+            bake(self.surface)
+            self.key = key
+        surface.blit(self.surface, (0, 0))
+
+    def invalidate(self):
+        self.key = None
+
+
+# Input stage: runs first in every frame, before update() and draw(), so what the player pressed is on screen
+# at the end of the same frame. Runs of mouse motion collapse into one event, and the time from each event
+# leaving the queue to the frame's flip is recorded. Events posted with a perf_counter() "posted" attribute
+# (benchmarks, replays) are timed from that moment instead, so their wait in the queue counts too.
+class InputStage:
+    def __init__(self):
+        pygame.event.set_blocked(None)
+        pygame.event.set_allowed(INPUT_EVENTS)
+        self.pending = []  # start times of the events handled this frame
+        self.latencies = deque(maxlen=LATENCY_SAMPLES)
+        self.events = 0
+        self.coalesced = 0
+
+    def poll(self):
+        now = time.perf_counter()
+        events = []
+        for event in pygame.event.get():
+            if event.type == pygame.KEYDOWN and event.key == pygame.K_F11 and not HEADLESS:
+                try:
+                    pygame.display.toggle_fullscreen()
+                except pygame.error:
+                    pass  # the video driver has no fullscreen mode
+                continue
+            if event.type == pygame.MOUSEMOTION and events and events[-1].type == pygame.MOUSEMOTION:
+                # Only the newest position matters; the relative motion of the run adds up
+                rel = events[-1].rel
+                events[-1] = pygame.event.Event(pygame.MOUSEMOTION, event.dict, rel=(rel[0] + event.rel[0], rel[1] + event.rel[1]))
+                self.coalesced += 1
+                continue
+            events.append(event)
+            self.pending.append(getattr(event, "posted", now))
+        self.events += len(events)
+        return events
+
+    def flipped(self):
+        # Call once the frame holding this poll's events is on the display
+        now = time.perf_counter()
+        self.latencies.extend(now - start for start in self.pending)
+        self.pending.clear()
+
+    def summary(self):
+        if not self.latencies:
+            return "Input to display: no input"
+        samples = sorted(self.latencies)
+        median, p99 = samples[len(samples) // 2], samples[min(len(samples) - 1, len(samples) * 99 // 100)]
+        return (f"Input to display: median {median * 1000:.1f} ms, p99 {p99 * 1000:.1f} ms, max {samples[-1] * 1000:.1f} ms "
+                f"over the last {len(samples)} of {self.events} events ({self.coalesced} mouse motions coalesced)")
@@ -0,0 +1,44 @@
+from collections import defaultdict, deque
+import content
+from sliding_puzzle import count_inversions
+
+PHRASES = content.section("phrases")  # from the content pack when one has been built
+
+
+def assign_targets(pieces, target):
+    # Target slot of every piece. Equal letters keep their left-to-right order: no optimal solution ever
+    # swaps two equal letters, so this assignment has the fewest inversions of all the possible ones
+    slots = defaultdict(deque)
+    for slot, letter in enumerate(target):
+        slots[letter].append(slot)
+    return [slots[letter].popleft() for letter in pieces]
+
+
+# Fewest adjacent swaps left to solve a phrase, kept up to date in O(1) per swap.
+# The answer is the inversion count of the pieces' target slots; `descents` holds every i whose pieces
+# i and i + 1 are out of order, and swapping any of them is an optimal next move.
+class SwapPar:
+    def __init__(self, pieces, target):
+        self.letters = list(pieces)
+        self.ranks = assign_targets(pieces, target)
+        self.inversions = count_inversions([rank + 1 for rank in self.ranks])
+        self.descents = {i for i in range(len(self.ranks) - 1) if self.ranks[i] > self.ranks[i + 1]}
+
+    def swap(self, i):
+        # Pieces i and i + 1 trade places. Equal letters keep their target slots, so nothing changes.
+        letters, ranks = self.letters, self.ranks
+        if letters[i] == letters[i + 1]:
+            return
+        self.inversions += -1 if ranks[i] > ranks[i + 1] else 1
+        letters[i], letters[i + 1] = letters[i + 1], letters[i]
+        ranks[i], ranks[i + 1] = ranks[i + 1], ranks[i]
+        for j in (i - 1, i, i + 1):
+            if 0 <= j < len(ranks) - 1:
+                if ranks[j] > ranks[j + 1]:
+                    self.descents.add(j)
+                else:
+                    self.descents.discard(j)
+
+    def hint(self):
+        # Left slot of an optimal adjacent swap, or None once solved
+        return next(iter(self.descents), None)